@@ -11,6 +11,7 @@ from data_models.eots_schemas_v2_5 import (
     ATIFManagementDirectiveV2_5, ATIFSituationalAssessmentProfileV2_5,
     KeyLevelsDataV2_5
 )
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 
 if TYPE_CHECKING:
@@ -42,7 +43,7 @@ class AdaptiveTradeIdeaFrameworkV2_5:
         """
         Generates new trade strategy directives based on a full situational analysis.
         """
-        if not isinstance(processed_data, ProcessedDataBundleV2_5) or not scored_signals:
+        if not isinstance(processed_data, (ProcessedDataBundleV2_5, ColumnarProcessedDataBundleV2_5)) or not scored_signals:
             self.logger.error("Invalid or empty data provided to generate_trade_directives. Aborting.")
             return []
             
@@ -0,0 +1,127 @@
+# core_analytics_engine/exposure_cube_v2_5.py
+# EOTS v2.5 - EXPIRATION x STRIKE x MEASURE EXPOSURE CUBE
+#
+# The strike-level table sums every expiration together, which loses the term
+# structure. The cube keeps it: one dense float64 array of shape
+# (expirations, strikes, measures) built from the chain with a single bincount
+# per measure, so 0DTE slices, term-weighted totals and per-expiry profiles are
+# array reductions instead of repeated filtering and regrouping.
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core_analytics_engine.strike_index_v2_5 import STRIKE_SUM_COLUMNS, StrikeIndexV2_5
+
+# Per-contract chain columns carried as cube measures (same inputs as the strike table)
+CUBE_MEASURES = tuple(dict.fromkeys(STRIKE_SUM_COLUMNS.values()))
+
+
+class ExposureCubeV2_5:
+    """
+    Dense per-(expiration, strike) sums of chain measures.
+
+    `values[e, s, m]` is the sum of measure m over the contracts of expiration e at
+    strike s; `counts[e, s]` is the number of such contracts. Expirations are sorted
+    by DTE and strikes follow the strike index, so `values.sum(axis=0)` lines up with
+    the strike-level table.
+    """
+
+    def __init__(self, expiry_dte: np.ndarray, strikes: np.ndarray, measures: Sequence[str],
+                 values: np.ndarray, counts: np.ndarray):
+        self.expiry_dte = np.asarray(expiry_dte, dtype=np.float64)
+        self.strikes = strikes
+        self.measures = tuple(measures)
+        self.values = values
+        self.counts = counts
+        self._positions = {name: i for i, name in enumerate(self.measures)}
+
+    @classmethod
+    def from_chain(cls, chain: pd.DataFrame, strike_index: StrikeIndexV2_5,
+                   measures: Sequence[str] = CUBE_MEASURES) -> 'ExposureCubeV2_5':
+        """
+        Builds the cube from a contract-level chain and the strike index factorized from it.
+
+        Expirations are keyed by the 'expiration' column when present, otherwise by
+        'dte_calc'; contracts without a strike, an expiration or a DTE are skipped.
+        Missing measure columns are all zeros.
+        """
+        if strike_index.inverse is None or len(strike_index.inverse) != len(chain):
+            raise ValueError("strike index was not factorized from this chain")
+        n_strikes = len(strike_index)
+        if 'dte_calc' in chain.columns:
+            dte = pd.to_numeric(chain['dte_calc'], errors='coerce').to_numpy(dtype=np.float64)
+        else:
+            dte = np.full(len(chain), np.nan)
+        key = chain['expiration'] if 'expiration' in chain.columns else pd.Series(dte)
+        expiry_codes, _ = pd.factorize(key.to_numpy(), use_na_sentinel=True)
+
+        valid = (strike_index.inverse >= 0) & (expiry_codes >= 0) & ~np.isnan(dte)
+        n_expiries = int(expiry_codes[valid].max()) + 1 if valid.any() else 0
+        # Order expirations by their (mean) DTE
+        per_expiry = np.bincount(expiry_codes[valid], minlength=n_expiries)
+        mean_dte = np.bincount(expiry_codes[valid], weights=dte[valid], minlength=n_expiries) / np.maximum(per_expiry, 1)
+        present = per_expiry > 0
+        order = np.argsort(mean_dte[present], kind='stable')
+        rank = np.full(n_expiries, -1, dtype=np.intp)
+        rank[np.flatnonzero(present)[order]] = np.arange(len(order))
+        n_expiries = len(order)
+
+        cells = rank[expiry_codes[valid]] * n_strikes + strike_index.inverse[valid]
+        size = n_expiries * n_strikes
+        values = np.zeros((n_expiries, n_strikes, len(measures)))
+        for m, name in enumerate(measures):
+            if name in chain.columns:
+                weights = np.nan_to_num(chain[name].to_numpy(dtype=np.float64)[valid], nan=0.0, posinf=0.0, neginf=0.0)
+                values[:, :, m] = np.bincount(cells, weights=weights, minlength=size).reshape(n_expiries, n_strikes)
+        counts = np.bincount(cells, minlength=size).reshape(n_expiries, n_strikes)
+        return cls(mean_dte[present][order], strike_index.strikes, measures, values, counts)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def has(self, measure: str) -> bool:
+        return measure in self._positions
+
+    def measure(self, measure: str) -> np.ndarray:
+        """(expirations, strikes) slice of one measure, e.g. the per-expiry gamma profile for 'gxoi'."""
+        return self.values[:, :, self._positions[measure]]
+
+    def expiry_mask(self, max_dte: Optional[float] = None, min_dte: Optional[float] = None) -> np.ndarray:
+        """Boolean mask over expirations whose DTE lies within [min_dte, max_dte]."""
+        mask = np.ones(len(self.expiry_dte), dtype=bool)
+        if max_dte is not None:
+            mask &= self.expiry_dte <= max_dte
+        if min_dte is not None:
+            mask &= self.expiry_dte >= min_dte
+        return mask
+
+    def strike_totals(self, measure: str, expiries: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-strike sum of a measure over all (or the masked) expirations."""
+        slab = self.measure(measure)
+        return (slab if expiries is None else slab[expiries]).sum(axis=0)
+
+    def term_weighted(self, measure: str, expiry_weights: np.ndarray) -> np.ndarray:
+        """Per-strike sum of a measure with each expiration scaled by its weight."""
+        return np.asarray(expiry_weights, dtype=np.float64) @ self.measure(measure)
+
+    def strikes_with_contracts(self, expiries: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean mask over strikes that have at least one contract in the (masked) expirations."""
+        counts = self.counts if expiries is None else self.counts[expiries]
+        return counts.sum(axis=0) > 0
+
+    def concentration(self, measure: str, expiries: Optional[np.ndarray] = None,
+                      strikes: Optional[np.ndarray] = None) -> float:
+        """Herfindahl concentration of |per-strike totals| (0.0 when there is no exposure)."""
+        totals = np.abs(self.strike_totals(measure, expiries))
+        if strikes is not None:
+            totals = totals[strikes]
+        total = totals.sum()
+        return float(((totals / total) ** 2).sum()) if total > 0 else 0.0
+
+    def profiles(self, measure: str) -> Dict[float, np.ndarray]:
+        """Per-expiration strike profiles of a measure keyed by DTE."""
+        slab = self.measure(measure)
+        return {float(dte): slab[e] for e, dte in enumerate(self.expiry_dte)}
@@ -3,10 +3,12 @@
 
 import logging
 import asyncio
+import concurrent.futures
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Optional, Any, List, NamedTuple, Union
 import pandas as pd
-import aiohttp
 from pydantic import ValidationError as PydanticValidationError
 
 # EOTS V2.5 Data Contracts
@@ -19,9 +21,12 @@ from data_models.eots_schemas_v2_5 import (
 
 # EOTS V2.5 Core Components
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from utils.validation_policy_v2_5 import ValidationReport
 
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5
 from data_management.convexvalue_data_fetcher_v2_5 import ConvexValueDataFetcherV2_5
 from data_management.tradier_data_fetcher_v2_5 import TradierDataFetcherV2_5
+from data_management.expiration_calendar_v2_5 import ExpirationCalendarV2_5
 from data_management.initial_processor_v2_5 import InitialDataProcessorV2_5
 from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2_5
 from core_analytics_engine.metrics_calculator_v2_5 import MetricsCalculatorV2_5
@@ -33,8 +38,11 @@ from core_analytics_engine.trade_parameter_optimizer_v2_5 import TradeParameterO
 
 logger = logging.getLogger(__name__)
 
+# The raw bundle of a fetch: columnar when the chain came from ConvexValue, models for the Tradier fallback
+RawDataBundleV2_5 = Union[UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5]
+
 class DataFetchResult(NamedTuple):
-    bundle: Optional[UnprocessedDataBundleV2_5]
+    bundle: Optional[RawDataBundleV2_5]
     historical_data: Optional[pd.DataFrame]
     status: str  # 'success', 'partial', 'failed'
     errors: list
@@ -68,8 +76,10 @@ class ITSOrchestratorV2_5:
         self.trade_parameter_optimizer = trade_parameter_optimizer
 
         # Instantiate components not requiring complex dependency chains
-        self.convexvalue_fetcher = ConvexValueDataFetcherV2_5(config_manager)
-        self.tradier_fetcher = TradierDataFetcherV2_5(config_manager)
+        # Both fetchers share one expiration calendar so either source can teach the other
+        self.expiration_calendar = ExpirationCalendarV2_5()
+        self.convexvalue_fetcher = ConvexValueDataFetcherV2_5(config_manager, expiration_calendar=self.expiration_calendar)
+        self.tradier_fetcher = TradierDataFetcherV2_5(config_manager, expiration_calendar=self.expiration_calendar)
         from .key_level_identifier_v2_5 import KeyLevelIdentifierV2_5
         self.key_level_identifier = KeyLevelIdentifierV2_5(
             config=config_manager.config.key_level_identifier_settings
@@ -84,7 +94,39 @@ class ITSOrchestratorV2_5:
         self.active_recommendations: List[ActiveRecommendationPayloadV2_5] = []
         self.current_symbol_being_managed: Optional[str] = None
         self._latest_bundle: Optional[FinalAnalysisBundleV2_5] = None
-        
+
+        # Watchlist-wide underlying snapshot (one batched get_und per cycle)
+        self._underlying_snapshot: Dict[str, RawUnderlyingDataCombinedV2_5] = {}
+        self._underlying_snapshot_time: Optional[datetime] = None
+        self.underlying_snapshot_ttl_seconds = float(
+            self.config_manager.get_setting("data_fetcher_settings.underlying_snapshot_ttl_seconds", 60.0) or 60.0
+        )
+
+        # Long-lived event loop for async I/O (owns the pooled API sessions)
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_thread: Optional[threading.Thread] = None
+        self._async_lock = threading.Lock()
+        self.async_call_timeout_seconds = float(
+            self.config_manager.get_setting("data_fetcher_settings.async_call_timeout_seconds", 60.0) or 60.0
+        )
+
+        # Single-flight coalescing of identical fetches (dashboard callbacks, timer, collector)
+        self._inflight_lock = threading.Lock()
+        self._inflight_fetches: Dict[tuple, concurrent.futures.Future] = {}
+        self._recent_fetches: Dict[tuple, tuple] = {}
+        # Optional hedged underlying quote (first good answer of Tradier / ConvexValue wins)
+        self.hedged_underlying_quotes = bool(
+            self.config_manager.get_setting("data_fetcher_settings.hedged_underlying_quotes", False)
+        )
+        self.hedged_quote_budget_seconds = float(
+            self.config_manager.get_setting("data_fetcher_settings.hedged_quote_budget_seconds", 2.0) or 2.0
+        )
+        self._hedge_stats_lock = threading.Lock()
+        self._hedge_stats: Dict[str, Any] = {}
+        self._validation_reports: Dict[str, ValidationReport] = {}
+        self.fetch_coalesce_window_seconds = float(
+            self.config_manager.get_setting("data_fetcher_settings.fetch_coalesce_window_seconds", 5.0) or 0.0
+        )
 
         
         self.logger.info("ITSOrchestratorV2_5 initialized successfully with all components.")
@@ -93,7 +135,93 @@ class ITSOrchestratorV2_5:
         """Public method for the dashboard to retrieve the last computed bundle."""
         return self._latest_bundle
 
-    def run_full_analysis_cycle(self, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20) -> Optional[FinalAnalysisBundleV2_5]:
+    def refresh_underlying_snapshot(self, symbols: Optional[List[str]] = None) -> Dict[str, RawUnderlyingDataCombinedV2_5]:
+        """
+        Fetches underlying data for the whole watchlist with one batched ConvexValue
+        request and caches it for the current cycle.
+
+        Args:
+            symbols: Symbols to include; defaults to intraday_collector_settings.watched_tickers
+
+        Returns:
+            The symbol -> underlying model snapshot (empty if the fetch failed)
+        """
+        if symbols is None:
+            symbols = list(self.config_manager.get_setting("intraday_collector_settings.watched_tickers", []) or [])
+        if not symbols:
+            return {}
+
+        try:
+            snapshot = self._run_async(lambda: self.convexvalue_fetcher.fetch_underlying_batch(symbols))
+        except Exception as e:
+            self.logger.error(f"Failed to refresh underlying snapshot: {e}")
+            return {}
+
+        if snapshot:
+            self._underlying_snapshot = snapshot
+            self._underlying_snapshot_time = datetime.now()
+        return snapshot
+
+    def _get_snapshot_underlying(self, symbol: str) -> Optional[RawUnderlyingDataCombinedV2_5]:
+        """Returns the cached snapshot entry for symbol if the snapshot is still fresh."""
+        if not self._underlying_snapshot or self._underlying_snapshot_time is None:
+            return None
+        age = (datetime.now() - self._underlying_snapshot_time).total_seconds()
+        if age > self.underlying_snapshot_ttl_seconds:
+            return None
+        return self._underlying_snapshot.get(symbol)
+
+    def run_metrics_cycle(self, symbol: str, requested_metrics: Optional[List[str]] = None, dte_min: int = 0,
+                          dte_max: int = 45, price_range_percent: int = 20,
+                          underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> Optional[ColumnarProcessedDataBundleV2_5]:
+        """
+        Runs only data fusion and metric calculation (steps 1-2) for a symbol.
+
+        For consumers that need metric values but not the regime, signal and
+        recommendation stages, e.g. the intraday collector. With requested_metrics
+        only the metric groups producing them (and their dependencies) are calculated.
+
+        Returns:
+            The processed data bundle, or None if the data fetch failed
+        """
+        raw_data_bundle = self._fetch_for_metrics(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot)
+        if raw_data_bundle is None:
+            return None
+        return self.initial_processor.process_data_and_calculate_metrics(raw_data_bundle, dte_max, requested_metrics)
+
+    def run_metrics_batch(self, symbols: List[str], requested_metrics: Optional[List[str]] = None, dte_min: int = 0,
+                          dte_max: int = 45, price_range_percent: int = 20,
+                          underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> Dict[str, ColumnarProcessedDataBundleV2_5]:
+        """
+        run_metrics_cycle() for several symbols, with the metrics of all of them calculated
+        in one batch (per-strike metrics vectorized across symbols).
+
+        Returns:
+            {symbol: processed data bundle} for the symbols whose data could be fetched
+        """
+        raw_data_bundles = {}
+        for symbol in symbols:
+            raw_data_bundle = self._fetch_for_metrics(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot)
+            if raw_data_bundle is not None:
+                raw_data_bundles[symbol] = raw_data_bundle
+        if not raw_data_bundles:
+            return {}
+        return self.initial_processor.process_batch_and_calculate_metrics(raw_data_bundles, dte_max, requested_metrics)
+
+    def _fetch_for_metrics(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int,
+                           underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> Optional[RawDataBundleV2_5]:
+        """Step 1 of the metrics-only cycle: the raw bundle, or None if the fetch failed."""
+        raw_data_bundle, _, status, errors, messages = self._fetch_and_fuse_data(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot)
+        if not raw_data_bundle or status == 'failed':
+            self.logger.error(f"❌ Metrics cycle data fetch failed for {symbol}. Status: {status}. Errors: {errors}")
+            return None
+        if status == 'partial':
+            self.logger.warning(f"⚠️ PARTIAL DATA: {messages}")
+            raw_data_bundle.errors.extend(errors)
+        return raw_data_bundle
+
+    def run_full_analysis_cycle(self, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20,
+                                underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> Optional[FinalAnalysisBundleV2_5]:
         """
         Executes the complete 12-step analysis pipeline for a given symbol.
         
@@ -102,6 +230,8 @@ class ITSOrchestratorV2_5:
             dte_min: Minimum days to expiration filter
             dte_max: Maximum days to expiration filter  
             price_range_percent: Strike price range percentage around current price
+            underlying_snapshot: Optional cycle-wide underlying snapshot from
+                refresh_underlying_snapshot(); falls back to the cached one
             
         Returns:
             FinalAnalysisBundleV2_5 containing all analysis results, or None if failed
@@ -121,7 +251,7 @@ class ITSOrchestratorV2_5:
             # 1. DATA FUSION: Fetch raw data from all sources
             self.logger.info(f"🔄 STEP 1: Starting data fetch for {symbol}...")
             
-            raw_data_bundle, historical_data, status, errors, messages = self._fetch_and_fuse_data(symbol, dte_min, dte_max, price_range_percent)
+            raw_data_bundle, historical_data, status, errors, messages = self._fetch_and_fuse_data(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot)
             if not raw_data_bundle:
                 self.logger.error(f"❌ STEP 1 FAILED: No raw data bundle returned for {symbol}. Status: {status}. Errors: {errors}")
                 return None
@@ -143,47 +273,20 @@ class ITSOrchestratorV2_5:
             
 
 
-            # Create DataFrames once for performance - FIX: Proper Pydantic model conversion
+            # The processed bundle is columnar: stages share its memoized, indexed
+            # strike/chain frames instead of rebuilding them from per-row models.
             df_underlying = pd.DataFrame([processed_data_bundle.underlying_data_enriched.model_dump()])
             
-            # CRITICAL FIX: Convert Pydantic models to DataFrame properly
-            if processed_data_bundle.strike_level_data_with_metrics:
-                # Convert list of Pydantic models to list of dicts first
-                strike_dicts = [strike_model.model_dump() for strike_model in processed_data_bundle.strike_level_data_with_metrics]
-                df_strike = pd.DataFrame(strike_dicts)
-                # self.logger.info(f"✅ Strike data converted: {len(df_strike)} strikes")
-                if self.logger.isEnabledFor(logging.DEBUG):
-                    self.logger.debug(f"✅ Strike data converted: {len(df_strike)} strikes")
-            else:
+            df_strike = processed_data_bundle.strike_frame()
+            if not processed_data_bundle.strike_data.empty and 'strike' not in processed_data_bundle.strike_data.columns:
+                self.logger.error(f"CRITICAL: 'strike' column missing from strike data for {symbol}")
+                self.logger.error(f"Available columns: {list(processed_data_bundle.strike_data.columns)}")
+            elif df_strike.empty:
                 self.logger.warning(f"No strike-level data available for {symbol}")
-                df_strike = pd.DataFrame(columns=['strike'])
-            
-            # CRITICAL FIX: Safe index setting with proper data
-            if not df_strike.empty and 'strike' in df_strike.columns:
-                # self.logger.info(f"✅ Strike data OK: {len(df_strike)} strikes for {symbol}")
-                if self.logger.isEnabledFor(logging.DEBUG):
-                    self.logger.debug(f"✅ Strike data OK: {len(df_strike)} strikes for {symbol}")
-                try:
-                    df_strike.set_index('strike', inplace=True, drop=False)
-                    self.logger.debug(f"✅ Strike index set successfully")
-                except Exception as e:
-                    self.logger.error(f"Failed to set strike index: {e}")
-                    df_strike = pd.DataFrame(columns=['strike'])
-            else:
-                if df_strike.empty:
-                    self.logger.warning(f"Strike DataFrame is empty for {symbol}")
-                else:
-                    self.logger.error(f"CRITICAL: 'strike' column missing from strike data for {symbol}")
-                    self.logger.error(f"Available columns: {list(df_strike.columns)}")
-                # Create minimal dummy DataFrame to prevent downstream errors  
-                df_strike = pd.DataFrame(columns=['strike'])
-            
-            # Convert options data similarly
-            if processed_data_bundle.options_data_with_metrics:
-                options_dicts = [opt_model.model_dump() for opt_model in processed_data_bundle.options_data_with_metrics]
-                df_chain = pd.DataFrame(options_dicts)
-            else:
-                df_chain = pd.DataFrame()
+            elif self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"✅ Strike data OK: {len(df_strike)} strikes for {symbol}")
+            
+            df_chain = processed_data_bundle.chain_frame()
             
             # 3. CONTEXTUALIZATION: Get Ticker-Specific Context
             self.logger.info(f"🔄 STEP 3: Analyzing ticker context for {symbol}...")
@@ -373,8 +476,16 @@ class ITSOrchestratorV2_5:
             # 12. BUNDLE FINALIZATION: Assemble the final output
             self.logger.info(f"🔄 STEP 12: Finalizing analysis bundle for {symbol}...")
             
+            final_processed_bundle = processed_data_bundle.to_pydantic()
+            validation_report = processed_data_bundle.validation_report()
+            self._validation_reports[symbol] = validation_report
+            if validation_report.saved_seconds is not None:
+                self.logger.info(f"🧪 Row validation ({validation_report.mode}): {validation_report.validated_rows}/{validation_report.rows} rows validated "
+                                 f"in {validation_report.elapsed_seconds * 1000:.1f}ms, full validation ≈ {validation_report.estimated_full_seconds * 1000:.1f}ms "
+                                 f"(saved ≈ {validation_report.saved_seconds * 1000:.1f}ms)")
+            
             final_bundle = FinalAnalysisBundleV2_5(
-                processed_data_bundle=processed_data_bundle,
+                processed_data_bundle=final_processed_bundle,
                 key_levels_data_v2_5=key_levels,
                 scored_signals_v2_5=signals,
                 active_recommendations_v2_5=self.active_recommendations,
@@ -421,25 +532,50 @@ class ITSOrchestratorV2_5:
         
         return base_thresholds
 
-    async def fetch_and_fuse_data_async(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int) -> DataFetchResult:
+    async def fetch_and_fuse_data_async(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int,
+                                        underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> DataFetchResult:
         """Async: Fetches data from ConvexValue and Tradier, returns structured result."""
         errors = []
         messages = []
         status = 'success'
         bundle = None
         historical_df = None
+        if underlying_snapshot is not None:
+            snapshot_underlying = underlying_snapshot.get(symbol)
+        else:
+            snapshot_underlying = self._get_snapshot_underlying(symbol)
         try:
-            async with aiohttp.ClientSession() as cv_session:
-                async with self.tradier_fetcher as tradier_session:
-                    # Calculate appropriate historical lookback based on DTE settings
-                    # For key levels and technical analysis, we need sufficient history
-                    # Use max(dte_max * 2, 5) to ensure adequate data but respect DTE context
-                    historical_lookback_days = max(dte_max * 2, 5)
-                    
-                    cv_task = self.convexvalue_fetcher.fetch_chain_and_underlying(cv_session, symbol, dte_min, dte_max, price_range_percent)
-                    tradier_quote_task = tradier_session.fetch_underlying_quote(symbol)
-                    tradier_history_task = tradier_session.fetch_historical_data(symbol, days=historical_lookback_days)
-                    cv_result, tradier_quote_result, tradier_history_result = await asyncio.gather(cv_task, tradier_quote_task, tradier_history_task, return_exceptions=True)
+            # Calculate appropriate historical lookback based on DTE settings
+            # For key levels and technical analysis, we need sufficient history
+            # Use max(dte_max * 2, 5) to ensure adequate data but respect DTE context
+            historical_lookback_days = max(dte_max * 2, 5)
+
+            cv_unavailable = self.convexvalue_fetcher.provider_guard.is_rejecting()
+            if cv_unavailable:
+                # ConvexValue's circuit is open: take the chain (and quote) from Tradier instead
+                messages.append("ConvexValue circuit is open; options chain served by the Tradier fallback.")
+                cv_task = self._fetch_tradier_chain_fallback(symbol, dte_min, dte_max, price_range_percent, snapshot_underlying)
+                tradier_quote_task = asyncio.sleep(0, result=None)  # the fallback already fetches the quote
+            else:
+                # The Tradier fetcher reuses its pooled session; ConvexValue does not need one
+                cv_underlying = snapshot_underlying
+                if self.hedged_underlying_quotes and cv_underlying is None:
+                    # Shared by the hedge and the chain leg, so get_und is only sent once
+                    cv_underlying = asyncio.ensure_future(self.convexvalue_fetcher.fetch_underlying(symbol))
+                    tradier_quote_task = self._hedged_underlying_quote(symbol, cv_underlying, messages)
+                elif self.hedged_underlying_quotes and (getattr(cv_underlying, 'price', None) or 0) > 0:
+                    # The snapshot already holds a good quote: nothing is pending to hedge against
+                    tradier_quote_task = asyncio.sleep(0, result=cv_underlying)
+                else:
+                    tradier_quote_task = self.tradier_fetcher.fetch_underlying_quote(symbol)
+                # The chain stays a compact DataFrame all the way into the metrics calculator
+                cv_task = self.convexvalue_fetcher.fetch_chain_and_underlying(None, symbol, dte_min, dte_max, price_range_percent,
+                                                                               underlying=cv_underlying, as_frame=True)
+            # Daily bars come from the local bar store; only the missing tail is requested from Tradier
+            tradier_history_task = self.historical_data_manager.get_ohlcv_async(symbol, historical_lookback_days, self.tradier_fetcher)
+            cv_result, tradier_quote_result, tradier_history_result = await asyncio.gather(cv_task, tradier_quote_task, tradier_history_task, return_exceptions=True)
+            if cv_unavailable and isinstance(cv_result, tuple) and len(cv_result) == 2:
+                tradier_quote_result = cv_result[1]
             # ConvexValue
             cv_failed = False
             if isinstance(cv_result, Exception):
@@ -458,12 +594,7 @@ class ITSOrchestratorV2_5:
                             if metric in cv_underlying_dict and cv_underlying_dict[metric] is not None:
                                 cv_underlying_dict[metric] = cv_underlying_dict[metric]
                     final_underlying_model = RawUnderlyingDataCombinedV2_5(**cv_underlying_dict)
-                    bundle = UnprocessedDataBundleV2_5(
-                        options_contracts=(cv_options if not cv_failed and isinstance(cv_options, list) else []),
-                        underlying_data=final_underlying_model,
-                        fetch_timestamp=datetime.now(),
-                        errors=errors
-                    )
+                    bundle = self._raw_data_bundle(cv_options, final_underlying_model, errors)
                 else:
                     cv_options = []
             # Tradier
@@ -477,11 +608,8 @@ class ITSOrchestratorV2_5:
             # Historical
             if isinstance(tradier_history_result, Exception):
                 messages.append(f"Tradier history fetch failed: {tradier_history_result}. Historical data will be missing.")
-            elif isinstance(tradier_history_result, dict) and 'data' in tradier_history_result:
-                historical_df = pd.DataFrame(tradier_history_result['data'])
-                if 'date' in historical_df.columns:
-                    historical_df['date'] = pd.to_datetime(historical_df['date'])
-                    historical_df.set_index('date', inplace=True)
+            elif isinstance(tradier_history_result, pd.DataFrame):
+                historical_df = tradier_history_result
             # Status logic
             if cv_failed and tradier_failed:
                 status = 'failed'
@@ -504,39 +632,206 @@ class ITSOrchestratorV2_5:
                                 if metric in cv_underlying_dict and cv_underlying_dict[metric] is not None:
                                     final_underlying_dict[metric] = cv_underlying_dict[metric]
                     final_underlying_model = RawUnderlyingDataCombinedV2_5(**final_underlying_dict)
-                    bundle = UnprocessedDataBundleV2_5(
-                        options_contracts=(cv_options if not cv_failed and isinstance(cv_options, list) else []),
-                        underlying_data=final_underlying_model,
-                        fetch_timestamp=datetime.now(),
-                        errors=errors
-                    )
+                    bundle = self._raw_data_bundle(cv_options if not cv_failed else [], final_underlying_model, errors)
             return DataFetchResult(bundle, historical_df, status, errors, messages)
         except Exception as e:
             errors.append(f"Critical error in fetch_and_fuse_data_async: {e}")
             status = 'failed'
             return DataFetchResult(None, None, status, errors, messages)
 
-    def _fetch_and_fuse_data(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int) -> tuple[Optional[UnprocessedDataBundleV2_5], Optional[pd.DataFrame], str, list, list]:
-        """Sync wrapper for async fetch, returns bundle, historical, status, errors, messages."""
+    @staticmethod
+    def _raw_data_bundle(options: Any, underlying: RawUnderlyingDataCombinedV2_5, errors: list) -> RawDataBundleV2_5:
+        """The raw bundle for a fetched chain: columnar for a chain frame, models for a contract list."""
+        if isinstance(options, pd.DataFrame):
+            return ColumnarUnprocessedDataBundleV2_5(options, underlying, datetime.now(), errors)
+        return UnprocessedDataBundleV2_5(
+            options_contracts=(options if isinstance(options, list) else []),
+            underlying_data=underlying,
+            fetch_timestamp=datetime.now(),
+            errors=errors
+        )
+
+    async def _hedged_underlying_quote(self, symbol: str, cv_task: asyncio.Future, messages: list) -> Optional[RawUnderlyingDataCombinedV2_5]:
+        """
+        Races the Tradier quote against the pending ConvexValue underlying request and returns
+        the first good answer (a model with a positive price) within hedged_quote_budget_seconds.
+
+        A losing Tradier request is cancelled. The ConvexValue future is never cancelled because
+        the chain leg still needs it for the advanced underlying metrics.
+        """
+        loop = asyncio.get_running_loop()
+        tradier_task = asyncio.ensure_future(self.tradier_fetcher.fetch_underlying_quote(symbol))
+        providers = {tradier_task: 'tradier', cv_task: 'convexvalue'}
+
+        winner: Optional[str] = None
+        quote: Optional[RawUnderlyingDataCombinedV2_5] = None
+        pending = set(providers)
+        deadline = loop.time() + self.hedged_quote_budget_seconds
+        start = loop.time()
+        while pending and winner is None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # asyncio.wait does not cancel on timeout, so the shared ConvexValue future stays alive
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                result = task.result()
+                if result is not None and (getattr(result, 'price', None) or 0) > 0:
+                    winner, quote = providers[task], result
+                    break
+
+        if not tradier_task.done():
+            tradier_task.cancel()
+
+        elapsed = loop.time() - start
+        with self._hedge_stats_lock:
+            key = winner or 'none'
+            self._hedge_stats[key] = self._hedge_stats.get(key, 0) + 1
+            self._hedge_stats['last_winner'] = key
+        if winner:
+            messages.append(f"Underlying quote served by {winner} in {elapsed:.2f}s (hedged).")
+            self.logger.debug(f"Hedged quote for {symbol}: {winner} won after {elapsed:.3f}s")
+        else:
+            self.logger.warning(f"⚠️ No good underlying quote for {symbol} within {self.hedged_quote_budget_seconds:.1f}s budget")
+        return quote
+
+    def get_quote_hedge_stats(self) -> Dict[str, Any]:
+        """How often each provider won the hedged underlying quote race."""
+        with self._hedge_stats_lock:
+            return dict(self._hedge_stats)
+
+    def get_validation_reports(self) -> Dict[str, ValidationReport]:
+        """Latest per-symbol row validation timing (policy, rows validated, time spent vs. full validation)."""
+        return dict(self._validation_reports)
+
+    async def _fetch_tradier_chain_fallback(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int,
+                                            snapshot_underlying: Optional[RawUnderlyingDataCombinedV2_5]) -> tuple:
+        """Tradier stand-in for the ConvexValue chain leg; returns (contracts, underlying) like it."""
+        contracts, tradier_underlying = await self.tradier_fetcher.fetch_chain_and_underlying(symbol, dte_min, dte_max)
+        underlying = snapshot_underlying or tradier_underlying
+        price = getattr(tradier_underlying, 'price', None) or getattr(snapshot_underlying, 'price', None)
+        if contracts and price:
+            band = price * price_range_percent / 100.0
+            contracts = [c for c in contracts if abs(c.strike - price) <= band]
+        self.logger.info(f"🔁 Tradier fallback chain for {symbol}: {len(contracts or [])} contracts")
+        return contracts or [], underlying
+
+    def _ensure_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Returns the orchestrator's long-lived background event loop, starting it on first use."""
+        with self._async_lock:
+            if self._async_loop is None or self._async_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="eots-async-loop", daemon=True)
+                thread.start()
+                self._async_loop = loop
+                self._async_thread = thread
+                self.logger.debug("Started background event loop for async data fetching.")
+            return self._async_loop
+
+    def _run_async(self, coro_factory):
+        """
+        Runs the coroutine produced by coro_factory to completion from sync code.
+
+        Every coroutine runs on the same background event loop so that pooled
+        connections (e.g. the Tradier session) survive across calls. A coroutine that
+        does not finish within async_call_timeout_seconds is cancelled and TimeoutError
+        is raised, so a stuck request never blocks the calling thread for good.
+        """
+        loop = self._ensure_event_loop()
+        if threading.current_thread() is self._async_thread:
+            raise RuntimeError("_run_async cannot be called from the orchestrator's own event loop")
+        future = asyncio.run_coroutine_threadsafe(coro_factory(), loop)
         try:
-            # CRITICAL FIX: Use get_or_create_event_loop to prevent event loop conflicts
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If loop is already running, create a new task
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, self.fetch_and_fuse_data_async(symbol, dte_min, dte_max, price_range_percent))
-                        result = future.result(timeout=60)
-                else:
-                    result = asyncio.run(self.fetch_and_fuse_data_async(symbol, dte_min, dte_max, price_range_percent))
-            except RuntimeError:
-                # No event loop exists, create one
-                result = asyncio.run(self.fetch_and_fuse_data_async(symbol, dte_min, dte_max, price_range_percent))
-            
-            return result.bundle, result.historical_data, result.status, result.errors, result.messages
+            return future.result(timeout=self.async_call_timeout_seconds)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self.logger.error(f"⏱️ Background I/O call timed out after {self.async_call_timeout_seconds:g}s; cancelled")
+            raise
+
+    def startup(self) -> None:
+        """Starts the background event loop and opens the pooled API sessions."""
+        self._run_async(self.tradier_fetcher.start)
+        self.logger.info("🚀 Orchestrator I/O started.")
+
+    def shutdown(self) -> None:
+        """Closes pooled API sessions, stops the background event loop and the metric workers. Safe to call more than once."""
+        self.initial_processor.shutdown()
+        with self._async_lock:
+            loop, thread = self._async_loop, self._async_thread
+            self._async_loop, self._async_thread = None, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.tradier_fetcher.close(), loop).result(timeout=10)
         except Exception as e:
-            return None, None, 'failed', [f'Exception in sync wrapper: {e}'], []
+            self.logger.warning(f"Error closing Tradier session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=10)
+        loop.close()
+        self.logger.info("🛑 Orchestrator I/O shut down.")
+
+    def _fetch_and_fuse_data(self, symbol: str, dte_min: int, dte_max: int, price_range_percent: int,
+                             underlying_snapshot: Optional[Dict[str, RawUnderlyingDataCombinedV2_5]] = None) -> tuple[Optional[RawDataBundleV2_5], Optional[pd.DataFrame], str, list, list]:
+        """
+        Sync wrapper for async fetch, returns bundle, historical, status, errors, messages.
+
+        Identical requests (symbol, dte_min, dte_max, price_range_percent) are coalesced:
+        concurrent callers wait on the one in-flight fetch, and a successful result is
+        reused for fetch_coalesce_window_seconds.
+        """
+        key = (symbol, dte_min, dte_max, price_range_percent)
+        result: Optional[DataFetchResult] = None
+        is_leader = False
+        with self._inflight_lock:
+            recent = self._recent_fetches.get(key)
+            if recent is not None and time.monotonic() - recent[0] <= self.fetch_coalesce_window_seconds:
+                result = recent[1]
+                self.logger.debug(f"Reusing fetch result for {key} ({time.monotonic() - recent[0]:.1f}s old)")
+            else:
+                future = self._inflight_fetches.get(key)
+                if future is None:
+                    future = concurrent.futures.Future()
+                    self._inflight_fetches[key] = future
+                    is_leader = True
+                else:
+                    self.logger.debug(f"Joining in-flight fetch for {key}")
+
+        if result is None and is_leader:
+            try:
+                result = self._run_async(
+                    lambda: self.fetch_and_fuse_data_async(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot)
+                )
+            except Exception as e:
+                result = DataFetchResult(None, None, 'failed', [f'Exception in sync wrapper: {e}'], [])
+            except BaseException as e:
+                # The leader is interrupted (and re-raises); the callers waiting on it still get a result
+                result = DataFetchResult(None, None, 'failed', [f'Fetch aborted: {type(e).__name__}: {e}'], [])
+                raise
+            finally:
+                if result is None:
+                    result = DataFetchResult(None, None, 'failed', ['Fetch aborted'], [])
+                with self._inflight_lock:
+                    self._inflight_fetches.pop(key, None)
+                    now = time.monotonic()
+                    self._recent_fetches = {
+                        k: v for k, v in self._recent_fetches.items()
+                        if now - v[0] <= self.fetch_coalesce_window_seconds
+                    }
+                    if result is not None and result.status != 'failed':
+                        self._recent_fetches[key] = (now, result)
+                future.set_result(result)
+        elif result is None:
+            result = future.result()
+
+        # Each caller gets its own bundle and history copies so changes by one caller don't leak into the others
+        bundle = result.bundle
+        if bundle is not None:
+            bundle = bundle.model_copy(update={'errors': list(bundle.errors)})
+        historical_df = result.historical_data.copy() if result.historical_data is not None else None
+        return bundle, historical_df, result.status, list(result.errors), list(result.messages)
 
     def _manage_active_recommendations(self, current_price: float):
         """Manages the lifecycle of active recommendations."""
@@ -0,0 +1,100 @@
+# core_analytics_engine/metric_context_v2_5.py
+# EOTS v2.5 - PER-INVOCATION METRIC CALCULATION CONTEXT AND PER-SYMBOL CACHES
+#
+# Everything a single calculate_all_metrics() call derives for its symbol (the
+# strike index, the exposure cube, which metric groups finished) lives in a
+# context object created for that call and passed explicitly to the methods
+# that need it. The calculator instance keeps no per-call state, so one
+# calculator can serve many symbols at once from several threads. State that
+# must persist across calls (rolling normalization stats) is kept per symbol
+# behind a per-symbol lock.
+
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from core_analytics_engine.exposure_cube_v2_5 import ExposureCubeV2_5
+from core_analytics_engine.strike_index_v2_5 import StrikeIndexV2_5
+
+
+class MetricCalculationContextV2_5:
+    """
+    State of one metric calculation for one symbol.
+
+    Holds only plain data (NumPy arrays, sets, dicts), so it can also be handed to a
+    worker process. Once the strike table is built, the strike index and cube are not
+    mutated again: concurrent metric groups of the same call read them safely.
+    """
+
+    __slots__ = ('symbol', 'calculation_timestamp', 'metrics_completed', 'validation_results',
+                 'strike_index', 'exposure_cube')
+
+    def __init__(self, symbol: str, calculation_timestamp: Optional[datetime] = None):
+        self.symbol = symbol
+        self.calculation_timestamp = calculation_timestamp or datetime.now()
+        self.metrics_completed: Set[str] = set()
+        self.validation_results: Dict[str, Any] = {}
+        self.strike_index: Optional[StrikeIndexV2_5] = None
+        self.exposure_cube: Optional[ExposureCubeV2_5] = None
+
+    def mark_completed(self, metric_group: str) -> None:
+        self.metrics_completed.add(metric_group)
+
+    def missing_dependencies(self, dependencies: Iterable[str]) -> List[str]:
+        """The dependencies that have not completed in this calculation."""
+        return [group for group in dependencies if group not in self.metrics_completed]
+
+    def strike_arrays(self, df_strike: pd.DataFrame) -> StrikeIndexV2_5:
+        """
+        This calculation's strike index if it is aligned with df_strike, otherwise one
+        built from the frame. Columns the frame gained since the index was built are
+        picked up on a private copy, leaving the shared index untouched.
+        """
+        if self.strike_index is not None and self.strike_index.matches(df_strike):
+            strike_arrays = self.strike_index.copy()
+            strike_arrays.adopt_columns(df_strike)
+            return strike_arrays
+        return StrikeIndexV2_5.from_strike_frame(df_strike)
+
+    def aligned_exposure_cube(self, df_strike: pd.DataFrame) -> Optional[ExposureCubeV2_5]:
+        """This calculation's expiration x strike cube if it is aligned with df_strike, otherwise None."""
+        if self.exposure_cube is not None and self.strike_index is not None and self.strike_index.matches(df_strike):
+            return self.exposure_cube
+        return None
+
+
+class SymbolMetricCachesV2_5:
+    """
+    Metric caches that persist across calculations, isolated per (metric, symbol, type).
+
+    Calculations for different symbols never share a cache; `locked(symbol)` serializes
+    the read-modify-write updates of one symbol's caches (e.g. the dashboard and the
+    collector calculating the same ticker at the same time).
+    """
+
+    def __init__(self):
+        self._caches: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._registry_lock = threading.Lock()
+
+    def get(self, metric_name: str, symbol: str, cache_type: str = 'history') -> Dict[str, Any]:
+        with self._registry_lock:
+            return self._caches.setdefault((metric_name, symbol, cache_type), {})
+
+    @contextmanager
+    def locked(self, symbol: str) -> Iterator[None]:
+        with self._registry_lock:
+            lock = self._locks.setdefault(symbol, threading.RLock())
+        with lock:
+            yield
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drops every cache, or only those of one symbol."""
+        with self._registry_lock:
+            if symbol is None:
+                self._caches.clear()
+            else:
+                self._caches = {key: cache for key, cache in self._caches.items() if key[1] != symbol}
@@ -0,0 +1,149 @@
+# core_analytics_engine/metric_dag_v2_5.py
+# EOTS v2.5 - METRIC GROUP DEPENDENCY GRAPH AND EXECUTOR
+#
+# Metric groups declare the groups they read from. The executor runs a group as
+# soon as its dependencies have finished, so independent groups (per-strike
+# adaptive metrics, heatmap data, enhanced flow, ATR) overlap on a thread pool.
+# Callers may ask for a subset of metrics: only the groups producing them and
+# their transitive dependencies are run.
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MetricGroupV2_5(NamedTuple):
+    """A node of the metric graph: its name, the groups it reads, and the metric names it produces."""
+    name: str
+    depends_on: Tuple[str, ...] = ()
+    # Output keys/columns; a requested name matches an output exactly or as its prefix ("vapi_fa" -> "vapi_fa_z_score_und")
+    outputs: Tuple[str, ...] = ()
+
+
+class MetricDagExecutorV2_5:
+    """
+    Runs metric group tasks in dependency order, concurrently where the graph allows.
+
+    A task is a callable receiving a dict of the results of the groups finished so far
+    (it should only read its declared dependencies) and returning its own result.
+    """
+
+    def __init__(self, groups: Sequence[MetricGroupV2_5], max_workers: int = 4):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.groups: Dict[str, MetricGroupV2_5] = {group.name: group for group in groups}
+        self.order: List[str] = self._topological_order()
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if name not in self.groups:
+                raise ValueError(f"Metric group '{path[-1]}' depends on unknown group '{name}'")
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Metric dependency cycle: {' -> '.join(path + (name,))}")
+            state[name] = 1
+            for dependency in self.groups[name].depends_on:
+                visit(dependency, path + (name,))
+            state[name] = 2
+            order.append(name)
+
+        for name in self.groups:
+            visit(name, (name,))
+        return order
+
+    def resolve(self, requested: Iterable[str]) -> Set[str]:
+        """Maps requested group names or metric names to the groups producing them; unknown names are logged and skipped."""
+        targets: Set[str] = set()
+        for name in requested:
+            if name in self.groups:
+                targets.add(name)
+                continue
+            exact = [group.name for group in self.groups.values() if name in group.outputs]
+            if exact:
+                targets.update(exact)
+                continue
+            by_prefix = [group.name for group in self.groups.values()
+                         if any(name.startswith(output + '_') for output in group.outputs)]
+            if by_prefix:
+                targets.update(by_prefix)
+            else:
+                self.logger.warning(f"⚠️ Requested metric '{name}' is not produced by any metric group; ignored")
+        return targets
+
+    def required(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """The targets plus their transitive dependencies, in execution order (every group if targets is None)."""
+        if targets is None:
+            return list(self.order)
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.groups[name].depends_on)
+        return [name for name in self.order if name in needed]
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="MetricDag")
+            return self._pool
+
+    def run(self, tasks: Mapping[str, Callable[[Dict[str, Any]], Any]],
+            targets: Optional[Iterable[str]] = None,
+            completed: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Runs the tasks of the required groups and returns {group: result}.
+
+        Groups in `completed` (e.g. computed for many symbols at once by a batch caller)
+        are not run; their given results are used by the groups depending on them.
+        With max_workers <= 1 the groups run in order on the calling thread. If a task
+        raises, the tasks already running are waited for and the exception is re-raised.
+        """
+        completed = completed or {}
+        required = self.required(targets)
+        results: Dict[str, Any] = {name: completed[name] for name in required if name in completed}
+        plan = [name for name in required if name not in results]
+        if self.max_workers <= 1:
+            for name in plan:
+                results[name] = tasks[name](dict(results))
+            return results
+
+        pool = self._get_pool()
+        waiting = {name: set(self.groups[name].depends_on) - set(results) for name in plan}
+        running: Dict[Any, str] = {}
+
+        def submit_ready() -> None:
+            for name in [name for name, pending in waiting.items() if not pending]:
+                del waiting[name]
+                running[pool.submit(tasks[name], dict(results))] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    wait(list(running))
+                    raise error
+                results[name] = future.result()
+                for pending in waiting.values():
+                    pending.discard(name)
+            submit_ready()
+        return results
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
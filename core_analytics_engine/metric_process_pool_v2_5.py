@@ -0,0 +1,208 @@
+# core_analytics_engine/metric_process_pool_v2_5.py
+# EOTS v2.5 - PROCESS-POOL BACKEND FOR METRIC CALCULATION
+#
+# Runs the per-strike and aggregate metric groups (MetricsCalculatorV2_5.
+# WORKER_METRIC_GROUPS) of many symbols in worker processes, so a watchlist
+# cycle uses several cores instead of one GIL. Chains go to the workers and
+# strike tables come back through shared memory column blocks
+# (utils.shared_frame_v2_5); only small descriptors and the underlying-level
+# result dicts are pickled. Each symbol stays on one worker across cycles, so
+# the per-symbol rolling state of the heatmap normalization lives in one place.
+# The groups that use the intraday history or historical data (enhanced flow,
+# ATR, flow history) are finished by the calling process's calculator.
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from utils.config_manager_v2_5 import ConfigManagerV2_5
+from utils.shared_frame_v2_5 import SharedFrameV2_5, read_shared_frame, release_shared_frame, share_frame
+
+logger = logging.getLogger(__name__)
+
+# The calculator of a worker process, created by _init_metric_worker
+_worker_calculator = None
+
+
+def _init_metric_worker() -> None:
+    global _worker_calculator
+    from core_analytics_engine.metrics_calculator_v2_5 import MetricsCalculatorV2_5
+    # The worker groups never read historical data, so no historical data manager
+    # (and no OHLCV store connection) is opened in the worker
+    _worker_calculator = MetricsCalculatorV2_5(ConfigManagerV2_5(), None)
+
+
+def _calculate_in_worker(chain: SharedFrameV2_5, und_data: Dict[str, Any],
+                         requested_metrics: Optional[List[str]]) -> Tuple[Dict[str, Any], int, float]:
+    """Worker side: reads the chain from shared memory, runs the worker groups, shares the strike table back."""
+    started = time.perf_counter()
+    options_df = read_shared_frame(chain)
+    results = _worker_calculator.calculate_worker_metric_groups(options_df, und_data, requested_metrics)
+    df_strike = results.get('strike_table')
+    if df_strike is not None:
+        shm, results['strike_table'] = share_frame(df_strike)
+        shm.close()  # the calling process reads and removes the block
+    return results, os.getpid(), time.perf_counter() - started
+
+
+class MetricWorkerStatsV2_5(NamedTuple):
+    """Load of one metric worker since the statistics were last reset."""
+    worker: int
+    pid: Optional[int]
+    symbols: Tuple[str, ...]
+    tasks: int
+    busy_seconds: float
+    utilization: float  # busy share of the wall time since the reset
+
+
+class MetricProcessPoolV2_5:
+    """
+    A fixed set of single-process metric workers with sticky symbol assignment.
+
+    A symbol is assigned to the worker with the fewest symbols the first time it is
+    seen and stays there; a worker that dies is replaced on its next use (its symbols
+    start their heatmap normalization history afresh).
+    """
+
+    def __init__(self, workers: int):
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.workers = workers
+        self._context = multiprocessing.get_context("spawn")  # the caller runs threads; never fork them
+        self._executors: List[Optional[ProcessPoolExecutor]] = [None] * workers
+        self._assignments: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pids: List[Optional[int]] = [None] * workers
+        self._tasks = [0] * workers
+        self._busy = [0.0] * workers
+        self._stats_since = time.perf_counter()
+        self.logger.info(f"🧮 Metric process pool with {workers} workers")
+
+    @classmethod
+    def from_config(cls, config_manager: ConfigManagerV2_5) -> Optional['MetricProcessPoolV2_5']:
+        """
+        The pool configured by data_processor_settings.metric_process_workers: None when
+        0 (metrics are calculated in-process), one worker per CPU core when -1.
+        """
+        workers = int(config_manager.get_setting("data_processor_settings.metric_process_workers", 0))
+        if workers < 0:
+            workers = os.cpu_count() or 1
+        return cls(workers) if workers > 0 else None
+
+    def _worker_for(self, symbol: str) -> int:
+        with self._lock:
+            worker = self._assignments.get(symbol)
+            if worker is None:
+                load = [0] * self.workers
+                for assigned in self._assignments.values():
+                    load[assigned] += 1
+                worker = self._assignments[symbol] = load.index(min(load))
+            return worker
+
+    def _executor(self, worker: int) -> ProcessPoolExecutor:
+        with self._lock:
+            executor = self._executors[worker]
+            if executor is None:
+                executor = self._executors[worker] = ProcessPoolExecutor(
+                    max_workers=1, mp_context=self._context, initializer=_init_metric_worker)
+            return executor
+
+    def _discard(self, worker: int) -> None:
+        """Drops a broken worker; the next task for it starts a new process."""
+        with self._lock:
+            executor, self._executors[worker] = self._executors[worker], None
+            self._pids[worker] = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def calculate(self, symbol_inputs: Mapping[str, Tuple[pd.DataFrame, Dict[str, Any]]],
+                  requested_metrics: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Runs the worker metric groups of every symbol (symbol_inputs as for
+        MetricsCalculatorV2_5.calculate_metrics_batch) in the worker processes.
+
+        Returns {key: {group: result}} for calculate_all_metrics(precomputed_groups=...).
+        A symbol whose worker fails is logged and left out, so the caller calculates
+        it in-process.
+        """
+        started = time.perf_counter()
+        submitted = {}
+        for key, (options_df, und_data) in symbol_inputs.items():
+            worker = self._worker_for(und_data.get('symbol', key))
+            shm, chain = share_frame(options_df)
+            try:
+                future = self._executor(worker).submit(_calculate_in_worker, chain, dict(und_data), requested_metrics)
+            except (BrokenProcessPool, RuntimeError) as e:
+                release_shared_frame(shm)
+                self.logger.error(f"❌ Metric worker {worker} unavailable for {key}: {e}")
+                self._discard(worker)
+                continue
+            submitted[key] = (future, shm, worker)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        cycle_busy = [0.0] * self.workers
+        for key, (future, shm, worker) in submitted.items():
+            try:
+                groups, pid, busy = future.result()
+            except BrokenProcessPool as e:
+                self.logger.error(f"❌ Metric worker {worker} died calculating {key}: {e}")
+                self._discard(worker)
+                continue
+            except Exception as e:
+                self.logger.error(f"❌ Metric worker {worker} failed for {key}: {e}", exc_info=True)
+                continue
+            finally:
+                release_shared_frame(shm)
+            strike_frame = groups.get('strike_table')
+            if strike_frame is not None:
+                try:
+                    groups['strike_table'] = read_shared_frame(strike_frame)
+                finally:
+                    release_shared_frame(strike_frame.shm_name)
+            with self._lock:
+                self._pids[worker] = pid
+                self._tasks[worker] += 1
+                self._busy[worker] += busy
+            cycle_busy[worker] += busy
+            results[key] = groups
+
+        if submitted:
+            wall = time.perf_counter() - started
+            self.logger.info(
+                f"🧮 {len(results)}/{len(symbol_inputs)} symbols on metric workers in {wall:.2f}s; busy: "
+                + ", ".join(f"#{worker} {busy / wall:.0%}" for worker, busy in enumerate(cycle_busy)))
+        return results
+
+    def utilization(self, reset: bool = False) -> List[MetricWorkerStatsV2_5]:
+        """Per-worker load since the pool started or the last reset."""
+        with self._lock:
+            wall = max(time.perf_counter() - self._stats_since, 1e-9)
+            symbols: Dict[int, List[str]] = {}
+            for symbol, worker in self._assignments.items():
+                symbols.setdefault(worker, []).append(symbol)
+            stats = [
+                MetricWorkerStatsV2_5(worker, self._pids[worker], tuple(symbols.get(worker, ())),
+                                      self._tasks[worker], self._busy[worker], self._busy[worker] / wall)
+                for worker in range(self.workers)
+            ]
+            if reset:
+                self._tasks = [0] * self.workers
+                self._busy = [0.0] * self.workers
+                self._stats_since = time.perf_counter()
+            return stats
+
+    def shutdown(self) -> None:
+        """Stops the worker processes. Safe to call more than once."""
+        with self._lock:
+            executors, self._executors = self._executors, [None] * self.workers
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
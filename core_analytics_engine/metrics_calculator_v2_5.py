@@ -2,17 +2,24 @@
 # EOTS v2.5 - S-GRADE, AUTHORITATIVE & COMPLETE METRICS CALCULATOR
 
 import logging
-from typing import Any, Dict, Tuple, List, TYPE_CHECKING, Optional
+import threading
+from typing import Any, Dict, Mapping, Sequence, Tuple, List, TYPE_CHECKING, Optional
 import numpy as np
 import pandas as pd
 from scipy import stats
 import os
-import json
-from datetime import datetime, date, time
-from pathlib import Path
+from datetime import datetime, time
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from data_models.eots_schemas_v2_5 import RawOptionsContractV2_5, RawUnderlyingDataV2_5, ProcessedStrikeLevelMetricsV2_5
+from core_analytics_engine.strike_index_v2_5 import STRIKE_SUM_COLUMNS, StrikeIndexV2_5
+from core_analytics_engine.exposure_cube_v2_5 import ExposureCubeV2_5
+from core_analytics_engine.metric_context_v2_5 import MetricCalculationContextV2_5, SymbolMetricCachesV2_5
+from core_analytics_engine.metric_dag_v2_5 import MetricDagExecutorV2_5, MetricGroupV2_5
+from core_analytics_engine.ragged_strike_table_v2_5 import RaggedStrikeTableV2_5
+from data_management.flow_window_accumulator_v2_5 import FLOW_WINDOW_MINUTES, FlowWindowAccumulatorV2_5
+from data_management.intraday_metric_store_v2_5 import IntradayMetricStoreV2_5
+from data_management.strike_history_matrix_v2_5 import StrikeHistoryMatrixV2_5
 
 if TYPE_CHECKING:
     from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2_5
@@ -31,6 +38,16 @@ class MetricsCalculatorV2_5:
     Tier 3 Enhanced Flow Metrics (VAPI-FA, DWFD, TW-LAF), and Enhanced Heatmap Data (SGDHP, IVSDH, UGCH).
     """
 
+    # Metric groups that read neither the intraday history nor historical data, so they
+    # can be calculated in a metric worker process. Heatmap normalization keeps rolling
+    # stats per symbol, which stay with the worker the symbol is assigned to.
+    WORKER_METRIC_GROUPS = frozenset({'foundational', 'strike_table', 'adaptive', 'heatmap',
+                                      'exposure_aggregates', 'adaptive_aggregates', 'gib'})
+    # (intraday metric, raw und key, gauge und key) of the enhanced flow metrics
+    FLOW_GAUGE_METRICS = (('vapi_fa', 'vapi_fa_raw_und', 'vapi_fa_z_score_und'),
+                          ('dwfd', 'dwfd_raw_und', 'dwfd_z_score_und'),
+                          ('tw_laf', 'tw_laf_raw_und', 'tw_laf_z_score_und'))
+
     def __init__(self, config_manager: ConfigManagerV2_5, historical_data_manager: 'HistoricalDataManagerV2_5'):
         self.logger = logger.getChild(self.__class__.__name__)
         self.config_manager = config_manager
@@ -41,35 +58,42 @@ class MetricsCalculatorV2_5:
         self.adaptive_params = self.config_manager.get_setting("adaptive_metric_parameters", default={})
         self.data_processor_settings = self.config_manager.get_setting("data_processor_settings", default={})
         
-        # ISOLATED METRIC CACHES - Prevent cross-metric interference
-        self._metric_caches = {
-            'vapi_fa': {},
-            'dwfd': {},
-            'tw_laf': {},
-            'a_dag': {},
-            'e_sdag': {},
-            'd_tdpi': {},
-            'vri_2_0': {},
-            'heatmap': {},
-            'normalization': {}
-        }
+        # ISOLATED METRIC CACHES - Prevent cross-metric and cross-symbol interference
+        self._metric_caches = SymbolMetricCachesV2_5()
         
-        # Metric calculation state tracking
-        self._calculation_state = {
-            'current_symbol': None,
-            'calculation_timestamp': None,
-            'metrics_completed': set(),
-            'validation_results': {}
-        }
+        # Per-call state (current symbol, strike index, completed groups) lives in a
+        # MetricCalculationContextV2_5 created by each calculation, so calculations for
+        # different symbols can run concurrently on this instance
         
-        # Metric dependency graph
-        self._metric_dependencies = {
-            'foundational': [],
-            'enhanced_flow': ['foundational'],
-            'adaptive': ['foundational'],
-            'aggregates': ['enhanced_flow', 'adaptive'],
-            'atr': []
-        }
+        # Metric dependency graph: groups run as soon as the groups they read are done
+        self._metric_groups = (
+            MetricGroupV2_5('foundational', (), ('net_cust_delta_flow_und', 'net_cust_gamma_flow_und',
+                                                 'net_cust_vega_flow_und', 'net_cust_theta_flow_und')),
+            MetricGroupV2_5('strike_table', (), ('strike_level_data',)),
+            MetricGroupV2_5('adaptive', ('strike_table',), ('a_dag', 'e_sdag', 'd_tdpi', 'vri_2_0', '0dte',
+                                                             'vci_0dte', 'gci_0dte', 'dci_0dte')),
+            MetricGroupV2_5('heatmap', ('strike_table',), ('sgdhp', 'ivsdh', 'ugch', 'heatmap')),
+            MetricGroupV2_5('exposure_aggregates', ('strike_table',), (
+                'total_delta_flow', 'total_gamma_flow', 'total_vega_flow', 'total_theta_flow',
+                'total_delta_exposure', 'total_gamma_exposure', 'total_vega_exposure', 'total_theta_exposure',
+                'total_nvp', 'total_nvp_vol', 'vapi_fa_und_aggregate', 'dwfd_und_aggregate', 'tw_laf_und_aggregate')),
+            MetricGroupV2_5('adaptive_aggregates', ('adaptive',), (
+                'a_dag_und_aggregate', 'vri_2_0_und_aggregate', 'a_sai_und_avg', 'a_ssi_und_avg',
+                'total_0dte_gamma', 'total_0dte_delta', 'total_0dte_vanna')),
+            MetricGroupV2_5('gib', ('foundational', 'exposure_aggregates'), ('gib_oi_based_und', 'hp_eod_und', 'td_gib_und')),
+            MetricGroupV2_5('enhanced_flow', ('exposure_aggregates',), ('vapi_fa', 'dwfd', 'tw_laf')),
+            MetricGroupV2_5('atr', (), ('atr_und',)),
+            MetricGroupV2_5('flow_history', ('foundational', 'strike_table', 'enhanced_flow'), (
+                'vapifa_zscore_history', 'vapifa_time_history', 'dwfd_zscore_history', 'dwfd_time_history',
+                'twlaf_zscore_history', 'twlaf_time_history', 'rolling_flows', 'rolling_flows_time',
+                'nvp_by_strike', 'nvp_vol_by_strike', 'strikes', 'greek_flows', 'greek_flows_time',
+                'flow_ratios', 'flow_ratios_time')),
+        )
+        self._metric_dependencies = {group.name: list(group.depends_on) for group in self._metric_groups}
+        self._metric_dag = MetricDagExecutorV2_5(
+            self._metric_groups,
+            max_workers=int(self.config_manager.get_setting("data_processor_settings.metric_worker_threads", 4))
+        )
         
         # Isolated configuration contexts for each metric group
         self._metric_configs = {
@@ -82,21 +106,31 @@ class MetricsCalculatorV2_5:
         # DEPRECATED: Old unified cache replaced with isolated caches
         # self._historical_cache = {}
         
-        # Intraday cache directory
-        self.intraday_cache_dir = Path("cache/intraday_metrics")
-        self.intraday_cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Current trading date for cache management
-        self.current_trading_date = date.today().strftime("%Y-%m-%d")
+        # Intraday metric history: in-memory ring buffers with a write-behind daily log.
+        # Opened on first use, so a calculator in a metric worker process (which only
+        # runs groups without intraday history) never replays or appends to the log.
+        self._intraday_store: Optional[IntradayMetricStoreV2_5] = None
+        self._intraday_store_lock = threading.Lock()
         
         self.logger.info("MetricsCalculatorV2_5 (Authoritative) initialized with isolated metric calculations and configuration contexts.")
 
+    @property
+    def intraday_store(self) -> IntradayMetricStoreV2_5:
+        with self._intraday_store_lock:
+            if self._intraday_store is None:
+                intraday_log_dir = self.config_manager.get_resolved_path(
+                    "data_management_settings.intraday_metric_log_directory", "cache/intraday_metric_log")
+                self._intraday_store = IntradayMetricStoreV2_5(
+                    intraday_log_dir,
+                    capacity=200,
+                    flush_interval_seconds=float(self.config_manager.get_setting(
+                        "data_management_settings.intraday_metric_flush_seconds", 5.0))
+                )
+            return self._intraday_store
+
     def _get_isolated_cache(self, metric_name: str, symbol: str, cache_type: str = 'history') -> Dict[str, Any]:
         """Get isolated cache for a specific metric and symbol."""
-        cache_key = f"{metric_name}_{symbol}_{cache_type}"
-        if cache_key not in self._metric_caches:
-            self._metric_caches[cache_key] = {}
-        return self._metric_caches[cache_key]
+        return self._metric_caches.get(metric_name, symbol, cache_type)
 
     def _store_metric_data(self, metric_name: str, symbol: str, data: Any, cache_type: str = 'history') -> None:
         """Store metric data in isolated cache."""
@@ -127,15 +161,12 @@ class MetricsCalculatorV2_5:
             self.logger.error(f"Error validating {metric_name}: {e}")
             return False
     
-    def _check_metric_dependencies(self, metric_group: str) -> bool:
+    def _check_metric_dependencies(self, metric_group: str, context: MetricCalculationContextV2_5) -> bool:
         """Check if metric dependencies are satisfied before calculation."""
         try:
-            required_groups = self._metric_dependencies.get(metric_group, [])
-            
-            for required_group in required_groups:
-                if required_group not in self._calculation_state['metrics_completed']:
-                    self.logger.error(f"Dependency {required_group} not completed for {metric_group}")
-                    return False
+            for required_group in context.missing_dependencies(self._metric_dependencies.get(metric_group, [])):
+                self.logger.error(f"Dependency {required_group} not completed for {metric_group}")
+                return False
             
             return True
             
@@ -143,10 +174,10 @@ class MetricsCalculatorV2_5:
             self.logger.error(f"Error checking dependencies for {metric_group}: {e}")
             return False
     
-    def _mark_metric_completed(self, metric_group: str) -> None:
+    def _mark_metric_completed(self, metric_group: str, context: MetricCalculationContextV2_5) -> None:
         """Mark metric group as completed."""
-        self._calculation_state['metrics_completed'].add(metric_group)
-        self.logger.debug(f"Metric group {metric_group} completed")
+        context.mark_completed(metric_group)
+        self.logger.debug(f"Metric group {metric_group} completed for {context.symbol}")
     
     def _get_metric_config(self, metric_group: str, config_key: str, default_value: Any = None) -> Any:
         """Get configuration value for a specific metric group and key."""
@@ -218,109 +249,159 @@ class MetricsCalculatorV2_5:
         self, 
         options_df_raw: pd.DataFrame, 
         und_data_api_raw: Dict[str, Any],
-        dte_max: int = 45
+        dte_max: int = 45,
+        requested_metrics: Optional[List[str]] = None,
+        precomputed_groups: Optional[Dict[str, Any]] = None
     ) -> Tuple[Optional[pd.DataFrame], pd.DataFrame, Dict[str, Any]]:
         """
         Main orchestration method for calculating all metrics.
         Returns (df_strike, df_options_with_metrics, und_data_enriched)
+
+        Metric groups run through the dependency graph (concurrently where independent).
+        If requested_metrics (metric or group names) is given, only the groups producing
+        them and their dependencies are calculated; other outputs are absent.
+        precomputed_groups ({group: result}, e.g. from calculate_worker_metric_groups() in a
+        worker process) are used as they are instead of being calculated again.
+        """
+        return self._calculate_symbol_metrics(options_df_raw, und_data_api_raw, dte_max,
+                                              self._resolve_metric_targets(requested_metrics),
+                                              precomputed_groups)
+
+    def calculate_metrics_batch(
+        self,
+        symbol_inputs: Mapping[str, Tuple[pd.DataFrame, Dict[str, Any]]],
+        dte_max: int = 45,
+        requested_metrics: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[Optional[pd.DataFrame], pd.DataFrame, Dict[str, Any]]]:
+        """
+        Calculates the metrics of several symbols (e.g. the watchlist) in one call.
+
+        symbol_inputs maps each symbol to its (options_df_raw, und_data_api_raw). The
+        strike tables are concatenated into one ragged table so the per-strike adaptive
+        (A-DAG, E-SDAG, D-TDPI, VRI 2.0, 0DTE) and heatmap metrics run as single
+        vectorized passes over every symbol; each symbol's columns are zero-copy slices
+        of those arrays. The enhanced flow metrics of every symbol are then gauged with one
+        bulk intraday lookup per metric, and the remaining underlying-level groups run per
+        symbol. Returns {symbol: the calculate_all_metrics() tuple}.
+        """
+        targets = self._resolve_metric_targets(requested_metrics)
+        plan = set(self._metric_dag.required(targets))
+        inputs: Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]] = {}
+        completed: Dict[str, Dict[str, Any]] = {}
+        contexts: Dict[str, MetricCalculationContextV2_5] = {}
+        segments = []  # (symbol, strike index, cube, und_raw, dte context) of non-empty strike tables
+        for symbol, (options_df_raw, und_data_api_raw) in symbol_inputs.items():
+            und_raw = dict(und_data_api_raw)
+            und_raw.setdefault('symbol', symbol)
+            inputs[symbol] = (options_df_raw, und_raw)
+            if 'strike_table' not in plan or options_df_raw.empty:
+                continue
+            context = MetricCalculationContextV2_5(und_raw['symbol'])
+            try:
+                df_strike = self._create_strike_level_df(options_df_raw, und_raw, context)
+            except Exception as e:
+                # The symbol's own pass retries (and reports) it
+                self.logger.error(f"Error building strike table for {symbol} in batch: {e}", exc_info=True)
+                continue
+            completed[symbol] = {'strike_table': df_strike}
+            contexts[symbol] = context
+            if not df_strike.empty and context.strike_index is not None:
+                segments.append((symbol, context.strike_index, context.exposure_cube,
+                                 und_raw, self._get_average_dte_context(df_strike)))
+
+        if segments and plan & {'adaptive', 'heatmap'}:
+            try:
+                table = RaggedStrikeTableV2_5.from_strike_indexes([(symbol, index) for symbol, index, _, _, _ in segments])
+                unds = [und for _, _, _, und, _ in segments]
+                by_group = {}
+                if 'adaptive' in plan:
+                    by_group['adaptive'] = table.split(self._adaptive_columns(
+                        table, unds, [cube for _, _, cube, _, _ in segments], [dte_context for *_, dte_context in segments]))
+                if 'heatmap' in plan:
+                    prices, _, _ = self._segment_contexts(unds)
+                    by_group['heatmap'] = table.split(self._heatmap_columns(table, prices))
+                for group, columns_by_symbol in by_group.items():
+                    for symbol, columns in columns_by_symbol.items():
+                        completed[symbol][group] = columns
+                self.logger.debug(f"Batched adaptive/heatmap metrics for {table.n_segments} symbols, {len(table)} strikes")
+            except Exception as e:
+                # Fall back to per-symbol adaptive and heatmap passes
+                self.logger.error(f"Error in batched strike metrics, calculating per symbol: {e}", exc_info=True)
+                for symbol, *_ in segments:
+                    completed[symbol].pop('adaptive', None)
+                    completed[symbol].pop('heatmap', None)
+
+        if 'enhanced_flow' in plan:
+            flows = {}  # context symbol -> enhanced flow und updates, z-scores still to gauge
+            for symbol, groups in completed.items():
+                options_df_raw, und_raw = inputs[symbol]
+                try:
+                    aggregates = self._calculate_exposure_aggregates(groups['strike_table'])
+                    flows[contexts[symbol].symbol] = self._run_und_group(
+                        self._calculate_enhanced_flow_metrics, {**und_raw, **aggregates}, contexts[symbol].symbol,
+                        options_df_raw, False)
+                except Exception as e:
+                    # The symbol's own pass retries (and reports) it
+                    self.logger.error(f"Error calculating enhanced flow for {symbol} in batch: {e}", exc_info=True)
+                    continue
+                groups['exposure_aggregates'] = aggregates
+                groups['enhanced_flow'] = flows[contexts[symbol].symbol]
+            self._gauge_flow_metrics(flows)
+
+        return {
+            symbol: self._calculate_symbol_metrics(options_df_raw, und_raw, dte_max, targets,
+                                                   completed.get(symbol), contexts.get(symbol))
+            for symbol, (options_df_raw, und_raw) in inputs.items()
+        }
+
+    def _resolve_metric_targets(self, requested_metrics: Optional[List[str]]) -> Optional[set]:
+        """Metric groups producing the requested metrics, or None for all of them."""
+        if not requested_metrics:
+            return None
+        return self._metric_dag.resolve(requested_metrics) or None
+
+    def _calculate_symbol_metrics(
+        self,
+        options_df_raw: pd.DataFrame,
+        und_data_api_raw: Dict[str, Any],
+        dte_max: int,
+        targets: Optional[set],
+        completed: Optional[Dict[str, Any]] = None,
+        context: Optional[MetricCalculationContextV2_5] = None
+    ) -> Tuple[Optional[pd.DataFrame], pd.DataFrame, Dict[str, Any]]:
+        """
+        Runs the metric graph for one symbol. Groups in `completed` were already calculated
+        by a batch, with `context` (otherwise a fresh context is created for this call).
         """
         try:
-            # Set the current symbol from the underlying data
+            # The current symbol comes from the underlying data; all per-call state lives in the context
             symbol = und_data_api_raw.get('symbol', 'UNKNOWN')
-            self._calculation_state['current_symbol'] = symbol
+            context = context or MetricCalculationContextV2_5(symbol)
             
             self.logger.debug(f"Starting isolated metric calculations for symbol '{symbol}'.")
             
             # Initialize return values - PRESERVE original DataFrame structure
-            df_strike = None
             df_options_with_metrics = options_df_raw.copy()  # Keep all original columns
-            und_data_enriched = und_data_api_raw.copy()
+            und_raw = und_data_api_raw.copy()
             
-            # Step 1: Calculate foundational metrics (excluding GIB which needs aggregates)
-            und_data_enriched = self._calculate_foundational_metrics(und_data_enriched)
-            self._mark_metric_completed('foundational')
+            tasks = self._metric_tasks(options_df_raw, und_raw, dte_max, context)
+            results = self._metric_dag.run(tasks, targets, completed)
             
-            # Step 2: Create strike-level DataFrame if we have options data
-            if not options_df_raw.empty:
-                df_strike = self._create_strike_level_df(options_df_raw, und_data_enriched)
-            
-            # Step 3: Calculate adaptive metrics (only if we have strike data)
+            # Assemble outputs in graph order
+            df_strike = results.get('strike_table')
             if df_strike is not None and not df_strike.empty:
-                df_strike = self._calculate_adaptive_metrics(df_strike, und_data_enriched)
-            self._mark_metric_completed('adaptive')
-            
-            # Step 4: Calculate underlying aggregates FIRST so they're available for GIB and enhanced flow
-            aggregates = self._calculate_underlying_aggregates(df_strike)
-            und_data_enriched.update(aggregates)
-            self._mark_metric_completed('aggregates')
-            
-            # Step 4.5: Calculate GIB-based metrics AFTER aggregates are available
-            und_data_enriched = self._calculate_gib_based_metrics(und_data_enriched)
-            
-            # Step 5: Calculate enhanced flow metrics (needs aggregates)
-            if symbol:
-                und_data_enriched = self._calculate_enhanced_flow_metrics(und_data_enriched, symbol)
-            self._mark_metric_completed('enhanced_flow')
-            
-            # Step 6: Calculate ATR
-            if symbol:
-                und_data_enriched['atr_und'] = self._calculate_atr(symbol, dte_max)
-            self._mark_metric_completed('atr')
-            
-            # Step 7: Add any contract-level metrics to the original DataFrame
-            # For now, we don't have contract-level metrics, so df_options_with_metrics stays as is
-            
-            # Step 8: Final validation
+                df_strike = self._with_strike_columns(df_strike, {**results.get('adaptive', {}), **results.get('heatmap', {})})
+            und_data_enriched = dict(und_raw)
+            for group in self._metric_dag.order:
+                if group in results:
+                    if group in ('foundational', 'exposure_aggregates', 'adaptive_aggregates', 'gib',
+                                 'enhanced_flow', 'atr', 'flow_history'):
+                        und_data_enriched.update(results[group])
+                    self._mark_metric_completed(group, context)
+            
+            # Final validation
             self._perform_final_validation(df_strike, und_data_enriched)
             
-            # --- BEGIN ADVANCED FLOW MODE DATA ATTACHMENT ---
-            now = datetime.now()
-            # 1. Z-score histories for gauges
-            for metric, z_key, hist_key, time_key in [
-                ("vapi_fa", "vapi_fa_z_score_und", "vapifa_zscore_history", "vapifa_time_history"),
-                ("dwfd", "dwfd_z_score_und", "dwfd_zscore_history", "dwfd_time_history"),
-                ("tw_laf", "tw_laf_z_score_und", "twlaf_zscore_history", "twlaf_time_history")
-            ]:
-                symbol = und_data_enriched.get("symbol", "UNKNOWN")
-                # Use intraday cache for history, ensure all values are float
-                z_hist = [float(x) for x in self._load_intraday_cache(symbol, metric) if x is not None]
-                t_hist = [now for _ in z_hist]
-                und_data_enriched[hist_key] = z_hist
-                und_data_enriched[time_key] = t_hist
-            # 2. Rolling flows (simulate with net_cust_delta_flow_und for now)
-            try:
-                rolling_val = float(und_data_enriched.get("net_cust_delta_flow_und", 0.0) or 0.0)
-            except Exception:
-                rolling_val = 0.0
-            und_data_enriched["rolling_flows"] = {"5min": [rolling_val]}
-            und_data_enriched["rolling_flows_time"] = [now]
-            # 3. NVP by strike (from df_strike if available)
-            if df_strike is not None and not df_strike.empty:
-                und_data_enriched["nvp_by_strike"] = [float(x) for x in df_strike["nvp_at_strike"].tolist()] if "nvp_at_strike" in df_strike.columns else []
-                und_data_enriched["nvp_vol_by_strike"] = [float(x) for x in df_strike["nvp_vol_at_strike"].tolist()] if "nvp_vol_at_strike" in df_strike.columns else []
-                und_data_enriched["strikes"] = [float(x) for x in df_strike["strike"].tolist()] if "strike" in df_strike.columns else []
-            else:
-                und_data_enriched["nvp_by_strike"] = []
-                und_data_enriched["nvp_vol_by_strike"] = []
-                und_data_enriched["strikes"] = []
-            # 4. Greek flows (simulate with net_cust_delta/gamma/vega/theta_flow_und)
-            def safe_float(val):
-                try:
-                    return float(val)
-                except Exception:
-                    return 0.0
-            und_data_enriched["greek_flows"] = {
-                "Delta": [safe_float(und_data_enriched.get("net_cust_delta_flow_und", 0.0))],
-                "Gamma": [safe_float(und_data_enriched.get("net_cust_gamma_flow_und", 0.0))],
-                "Vega": [safe_float(und_data_enriched.get("net_cust_vega_flow_und", 0.0))],
-                "Theta": [safe_float(und_data_enriched.get("net_cust_theta_flow_und", 0.0))]
-            }
-            und_data_enriched["greek_flows_time"] = [now]
-            # 5. Flow ratios (simulate with vflowratio if present)
-            und_data_enriched["flow_ratios"] = {"VFlowRatio": [safe_float(und_data_enriched.get("vflowratio", 0.0))]}
-            und_data_enriched["flow_ratios_time"] = [now]
-            # --- END ADVANCED FLOW MODE DATA ATTACHMENT ---
-            
             # Return the strike-level data and the original options data (with any added metrics)
             return df_strike, df_options_with_metrics, und_data_enriched
             
@@ -329,8 +410,159 @@ class MetricsCalculatorV2_5:
             # Return safe defaults - preserve original structure
             return None, options_df_raw.copy(), und_data_api_raw.copy()
 
-    def _create_strike_level_df(self, df_chain: pd.DataFrame, und_data: Dict) -> pd.DataFrame:
-        """Creates the primary strike-level DataFrame from per-contract data."""
+    def _metric_tasks(self, options_df_raw: pd.DataFrame, und_raw: Dict[str, Any], dte_max: int,
+                      context: MetricCalculationContextV2_5) -> Dict[str, Any]:
+        """
+        The task of every metric group for one symbol. Each task reads the results of the
+        groups it depends on and returns its own output: und_data updates (dict), new
+        strike columns (dict) or the strike table.
+        """
+        symbol = context.symbol
+
+        def und_inputs(results: Dict[str, Any], *groups: str) -> Dict[str, Any]:
+            merged = dict(und_raw)
+            for group in groups:
+                merged.update(results[group])
+            return merged
+
+        return {
+            'foundational': lambda results: self._run_und_group(self._calculate_foundational_metrics, und_raw),
+            'strike_table': lambda results: (
+                self._create_strike_level_df(options_df_raw, und_raw, context) if not options_df_raw.empty else None),
+            'adaptive': lambda results: self._run_strike_group(
+                self._calculate_adaptive_metrics, results['strike_table'], und_raw, context),
+            'heatmap': lambda results: self._run_strike_group(
+                self._calculate_enhanced_heatmap_data, results['strike_table'], und_raw, context),
+            'exposure_aggregates': lambda results: self._calculate_exposure_aggregates(results['strike_table']),
+            'adaptive_aggregates': lambda results: self._calculate_adaptive_aggregates(
+                self._with_strike_columns(results['strike_table'], results['adaptive'])),
+            'gib': lambda results: self._run_und_group(
+                self._calculate_gib_based_metrics, und_inputs(results, 'foundational', 'exposure_aggregates')),
+            'enhanced_flow': lambda results: self._run_und_group(
+                self._calculate_enhanced_flow_metrics, und_inputs(results, 'exposure_aggregates'), symbol,
+                options_df_raw),
+            'atr': lambda results: {'atr_und': self._calculate_atr(symbol, dte_max)},
+            'flow_history': lambda results: self._build_flow_history(
+                und_inputs(results, 'foundational', 'enhanced_flow'), results['strike_table']),
+        }
+
+    def calculate_worker_metric_groups(
+        self,
+        options_df_raw: pd.DataFrame,
+        und_data_api_raw: Dict[str, Any],
+        requested_metrics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Runs only the WORKER_METRIC_GROUPS of the requested metrics, e.g. in a metric
+        worker process, and returns {group: result} for calculate_all_metrics(precomputed_groups=...).
+
+        The adaptive and heatmap columns are returned already joined into the strike table
+        (their own entries are then empty), so the table is the only frame to send back.
+        """
+        targets = self._resolve_metric_targets(requested_metrics)
+        worker_targets = [group for group in self._metric_dag.required(targets) if group in self.WORKER_METRIC_GROUPS]
+        und_raw = dict(und_data_api_raw)
+        context = MetricCalculationContextV2_5(und_raw.get('symbol', 'UNKNOWN'))
+        # dte_max only feeds ATR, which is not a worker group
+        results = self._metric_dag.run(self._metric_tasks(options_df_raw, und_raw, 0, context), worker_targets)
+        strike_columns = {}
+        for group in ('adaptive', 'heatmap'):
+            if group in results:
+                strike_columns.update(results[group])
+                results[group] = {}
+        if results.get('strike_table') is not None:
+            results['strike_table'] = self._with_strike_columns(results['strike_table'], strike_columns)
+        return results
+
+    @staticmethod
+    def _run_und_group(calculate, und_inputs: Dict[str, Any], *args) -> Dict[str, Any]:
+        """Runs an und_data-updating metric group on a private copy and returns only the keys it set."""
+        updated = calculate(dict(und_inputs), *args)
+        return {key: value for key, value in updated.items() if key not in und_inputs or und_inputs[key] is not value}
+
+    @staticmethod
+    def _run_strike_group(calculate, df_strike: Optional[pd.DataFrame], und_inputs: Dict[str, Any],
+                          context: MetricCalculationContextV2_5) -> Dict[str, Any]:
+        """Runs a per-strike metric group on a shallow copy of the strike table and returns the columns it added."""
+        if df_strike is None or df_strike.empty:
+            return {}
+        updated = calculate(df_strike.copy(deep=False), dict(und_inputs), context)
+        return {column: updated[column] for column in updated.columns if column not in df_strike.columns}
+
+    @staticmethod
+    def _with_strike_columns(df_strike: Optional[pd.DataFrame], columns: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """The strike table with columns added, sharing the existing and the given arrays (no copy)."""
+        if df_strike is None or df_strike.empty or not columns:
+            return df_strike
+        data = {column: df_strike[column] for column in df_strike.columns}
+        data.update(columns)
+        return pd.DataFrame(data, index=df_strike.index, copy=False)
+
+    def _build_flow_history(self, und_data: Dict[str, Any], df_strike: Optional[pd.DataFrame]) -> Dict[str, Any]:
+        """Histories and per-strike series attached for the advanced flow mode gauges and charts."""
+        history: Dict[str, Any] = {}
+        now = datetime.now()
+        # 1. Z-score histories for gauges
+        for metric, z_key, hist_key, time_key in [
+            ("vapi_fa", "vapi_fa_z_score_und", "vapifa_zscore_history", "vapifa_time_history"),
+            ("dwfd", "dwfd_z_score_und", "dwfd_zscore_history", "dwfd_time_history"),
+            ("tw_laf", "tw_laf_z_score_und", "twlaf_zscore_history", "twlaf_time_history")
+        ]:
+            symbol = und_data.get("symbol", "UNKNOWN")
+            # Intraday history with the time each value was recorded
+            t_hist, z_hist = self.intraday_store.history(symbol, metric)
+            history[hist_key] = z_hist
+            history[time_key] = t_hist
+        # 2. Rolling flows: the windowed net value flows (net_cust_delta_flow_und while the 5m window warms up)
+        try:
+            rolling_val = float(und_data.get("net_cust_delta_flow_und", 0.0) or 0.0)
+        except Exception:
+            rolling_val = 0.0
+        history["rolling_flows"] = {"5min": [rolling_val]}
+        for minutes in FLOW_WINDOW_MINUTES:
+            windowed = und_data.get(f"net_value_flow_{minutes}m_und")
+            if windowed is not None:
+                history["rolling_flows"][f"{minutes}min"] = [float(windowed)]
+        history["rolling_flows_time"] = [now]
+        # 3. NVP by strike (from df_strike if available)
+        if df_strike is not None and not df_strike.empty:
+            history["nvp_by_strike"] = [float(x) for x in df_strike["nvp_at_strike"].tolist()] if "nvp_at_strike" in df_strike.columns else []
+            history["nvp_vol_by_strike"] = [float(x) for x in df_strike["nvp_vol_at_strike"].tolist()] if "nvp_vol_at_strike" in df_strike.columns else []
+            history["strikes"] = [float(x) for x in df_strike["strike"].tolist()] if "strike" in df_strike.columns else []
+        else:
+            history["nvp_by_strike"] = []
+            history["nvp_vol_by_strike"] = []
+            history["strikes"] = []
+        # 4. Greek flows (simulate with net_cust_delta/gamma/vega/theta_flow_und)
+        def safe_float(val):
+            try:
+                return float(val)
+            except Exception:
+                return 0.0
+        history["greek_flows"] = {
+            "Delta": [safe_float(und_data.get("net_cust_delta_flow_und", 0.0))],
+            "Gamma": [safe_float(und_data.get("net_cust_gamma_flow_und", 0.0))],
+            "Vega": [safe_float(und_data.get("net_cust_vega_flow_und", 0.0))],
+            "Theta": [safe_float(und_data.get("net_cust_theta_flow_und", 0.0))]
+        }
+        history["greek_flows_time"] = [now]
+        # 5. Flow ratios (simulate with vflowratio if present)
+        history["flow_ratios"] = {"VFlowRatio": [safe_float(und_data.get("vflowratio", 0.0))]}
+        history["flow_ratios_time"] = [now]
+        return history
+
+    def _create_strike_level_df(self, df_chain: pd.DataFrame, und_data: Dict,
+                                context: Optional[MetricCalculationContextV2_5] = None) -> pd.DataFrame:
+        """
+        Creates the primary strike-level DataFrame from per-contract data.
+
+        Strikes are factorized once into a StrikeIndexV2_5 and every per-strike total
+        is a bincount over it. The index (with its aligned arrays) is kept in the
+        calculation context for the adaptive and heatmap metrics of this call.
+        """
+        context = context or MetricCalculationContextV2_5(und_data.get('symbol', 'UNKNOWN'))
+        context.strike_index = None
+        context.exposure_cube = None
         if df_chain.empty:
             return pd.DataFrame()
 
@@ -339,36 +571,41 @@ class MetricsCalculatorV2_5:
         self.logger.debug(f"Input DataFrame shape: {df_chain.shape}")
 
         # Aggregate OI-based exposures from the chain
-        strike_groups = df_chain.groupby('strike')
-        df_strike = strike_groups.agg(
-            total_dxoi_at_strike=('dxoi', 'sum'),
-            total_gxoi_at_strike=('gxoi', 'sum'),
-            total_vxoi_at_strike=('vxoi', 'sum'),
-            total_txoi_at_strike=('txoi', 'sum'),
-            total_charmxoi_at_strike=('charmxoi', 'sum'),
-            total_vannaxoi_at_strike=('vannaxoi', 'sum'),
-            total_vommaxoi_at_strike=('vommaxoi', 'sum'),
-            nvp_at_strike=('value_bs', 'sum'),
-            nvp_vol_at_strike=('volm_bs', 'sum'),
-        ).fillna(0)
-        
-        # CRITICAL FIX: Reset index to make 'strike' a column instead of index
-        df_strike = df_strike.reset_index()
+        strike_index = StrikeIndexV2_5.from_chain(df_chain['strike'])
+        if len(strike_index) == 0:
+            return pd.DataFrame()
+        missing = [source for source in STRIKE_SUM_COLUMNS.values() if source not in df_chain.columns]
+        if missing:
+            self.logger.debug(f"Chain columns missing for strike aggregation (summed as 0): {missing}")
+        strike_index.aggregate(df_chain)
         
         # Add net customer flows from the underlying data (get_und) to the strike level
         # This is a simplification; a real implementation would need per-strike flows.
         # Assign the underlying total to the ATM strike.
         if und_data.get('price') is not None:
-            atm_strike_idx = (df_strike['strike'] - und_data['price']).abs().idxmin()
-            df_strike.loc[atm_strike_idx, 'net_cust_delta_flow_at_strike'] = und_data.get('deltas_buy', 0) - und_data.get('deltas_sell', 0)
+            atm_strike_idx = strike_index.nearest(float(und_data['price']))
+            delta_flow = np.zeros(len(strike_index))
+            delta_flow[atm_strike_idx] = und_data.get('deltas_buy', 0) - und_data.get('deltas_sell', 0)
+            strike_index.set('net_cust_delta_flow_at_strike', delta_flow)
             # Fix: Handle None values from ConvexValue gamma flow fields
             gammas_call_buy = und_data.get('gammas_call_buy') or 0
             gammas_put_buy = und_data.get('gammas_put_buy') or 0
             gammas_call_sell = und_data.get('gammas_call_sell') or 0
             gammas_put_sell = und_data.get('gammas_put_sell') or 0
-            df_strike.loc[atm_strike_idx, 'net_cust_gamma_flow_at_strike'] = (gammas_call_buy + gammas_put_buy) - (gammas_call_sell + gammas_put_sell)
+            gamma_flow = np.zeros(len(strike_index))
+            gamma_flow[atm_strike_idx] = (gammas_call_buy + gammas_put_buy) - (gammas_call_sell + gammas_put_sell)
+            strike_index.set('net_cust_gamma_flow_at_strike', gamma_flow)
 
-        return df_strike.fillna(0)
+        # Keep the term structure the strike table sums away
+        try:
+            context.exposure_cube = ExposureCubeV2_5.from_chain(df_chain, strike_index)
+            cube = context.exposure_cube
+            self.logger.debug(f"Exposure cube built: {cube.shape} (expirations x strikes x measures)")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not build exposure cube, term-structure metrics fall back to defaults: {e}")
+        # Published last: from here on the index is only read (by concurrently running groups)
+        context.strike_index = strike_index
+        return strike_index.to_frame()
 
     def _calculate_foundational_metrics(self, und_data: Dict) -> Dict:
         """Calculates key underlying metrics from the get_und data (excluding GIB which needs aggregates)."""
@@ -509,9 +746,16 @@ class MetricsCalculatorV2_5:
             self.logger.error(f"Error calculating HP_EOD: {e}")
             return 0.0
 
-    def _calculate_enhanced_flow_metrics(self, und_data: Dict, symbol: str) -> Dict:
-        """Calculates Tier 3 Enhanced Flow Metrics: VAPI-FA, DWFD, TW-LAF."""
+    def _calculate_enhanced_flow_metrics(self, und_data: Dict, symbol: str,
+                                         options_df: Optional[pd.DataFrame] = None, gauge: bool = True) -> Dict:
+        """
+        Calculates Tier 3 Enhanced Flow Metrics: VAPI-FA, DWFD, TW-LAF. With gauge=False the
+        z-score keys are left None for the caller to gauge across symbols (_gauge_flow_metrics).
+        """
         try:
+            # Windowed net flows (net_value_flow_5m_und ... net_vol_flow_60m_und) read by all three
+            und_data.update(self._update_flow_windows(und_data, symbol, options_df))
+
             # Calculate VAPI-FA (Volume-Adjusted Premium Intensity with Flow Acceleration)
             und_data = self._calculate_vapi_fa(und_data, symbol)
             
@@ -520,6 +764,9 @@ class MetricsCalculatorV2_5:
             
             # Calculate TW-LAF (Time-Weighted Liquidity-Adjusted Flow)
             und_data = self._calculate_tw_laf(und_data, symbol)
+
+            if gauge:
+                self._gauge_flow_metrics({symbol: und_data})
             
             self.logger.debug(f"Enhanced flow metrics calculated for {symbol}")
             return und_data
@@ -531,36 +778,113 @@ class MetricsCalculatorV2_5:
             und_data['dwfd_z_score_und'] = 0.0
             und_data['tw_laf_z_score_und'] = 0.0
             return und_data
-        
-    def _calculate_adaptive_metrics(self, df_strike: pd.DataFrame, und_data: Dict) -> pd.DataFrame:
-        """Calculates Tier 2 Adaptive Metrics: A-DAG, E-SDAG, D-TDPI, VRI 2.0."""
+
+    def _gauge_flow_metrics(self, und_by_symbol: Mapping[str, Dict]) -> None:
+        """
+        Sets the percentile gauges (*_z_score_und) of VAPI-FA, DWFD and TW-LAF still left None
+        in each symbol's und_data, with one bulk lookup per metric across all the symbols.
+        """
+        for metric, raw_key, z_key in self.FLOW_GAUGE_METRICS:
+            current_values = {symbol: float(und_data[raw_key]) for symbol, und_data in und_by_symbol.items()
+                              if und_data.get(z_key, 0.0) is None}
+            for symbol, gauge in self.intraday_store.gauges(metric, current_values).items():
+                und_by_symbol[symbol][z_key] = gauge
+
+    @staticmethod
+    def _windowed_flow(und_data: Dict, kind: str, minutes: int) -> float:
+        """
+        Net 'value' or 'vol' flow over a window from the flow accumulator, falling back
+        to the aggregated session total while the window is not covered yet.
+        """
+        flow = und_data.get(f'net_{kind}_flow_{minutes}m_und')
+        if flow is None:
+            if kind == 'value':
+                flow = und_data.get('total_nvp', und_data.get('value_bs', 0.0))
+            else:
+                flow = und_data.get('total_nvp_vol', und_data.get('volm_bs', 0.0))
+        return float(flow or 0.0)
+
+    @staticmethod
+    def _chain_rolling_flows(options_df: Optional[pd.DataFrame]) -> Dict[int, Tuple[float, float]]:
+        """The chain's own rolling (net value, net volume) flow sums by window minutes, where it has them."""
+        rolling = {}
+        if options_df is None or options_df.empty:
+            return rolling
+        for minutes in FLOW_WINDOW_MINUTES:
+            value_column, volume_column = f'valuebs_{minutes}m', f'volmbs_{minutes}m'
+            if value_column not in options_df.columns or volume_column not in options_df.columns:
+                continue
+            values = pd.to_numeric(options_df[value_column], errors='coerce')
+            volumes = pd.to_numeric(options_df[volume_column], errors='coerce')
+            if values.notna().any() and volumes.notna().any():
+                rolling[minutes] = (float(values.sum()), float(volumes.sum()))
+        return rolling
+
+    @staticmethod
+    def _session_flow_total(und_data: Dict, key: str, fallback_key: str) -> Optional[float]:
+        """The underlying's cumulative flow total under `key`, else the chain sum under `fallback_key`."""
+        for candidate in (key, fallback_key):
+            total = und_data.get(candidate)
+            try:
+                if total is not None and np.isfinite(float(total)):
+                    return float(total)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+    def _update_flow_windows(self, und_data: Dict, symbol: str,
+                             options_df: Optional[pd.DataFrame] = None) -> Dict[str, float]:
+        """
+        Feeds this cycle's cumulative net flow totals (and the chain's rolling flow columns)
+        to the symbol's FlowWindowAccumulatorV2_5 and returns the und keys of the windows
+        it can tell: net_value_flow_{5,15,30,60}m_und and net_vol_flow_{5,15,30,60}m_und.
+        Windows still warming up are left out, and the flow metrics fall back to the totals.
+
+        The deltas come from the underlying's session totals (value_bs / volm_bs): the
+        chain sums total_nvp / total_nvp_vol only cover the DTE- and strike-filtered
+        contracts, so contracts moving in or out of that range would show up as flow.
+        The chain sums are only used when the underlying has no totals.
+        """
+        value_total = self._session_flow_total(und_data, 'value_bs', 'total_nvp')
+        volume_total = self._session_flow_total(und_data, 'volm_bs', 'total_nvp_vol')
+        timestamp = und_data.get('timestamp')
+        timestamp = timestamp.timestamp() if isinstance(timestamp, datetime) else datetime.now().timestamp()
+        rolling = self._chain_rolling_flows(options_df)
+        with self._metric_caches.locked(symbol):
+            cache = self._get_isolated_cache('enhanced_flow', symbol)
+            accumulator = cache.get('flow_windows')
+            if accumulator is None:
+                accumulator = cache['flow_windows'] = FlowWindowAccumulatorV2_5(FLOW_WINDOW_MINUTES)
+            accumulator.observe(
+                timestamp,
+                value_total if value_total is not None else np.nan,
+                volume_total if volume_total is not None else np.nan,
+                rolling
+            )
+            windows = accumulator.windows_available()
+        flows = {}
+        for minutes, (value_flow, volume_flow) in windows.items():
+            flows[f'net_value_flow_{minutes}m_und'] = value_flow
+            flows[f'net_vol_flow_{minutes}m_und'] = volume_flow
+        return flows
+
+    def _calculate_adaptive_metrics(self, df_strike: pd.DataFrame, und_data: Dict,
+                                    context: Optional[MetricCalculationContextV2_5] = None) -> pd.DataFrame:
+        """Calculates Tier 2 Adaptive Metrics: A-DAG, E-SDAG, D-TDPI, VRI 2.0 (and the 0DTE suite)."""
         if df_strike.empty:
             return df_strike
             
         try:
-            # Get market context for adaptive calculations
-            market_regime = und_data.get('current_market_regime', 'REGIME_NEUTRAL')
-            volatility_context = self._get_volatility_context(und_data)
-            dte_context = self._get_average_dte_context(df_strike)
-            symbol = self._calculation_state.get('current_symbol', 'UNKNOWN')
-            
-            # Calculate A-DAG (Adaptive Delta-Adjusted Gamma Exposure)
-            df_strike = self._calculate_a_dag(df_strike, und_data, market_regime, volatility_context, dte_context)
-            
-            # Calculate E-SDAG methodologies (Enhanced Skew and Delta Adjusted Gamma Exposure)
-            df_strike = self._calculate_e_sdag(df_strike, und_data, market_regime, volatility_context, dte_context)
+            # A one-symbol ragged table over the call's strike arrays; calculate_metrics_batch
+            # runs the same kernels over every watched symbol at once
+            context = context or MetricCalculationContextV2_5(und_data.get('symbol', 'UNKNOWN'))
+            table = RaggedStrikeTableV2_5.single(context.symbol, context.strike_arrays(df_strike))
+            columns = self._adaptive_columns(table, [und_data], [context.aligned_exposure_cube(df_strike)],
+                                             [self._get_average_dte_context(df_strike)])
+            for column, values in columns.items():
+                df_strike[column] = values
             
-            # Calculate D-TDPI (Dynamic Time Decay Pressure Indicator)
-            df_strike = self._calculate_d_tdpi(df_strike, und_data, market_regime, volatility_context, dte_context)
-            
-            # Calculate VRI 2.0 (Volatility Regime Indicator Version 2.0)
-            df_strike = self._calculate_vri_2_0(df_strike, und_data, market_regime, volatility_context, dte_context)
-            
-            # Calculate 0DTE Suite metrics if applicable
-            df_strike = self._calculate_0dte_suite(df_strike, und_data, dte_context)
-            
-            # Calculate Enhanced Heatmap Data (SGDHP, IVSDH, UGCH)
-            df_strike = self._calculate_enhanced_heatmap_data(df_strike, und_data)
+            # Enhanced Heatmap Data (SGDHP, IVSDH, UGCH) is its own group in the metric graph
             
             self.logger.debug(f"Adaptive metrics calculated for {len(df_strike)} strikes")
             return df_strike
@@ -579,11 +903,12 @@ class MetricsCalculatorV2_5:
             # Get isolated configuration parameters
             z_score_window = self._get_metric_config('enhanced_flow', 'z_score_window', 20)
             
-            # Extract required inputs - prioritize aggregated totals over individual ones
-            net_value_flow_5m = und_data.get('total_nvp', und_data.get('value_bs', 0.0)) or 0.0
-            net_vol_flow_5m = und_data.get('total_nvp_vol', und_data.get('volm_bs', 0.0)) or 0.0
-            # For 15m flow, use a proxy (in real implementation, would need actual 15m data)
-            net_vol_flow_15m = net_vol_flow_5m * 2.8  # Approximate 15m as 2.8x 5m flow
+            # Extract required inputs - the windowed flows, else the aggregated totals while the windows warm up
+            net_value_flow_5m = self._windowed_flow(und_data, 'value', 5)
+            net_vol_flow_5m = self._windowed_flow(und_data, 'vol', 5)
+            net_vol_flow_15m = und_data.get('net_vol_flow_15m_und')
+            if net_vol_flow_15m is None:
+                net_vol_flow_15m = net_vol_flow_5m * 2.8  # Approximate 15m as 2.8x 5m flow until it is covered
             current_iv = und_data.get('u_volatility', und_data.get('implied_volatility', 0.20)) or 0.20
             
             self.logger.debug(f"VAPI-FA inputs: net_value_flow_5m={net_value_flow_5m}, net_vol_flow_5m={net_vol_flow_5m}, net_vol_flow_15m={net_vol_flow_15m}, current_iv={current_iv}")
@@ -618,14 +943,13 @@ class MetricsCalculatorV2_5:
             
             # Step 5: Percentile-based normalization using intraday cache
             vapi_fa_cache = self._add_to_intraday_cache(symbol, 'vapi_fa', float(vapi_fa_raw), max_size=200)
-            vapi_fa_z_score = self._calculate_percentile_gauge_value(vapi_fa_cache, float(vapi_fa_raw))
             
             und_data['vapi_fa_raw_und'] = vapi_fa_raw
-            und_data['vapi_fa_z_score_und'] = vapi_fa_z_score
+            und_data['vapi_fa_z_score_und'] = None  # gauged by _gauge_flow_metrics
             und_data['vapi_fa_pvr_5m_und'] = pvr_5m
             und_data['vapi_fa_flow_accel_5m_und'] = flow_acceleration_5m
             
-            self.logger.debug(f"VAPI-FA results for {symbol}: raw={vapi_fa_raw:.2f}, z_score={vapi_fa_z_score:.2f}, intraday_cache_size={len(vapi_fa_cache)}")
+            self.logger.debug(f"VAPI-FA results for {symbol}: raw={vapi_fa_raw:.2f}, intraday_cache_size={len(vapi_fa_cache)}")
             
             return und_data
             
@@ -643,9 +967,11 @@ class MetricsCalculatorV2_5:
             # Get isolated configuration parameters
             z_score_window = self._get_metric_config('enhanced_flow', 'z_score_window', 20)
             
-            # Extract required inputs - prioritize aggregated totals over individual ones
-            net_value_flow = und_data.get('total_nvp', und_data.get('value_bs', 0.0)) or 0.0
-            net_vol_flow = und_data.get('total_nvp_vol', und_data.get('volm_bs', 0.0)) or 0.0
+            # Extract required inputs - the 5m windowed flows, else the aggregated totals while the window warms up
+            net_value_flow = self._windowed_flow(und_data, 'value', 5)
+            net_vol_flow = self._windowed_flow(und_data, 'vol', 5)
+            # Windowed flows and session totals have different scales, so each has its own history
+            history_suffix = '_5m' if und_data.get('net_vol_flow_5m_und') is not None else ''
             
             self.logger.debug(f"DWFD inputs for {symbol}: net_value_flow={net_value_flow}, net_vol_flow={net_vol_flow}")
             
@@ -657,23 +983,14 @@ class MetricsCalculatorV2_5:
             directional_delta_flow = net_vol_flow
             
             # Step 2: Calculate Flow Value vs. Volume Divergence using intraday cache
-            value_cache = self._add_to_intraday_cache(symbol, 'net_value_flow', net_value_flow, max_size=200)
-            vol_cache = self._add_to_intraday_cache(symbol, 'net_vol_flow', net_vol_flow, max_size=200)
-            
-            # Calculate Z-scores using intraday data
-            if len(value_cache) >= 10:
-                value_mean = np.mean(value_cache)
-                value_std = np.std(value_cache)
-                value_z = (net_value_flow - value_mean) / max(float(value_std), 0.001)
-            else:
-                value_z = 0.0
+            self._add_to_intraday_cache(symbol, f'net_value_flow{history_suffix}', net_value_flow, max_size=200)
+            self._add_to_intraday_cache(symbol, f'net_vol_flow{history_suffix}', net_vol_flow, max_size=200)
             
-            if len(vol_cache) >= 10:
-                vol_mean = np.mean(vol_cache)
-                vol_std = np.std(vol_cache)
-                vol_z = (net_vol_flow - vol_mean) / max(float(vol_std), 0.001)
-            else:
-                vol_z = 0.0
+            # Calculate Z-scores using the rolling intraday mean/std (maintained incrementally)
+            value_z = self.intraday_store.zscore(symbol, f'net_value_flow{history_suffix}', net_value_flow,
+                                                 min_count=10, min_std=0.001)
+            vol_z = self.intraday_store.zscore(symbol, f'net_vol_flow{history_suffix}', net_vol_flow,
+                                               min_count=10, min_std=0.001)
             
             # Flow Value vs. Volume Divergence
             fvd = value_z - vol_z
@@ -687,13 +1004,12 @@ class MetricsCalculatorV2_5:
             
             # Step 4: Percentile-based normalization using intraday cache
             dwfd_cache = self._add_to_intraday_cache(symbol, 'dwfd', float(dwfd_raw), max_size=200)
-            dwfd_z_score = self._calculate_percentile_gauge_value(dwfd_cache, float(dwfd_raw))
             
             und_data['dwfd_raw_und'] = dwfd_raw
-            und_data['dwfd_z_score_und'] = dwfd_z_score
+            und_data['dwfd_z_score_und'] = None  # gauged by _gauge_flow_metrics
             und_data['dwfd_fvd_und'] = fvd
             
-            self.logger.debug(f"DWFD results for {symbol}: raw={dwfd_raw:.2f}, z_score={dwfd_z_score:.2f}, fvd={fvd:.2f}, intraday_cache_size={len(dwfd_cache)}")
+            self.logger.debug(f"DWFD results for {symbol}: raw={dwfd_raw:.2f}, fvd={fvd:.2f}, intraday_cache_size={len(dwfd_cache)}")
             
             return und_data
             
@@ -710,11 +1026,14 @@ class MetricsCalculatorV2_5:
             # Get isolated configuration parameters
             z_score_window = self._get_metric_config('enhanced_flow', 'z_score_window', 20)
             
-            # Extract required inputs for multiple intervals
-            net_vol_flow_5m = und_data.get('total_nvp_vol', und_data.get('volm_bs', 0.0)) or 0.0
-            # For 15m and 30m flows, use proxies (in real implementation, would need actual interval data)
-            net_vol_flow_15m = net_vol_flow_5m * 2.5  # Approximate 15m flow
-            net_vol_flow_30m = net_vol_flow_5m * 4.0  # Approximate 30m flow
+            # Extract required inputs for multiple intervals - the windowed flows where covered, else proxies
+            net_vol_flow_5m = self._windowed_flow(und_data, 'vol', 5)
+            net_vol_flow_15m = und_data.get('net_vol_flow_15m_und')
+            if net_vol_flow_15m is None:
+                net_vol_flow_15m = net_vol_flow_5m * 2.5  # Approximate 15m flow
+            net_vol_flow_30m = und_data.get('net_vol_flow_30m_und')
+            if net_vol_flow_30m is None:
+                net_vol_flow_30m = net_vol_flow_5m * 4.0  # Approximate 30m flow
             
             underlying_price = und_data.get('price', 100.0) or 100.0
             
@@ -757,14 +1076,13 @@ class MetricsCalculatorV2_5:
             
             # Step 4: Percentile-based normalization using intraday cache
             tw_laf_cache = self._add_to_intraday_cache(symbol, 'tw_laf', float(tw_laf_raw), max_size=200)
-            tw_laf_z_score = self._calculate_percentile_gauge_value(tw_laf_cache, float(tw_laf_raw))
             
             und_data['tw_laf_raw_und'] = tw_laf_raw
-            und_data['tw_laf_z_score_und'] = tw_laf_z_score
+            und_data['tw_laf_z_score_und'] = None  # gauged by _gauge_flow_metrics
             und_data['tw_laf_liquidity_factor_5m_und'] = liquidity_factor_5m
             und_data['tw_laf_time_weighted_sum_und'] = tw_laf_raw
             
-            self.logger.debug(f"TW-LAF results for {symbol}: raw={tw_laf_raw:.2f}, z_score={tw_laf_z_score:.2f}, intraday_cache_size={len(tw_laf_cache)}")
+            self.logger.debug(f"TW-LAF results for {symbol}: raw={tw_laf_raw:.2f}, intraday_cache_size={len(tw_laf_cache)}")
             
             return und_data
             
@@ -791,287 +1109,204 @@ class MetricsCalculatorV2_5:
         # This is a placeholder - in real implementation would calculate from options data
         return 'NORMAL_DTE'
     
-    def _calculate_a_dag(self, df_strike: pd.DataFrame, und_data: Dict, market_regime: str, volatility_context: str, dte_context: str) -> pd.DataFrame:
+    def _segment_contexts(self, unds: Sequence[Dict]) -> Tuple[np.ndarray, List[str], List[str]]:
+        """Per-symbol (price, market regime, volatility context) for the adaptive kernels."""
+        prices = np.array([float(und.get('price') or np.nan) for und in unds])
+        market_regimes = [und.get('current_market_regime', 'REGIME_NEUTRAL') for und in unds]
+        volatility_contexts = [self._get_volatility_context(und) for und in unds]
+        return prices, market_regimes, volatility_contexts
+
+    def _adaptive_columns(self, table: RaggedStrikeTableV2_5, unds: Sequence[Dict],
+                          cubes: Sequence[Optional[ExposureCubeV2_5]], dte_contexts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Tier 2 adaptive metric columns (A-DAG, E-SDAG, D-TDPI, VRI 2.0, 0DTE suite) for
+        every symbol of the table in one pass. unds, cubes and dte_contexts are aligned
+        with its segments. A metric that fails is reported as zeros for every symbol.
+        """
+        prices, market_regimes, volatility_contexts = self._segment_contexts(unds)
+        columns: Dict[str, np.ndarray] = {}
+        for name, calculate, outputs in (
+            ('A-DAG', lambda: self._a_dag_columns(table, prices, market_regimes, volatility_contexts, dte_contexts),
+             ('a_dag_exposure', 'a_dag_adaptive_alpha', 'a_dag_flow_alignment', 'a_dag_directional_multiplier', 'a_dag_strike')),
+            ('E-SDAG', lambda: self._e_sdag_columns(table),
+             ('e_sdag_mult_strike', 'e_sdag_dir_strike', 'e_sdag_w_strike', 'e_sdag_vf_strike')),
+            ('D-TDPI', lambda: self._d_tdpi_columns(table), ('d_tdpi_strike',)),
+            ('VRI 2.0', lambda: self._vri_2_0_columns(table, cubes), ('vri_2_0_strike',)),
+            ('0DTE Suite', lambda: self._0dte_columns(table, cubes),
+             ('0dte_gamma_exposure', '0dte_delta_exposure', '0dte_vanna_exposure', '0dte_charm_exposure',
+              'vci_0dte', 'gci_0dte', 'dci_0dte')),
+        ):
+            try:
+                columns.update(calculate())
+            except Exception as e:
+                self.logger.error(f"Error calculating {name}: {e}", exc_info=True)
+                columns.update({output: np.zeros(len(table)) for output in outputs})
+        return columns
+
+    def _a_dag_columns(self, table: RaggedStrikeTableV2_5, prices: np.ndarray, market_regimes: Sequence[str],
+                       volatility_contexts: Sequence[str], dte_contexts: Sequence[str]) -> Dict[str, np.ndarray]:
         """Calculate A-DAG (Adaptive Delta-Adjusted Gamma Exposure)."""
-        try:
-            # Get A-DAG configuration parameters using isolated config
-            base_alpha_coeffs = self._get_metric_config('adaptive', 'base_dag_alpha_coeffs', {
-                'aligned': 1.0, 'opposed': -0.5, 'neutral': 0.0
-            })
-            
-            # Get regime and volatility multipliers using isolated config
-            regime_multipliers = self._get_metric_config('adaptive', 'regime_alpha_multipliers', {})
-            volatility_multipliers = self._get_metric_config('adaptive', 'volatility_alpha_multipliers', {})
-            
-            # Step 1: Calculate Adaptive Alignment Coefficient (adaptive_dag_alpha)
-            regime_mult = regime_multipliers.get(market_regime, 1.0)
-            vol_mult = volatility_multipliers.get(volatility_context, 1.0)
-            
-            # Step 2: Calculate Flow Alignment for each strike
-            gxoi_at_strike = df_strike.get('total_gxoi_at_strike', 0)
-            dxoi_at_strike = df_strike.get('total_dxoi_at_strike', 0)
-            net_cust_delta_flow = df_strike.get('net_cust_delta_flow_at_strike', 0)
-            net_cust_gamma_flow = df_strike.get('net_cust_gamma_flow_at_strike_proxy', 0)
-            
-            # Determine flow alignment (aligned, opposed, neutral)
-            delta_alignment = np.sign(dxoi_at_strike) * np.sign(net_cust_delta_flow)
-            gamma_alignment = np.sign(gxoi_at_strike) * np.sign(net_cust_gamma_flow)
-            
-            # Combined alignment score
-            combined_alignment = (delta_alignment + gamma_alignment) / 2.0
-            
-            # Map alignment to coefficient type
-            alignment_type = np.where(
-                combined_alignment > 0.3, 'aligned',
-                np.where(combined_alignment < -0.3, 'opposed', 'neutral')
-            )
-            
-            # Step 3: Apply adaptive coefficients
-            adaptive_alpha = np.where(
-                alignment_type == 'aligned', 
-                base_alpha_coeffs['aligned'] * regime_mult * vol_mult,
-                np.where(
-                    alignment_type == 'opposed',
-                    base_alpha_coeffs['opposed'] * regime_mult * vol_mult,
-                    base_alpha_coeffs['neutral'] * regime_mult * vol_mult
-                )
-            )
-             
-            # Step 4: DTE Scaling for Gamma/Flow Impact
-            dte_scaling = self._get_dte_scaling_factor(dte_context)
-            
-            # Step 5: Calculate A-DAG using the core formula with DIRECTIONAL COMPONENT
-            # A-DAG = GXOI * directional_multiplier * (1 + adaptive_alpha * flow_alignment) * dte_scaling
-            flow_alignment_ratio = np.where(
-                np.abs(gxoi_at_strike) > 0,
-                (net_cust_delta_flow + net_cust_gamma_flow) / (np.abs(gxoi_at_strike) + 1e-6),
-                0.0
-            )
-            
-            # FIX: Add directional component based on strike vs current price
-            current_price = und_data.get('price', 0.0)
-            strikes = df_strike['strike'] if 'strike' in df_strike.columns else pd.Series([current_price] * len(df_strike))
-            
-            # Apply directional signs: above price = resistance (negative), below = support (positive)
-            directional_multiplier = np.where(strikes > current_price, -1, 1)
-            
-            # Calculate A-DAG with proper directional component
-            a_dag_exposure = gxoi_at_strike * directional_multiplier * (1 + adaptive_alpha * flow_alignment_ratio) * dte_scaling
-            
-            # Step 6: Optional Volume-Weighted GXOI refinement
-            use_volume_weighted = self._get_metric_config('adaptive', 'use_volume_weighted_gxoi', False)
-            if use_volume_weighted:
-                volume_weight = df_strike.get('total_volume_at_strike', 1.0)
-                volume_factor = np.log1p(volume_weight) / np.log1p(volume_weight.mean() + 1e-6)
-                a_dag_exposure *= volume_factor
-            
-            df_strike['a_dag_exposure'] = a_dag_exposure
-            df_strike['a_dag_adaptive_alpha'] = adaptive_alpha
-            df_strike['a_dag_flow_alignment'] = flow_alignment_ratio
-            df_strike['a_dag_directional_multiplier'] = directional_multiplier  # Store for debugging
+        # Get A-DAG configuration parameters using isolated config
+        base_alpha_coeffs = self._get_metric_config('adaptive', 'base_dag_alpha_coeffs', {
+            'aligned': 1.0, 'opposed': -0.5, 'neutral': 0.0
+        })
+        
+        # Get regime and volatility multipliers using isolated config
+        regime_multipliers = self._get_metric_config('adaptive', 'regime_alpha_multipliers', {})
+        volatility_multipliers = self._get_metric_config('adaptive', 'volatility_alpha_multipliers', {})
+        
+        # Step 1: Calculate Adaptive Alignment Coefficient (adaptive_dag_alpha), per symbol
+        regime_mult = table.broadcast([regime_multipliers.get(regime, 1.0) for regime in market_regimes])
+        vol_mult = table.broadcast([volatility_multipliers.get(context, 1.0) for context in volatility_contexts])
+        
+        # Step 2: Calculate Flow Alignment for each strike
+        gxoi_at_strike = table.get('total_gxoi_at_strike', 0)
+        dxoi_at_strike = table.get('total_dxoi_at_strike', 0)
+        net_cust_delta_flow = table.get('net_cust_delta_flow_at_strike', 0)
+        net_cust_gamma_flow = table.get('net_cust_gamma_flow_at_strike_proxy', 0)
+        
+        # Determine flow alignment (aligned, opposed, neutral)
+        delta_alignment = np.sign(dxoi_at_strike) * np.sign(net_cust_delta_flow)
+        gamma_alignment = np.sign(gxoi_at_strike) * np.sign(net_cust_gamma_flow)
+        
+        # Combined alignment score
+        combined_alignment = (delta_alignment + gamma_alignment) / 2.0
+        
+        # Step 3: Apply adaptive coefficients by alignment type
+        base_alpha = np.where(
+            combined_alignment > 0.3, base_alpha_coeffs['aligned'],
+            np.where(combined_alignment < -0.3, base_alpha_coeffs['opposed'], base_alpha_coeffs['neutral'])
+        )
+        adaptive_alpha = base_alpha * regime_mult * vol_mult
+         
+        # Step 4: DTE Scaling for Gamma/Flow Impact
+        dte_scaling = table.broadcast([self._get_dte_scaling_factor(context) for context in dte_contexts])
+        
+        # Step 5: Calculate A-DAG using the core formula with DIRECTIONAL COMPONENT
+        # A-DAG = GXOI * directional_multiplier * (1 + adaptive_alpha * flow_alignment) * dte_scaling
+        flow_alignment_ratio = np.where(
+            np.abs(gxoi_at_strike) > 0,
+            (net_cust_delta_flow + net_cust_gamma_flow) / (np.abs(gxoi_at_strike) + 1e-6),
+            0.0
+        )
+        
+        # Apply directional signs: above price = resistance (negative), below = support (positive)
+        directional_multiplier = np.where(table.strikes > table.broadcast(prices), -1, 1)
+        
+        # Calculate A-DAG with proper directional component
+        a_dag_exposure = gxoi_at_strike * directional_multiplier * (1 + adaptive_alpha * flow_alignment_ratio) * dte_scaling
+        
+        # Step 6: Optional Volume-Weighted GXOI refinement (relative to each symbol's mean volume)
+        use_volume_weighted = self._get_metric_config('adaptive', 'use_volume_weighted_gxoi', False)
+        volume_weight = table.get('total_volume_at_strike', None)
+        if use_volume_weighted and volume_weight is not None:
+            volume_factor = np.log1p(volume_weight) / np.log1p(table.broadcast(table.segment_mean(volume_weight)) + 1e-6)
+            a_dag_exposure = a_dag_exposure * volume_factor
+        
+        return {
+            'a_dag_exposure': a_dag_exposure,
+            'a_dag_adaptive_alpha': adaptive_alpha,
+            'a_dag_flow_alignment': flow_alignment_ratio,
+            'a_dag_directional_multiplier': directional_multiplier,  # Store for debugging
             # --- FIX: assign a_dag_strike for dashboard compatibility ---
-            df_strike['a_dag_strike'] = df_strike['a_dag_exposure']
-            return df_strike
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating A-DAG: {e}", exc_info=True)
-            df_strike['a_dag_exposure'] = 0.0
-            df_strike['a_dag_adaptive_alpha'] = 0.0
-            df_strike['a_dag_flow_alignment'] = 0.0
-            df_strike['a_dag_directional_multiplier'] = 0.0
-            df_strike['a_dag_strike'] = 0.0
-            return df_strike
+            'a_dag_strike': a_dag_exposure,
+        }
     
-    def _calculate_e_sdag(self, df_strike: pd.DataFrame, und_data: Dict, market_regime: str, volatility_context: str, dte_context: str) -> pd.DataFrame:
+    def _e_sdag_columns(self, table: RaggedStrikeTableV2_5) -> Dict[str, np.ndarray]:
         """Calculate E-SDAG (Enhanced Skew and Delta Adjusted Gamma Exposure)."""
-        try:
-            symbol = self._calculation_state.get('current_symbol', 'UNKNOWN')
-            
-            # Core inputs
-            dxoi_at_strike = df_strike.get('total_dxoi_at_strike', 0)
-            gxoi_at_strike = df_strike.get('total_gxoi_at_strike', 0)
-            
-            # Normalized DXOI (simplified Z-score)
-            dxoi_normalized = self._normalize_flow(dxoi_at_strike, 'dxoi', symbol)
-            
-            # Calculate different E-SDAG methodologies
-            e_sdag_mult = gxoi_at_strike * (1 + dxoi_normalized * 0.5)
-            e_sdag_dir = gxoi_at_strike * np.sign(dxoi_normalized)
-            e_sdag_w = gxoi_at_strike * np.abs(dxoi_normalized)
-            e_sdag_vf = gxoi_at_strike + dxoi_normalized * 0.3
-            
-            # Store results
-            df_strike['e_sdag_mult_strike'] = e_sdag_mult
-            df_strike['e_sdag_dir_strike'] = e_sdag_dir
-            df_strike['e_sdag_w_strike'] = e_sdag_w
-            df_strike['e_sdag_vf_strike'] = e_sdag_vf
-            
-            return df_strike
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating E-SDAG: {e}", exc_info=True)
-            df_strike['e_sdag_mult_strike'] = 0.0
-            df_strike['e_sdag_dir_strike'] = 0.0
-            df_strike['e_sdag_w_strike'] = 0.0
-            df_strike['e_sdag_vf_strike'] = 0.0
-            return df_strike
+        # Core inputs
+        dxoi_at_strike = table.get('total_dxoi_at_strike', 0)
+        gxoi_at_strike = table.get('total_gxoi_at_strike', 0)
+        
+        # Normalized DXOI (simplified Z-score)
+        dxoi_normalized = self._normalize_flow_segments(table, dxoi_at_strike, 'dxoi')
+        
+        # Calculate different E-SDAG methodologies
+        return {
+            'e_sdag_mult_strike': gxoi_at_strike * (1 + dxoi_normalized * 0.5),
+            'e_sdag_dir_strike': gxoi_at_strike * np.sign(dxoi_normalized),
+            'e_sdag_w_strike': gxoi_at_strike * np.abs(dxoi_normalized),
+            'e_sdag_vf_strike': gxoi_at_strike + dxoi_normalized * 0.3,
+        }
     
-    def _calculate_d_tdpi(self, df_strike: pd.DataFrame, und_data: Dict, market_regime: str, volatility_context: str, dte_context: str) -> pd.DataFrame:
+    def _d_tdpi_columns(self, table: RaggedStrikeTableV2_5) -> Dict[str, np.ndarray]:
         """Calculate D-TDPI (Dynamic Time Decay Pressure Indicator)."""
-        try:
-            symbol = self._calculation_state.get('current_symbol', 'UNKNOWN')
-            
-            # Core inputs
-            charm_oi = df_strike.get('total_charmxoi_at_strike', 0)
-            theta_oi = df_strike.get('total_txoi_at_strike', 0)
-            net_cust_theta_flow = df_strike.get('net_cust_theta_flow_at_strike', 0)
-            
-            # Normalized theta flow (simplified Z-score)
-            theta_flow_normalized = self._normalize_flow(net_cust_theta_flow, 'theta_flow', symbol)
-            
-            # Calculate D-TDPI
-            d_tdpi_value = charm_oi * np.sign(theta_oi) * (1 + theta_flow_normalized * 0.4)
-            
-            # Store results
-            df_strike['d_tdpi_strike'] = d_tdpi_value
-            
-            return df_strike
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating D-TDPI: {e}", exc_info=True)
-            df_strike['d_tdpi_strike'] = 0.0
-            return df_strike
+        # Core inputs
+        charm_oi = table.get('total_charmxoi_at_strike', 0)
+        theta_oi = table.get('total_txoi_at_strike', 0)
+        net_cust_theta_flow = table.get('net_cust_theta_flow_at_strike', np.zeros(len(table)))
+        
+        # Normalized theta flow (simplified Z-score)
+        theta_flow_normalized = self._normalize_flow_segments(table, net_cust_theta_flow, 'theta_flow')
+        
+        # Calculate D-TDPI
+        return {'d_tdpi_strike': charm_oi * np.sign(theta_oi) * (1 + theta_flow_normalized * 0.4)}
     
-    def _calculate_vri_2_0(self, df_strike: pd.DataFrame, und_data: Dict, market_regime: str, volatility_context: str, dte_context: str) -> pd.DataFrame:
-        """Calculate VRI 2.0 (Volatility Risk Indicator 2.0)."""
-        try:
-            symbol = self._calculation_state.get('current_symbol', 'UNKNOWN')
-            
-            # Core inputs
-            vxoi_at_strike = df_strike.get('total_vxoi_at_strike', 0)
-            vanna_at_strike = df_strike.get('total_vanna_at_strike', 0)
-            vomma_at_strike = df_strike.get('total_vomma_at_strike', 0)
-            
-            # Enhanced Skew Integration
-            current_iv = und_data.get('u_volatility', 0.20) or 0.20
-            skew_factor = 1.0  # Simplified
-            
-            # Term Structure Integration
-            if not df_strike.empty and 'dte_calc' in df_strike.columns:
-                dte_values = df_strike['dte_calc']
-                if len(dte_values) > 0:
-                    dte = float(dte_values.iloc[0])
-                else:
-                    dte = 30.0
-            else:
-                dte = 30.0
-            term_factor = np.exp(-dte / 365.0)
-            
-            # Calculate VRI 2.0
-            vri_2_0_base = vxoi_at_strike * (0.4 * vanna_at_strike + 0.3 * vomma_at_strike + 0.3)
-            vri_2_0_scaled = vri_2_0_base * skew_factor * term_factor
-            
-            # Normalize using Z-score
-            vri_2_0_normalized = self._normalize_flow(vri_2_0_scaled, 'vri_2_0', symbol)
-            
-            # Store results - handle both array and scalar cases
-            if isinstance(vri_2_0_normalized, (np.ndarray, pd.Series)):
-                vri_2_0_value = float(vri_2_0_normalized.mean())
-            elif isinstance(vri_2_0_normalized, (list, tuple)) and len(vri_2_0_normalized) > 0:
-                vri_2_0_value = float(vri_2_0_normalized[0])
-            elif isinstance(vri_2_0_normalized, float):
-                vri_2_0_value = vri_2_0_normalized
-            else:
-                vri_2_0_value = 0.0
-            
-            df_strike['vri_2_0_strike'] = vri_2_0_value
-            
-            return df_strike
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating VRI 2.0: {e}", exc_info=True)
-            df_strike['vri_2_0_strike'] = 0.0
-            return df_strike
+    def _vri_2_0_columns(self, table: RaggedStrikeTableV2_5, cubes: Sequence[Optional[ExposureCubeV2_5]]) -> Dict[str, np.ndarray]:
+        """Calculate VRI 2.0 (Volatility Risk Indicator 2.0), one value per symbol."""
+        # Core inputs
+        vxoi_at_strike = table.get('total_vxoi_at_strike', np.zeros(len(table)))
+        vanna_at_strike = table.get('total_vanna_at_strike', 0)
+        vomma_at_strike = table.get('total_vomma_at_strike', 0)
+        
+        # Enhanced Skew Integration
+        skew_factor = 1.0  # Simplified
+        
+        # Term Structure Integration: weight each expiration's vega exposure by exp(-DTE/365)
+        term_vxoi = vxoi_at_strike * np.exp(-30.0 / 365.0)
+        for symbol, cube in zip(table.symbols, cubes):
+            if cube is not None and cube.has('vxoi') and len(cube.expiry_dte) > 0:
+                table.segment(term_vxoi, symbol)[:] = cube.term_weighted('vxoi', np.exp(-cube.expiry_dte / 365.0))
+        
+        # Calculate VRI 2.0
+        vri_2_0_base = term_vxoi * (0.4 * vanna_at_strike + 0.3 * vomma_at_strike + 0.3)
+        vri_2_0_scaled = vri_2_0_base * skew_factor
+        
+        # Normalize using Z-score; each symbol's strikes carry its mean normalized value
+        vri_2_0_normalized = self._normalize_flow_segments(table, vri_2_0_scaled, 'vri_2_0')
+        return {'vri_2_0_strike': table.broadcast(table.segment_mean(vri_2_0_normalized))}
     
-    def _calculate_0dte_suite(self, df_strike: pd.DataFrame, und_data: Dict, dte_context: str) -> pd.DataFrame:
-        """Calculate 0DTE Suite metrics."""
-        try:
-            # Get 0DTE configuration parameters using isolated config
-            dte_threshold = self._get_metric_config('dte_suite', 'dte_threshold_for_0dte', 1.0)
-            
-            # Filter for 0DTE options
-            dte_values = df_strike.get('dte_calc', pd.Series([30] * len(df_strike)))
-            is_0dte = dte_values <= dte_threshold
-            
-            # Initialize all metrics to zero
-            df_strike['0dte_gamma_exposure'] = 0.0
-            df_strike['0dte_delta_exposure'] = 0.0
-            df_strike['0dte_vanna_exposure'] = 0.0
-            df_strike['0dte_charm_exposure'] = 0.0
-            df_strike['vci_0dte'] = 0.0  # Vanna Concentration Index
-            df_strike['gci_0dte'] = 0.0  # Gamma Concentration Index
-            df_strike['dci_0dte'] = 0.0  # Delta Concentration Index
-            
-            if is_0dte.any():
-                # Core 0DTE exposures
-                df_strike.loc[is_0dte, '0dte_gamma_exposure'] = df_strike.loc[is_0dte, 'total_gxoi_at_strike'].fillna(0)
-                df_strike.loc[is_0dte, '0dte_delta_exposure'] = df_strike.loc[is_0dte, 'total_dxoi_at_strike'].fillna(0)
-                df_strike.loc[is_0dte, '0dte_vanna_exposure'] = df_strike.loc[is_0dte, 'total_vanna_at_strike'].fillna(0)
-                df_strike.loc[is_0dte, '0dte_charm_exposure'] = df_strike.loc[is_0dte, 'total_charmxoi_at_strike'].fillna(0)
-                
-                # Calculate concentration indices for 0DTE options
-                if is_0dte.sum() > 1:  # Need multiple strikes for concentration
-                    # Vanna Concentration Index (VCI)
-                    vanna_0dte = df_strike.loc[is_0dte, 'total_vanna_at_strike'].fillna(0)
-                    total_vanna = vanna_0dte.abs().sum()
-                    if total_vanna > 0:
-                        vanna_weights = vanna_0dte.abs() / total_vanna
-                        vci = (vanna_weights ** 2).sum()  # Herfindahl-like concentration
-                        df_strike.loc[is_0dte, 'vci_0dte'] = vci
-                    
-                    # Gamma Concentration Index (GCI)
-                    gamma_0dte = df_strike.loc[is_0dte, 'total_gxoi_at_strike'].fillna(0)
-                    total_gamma = gamma_0dte.abs().sum()
-                    if total_gamma > 0:
-                        gamma_weights = gamma_0dte.abs() / total_gamma
-                        gci = (gamma_weights ** 2).sum()
-                        df_strike.loc[is_0dte, 'gci_0dte'] = gci
-                    
-                    # Delta Concentration Index (DCI)
-                    delta_0dte = df_strike.loc[is_0dte, 'total_dxoi_at_strike'].fillna(0)
-                    total_delta = delta_0dte.abs().sum()
-                    if total_delta > 0:
-                        delta_weights = delta_0dte.abs() / total_delta
-                        dci = (delta_weights ** 2).sum()
-                        df_strike.loc[is_0dte, 'dci_0dte'] = dci
-            
-            return df_strike
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating 0DTE Suite: {e}", exc_info=True)
-            df_strike['0dte_gamma_exposure'] = 0.0
-            df_strike['0dte_delta_exposure'] = 0.0
-            df_strike['0dte_vanna_exposure'] = 0.0
-            df_strike['0dte_charm_exposure'] = 0.0
-            df_strike['vci_0dte'] = 0.0
-            df_strike['gci_0dte'] = 0.0
-            df_strike['dci_0dte'] = 0.0
-            return df_strike
+    def _0dte_columns(self, table: RaggedStrikeTableV2_5, cubes: Sequence[Optional[ExposureCubeV2_5]]) -> Dict[str, np.ndarray]:
+        """Calculate 0DTE Suite metrics; strikes without a 0DTE contract (or symbols without a cube) stay at 0."""
+        # Get 0DTE configuration parameters using isolated config
+        dte_threshold = self._get_metric_config('dte_suite', 'dte_threshold_for_0dte', 1.0)
+        
+        measures = {'gamma': 'gxoi', 'delta': 'dxoi', 'vanna': 'vannaxoi', 'charm': 'charmxoi'}
+        exposures = {name: np.zeros(len(table)) for name in measures}
+        is_0dte = np.zeros(len(table), dtype=bool)
+        # 0DTE expirations are a slice of each symbol's expiration x strike cube
+        for symbol, cube in zip(table.symbols, cubes):
+            if cube is None:
+                continue
+            is_0dte_expiry = cube.expiry_mask(max_dte=dte_threshold)
+            table.segment(is_0dte, symbol)[:] = cube.strikes_with_contracts(is_0dte_expiry)
+            for name, measure in measures.items():
+                table.segment(exposures[name], symbol)[:] = cube.strike_totals(measure, is_0dte_expiry)
+        
+        # Core 0DTE exposures
+        columns = {f'0dte_{name}_exposure': np.where(is_0dte, values, 0.0) for name, values in exposures.items()}
+        
+        # Concentration indices (Herfindahl-like) over each symbol's 0DTE strikes; needs multiple strikes
+        concentrated = is_0dte & table.broadcast(table.segment_sum(is_0dte.astype(np.float64)) > 1).astype(bool)
+        for index_name, name in (('vci_0dte', 'vanna'), ('gci_0dte', 'gamma'), ('dci_0dte', 'delta')):
+            magnitude = np.abs(columns[f'0dte_{name}_exposure'])
+            total = table.broadcast(table.segment_sum(magnitude))
+            share = np.divide(magnitude, total, out=np.zeros(len(table)), where=total > 0)
+            columns[index_name] = np.where(concentrated, table.broadcast(table.segment_sum(share * share)), 0.0)
+        return columns
     
-    def _calculate_enhanced_heatmap_data(self, df_strike: pd.DataFrame, und_data: Dict) -> pd.DataFrame:
-        """Calculate Enhanced Heatmap Data (SGDHP, IVSDH, UGCH)."""
+    def _heatmap_columns(self, table: RaggedStrikeTableV2_5, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate Enhanced Heatmap Data (SGDHP, IVSDH, UGCH) for every symbol of the table in one pass."""
         try:
-            symbol = self._calculation_state.get('current_symbol', 'UNKNOWN')
+            # Core exposure and flow inputs as aligned per-strike arrays (zeros when absent)
+            zeros = np.zeros(len(table))
+            gamma_exposure = table.get('total_gxoi_at_strike', zeros)
+            delta_exposure = table.get('total_dxoi_at_strike', zeros)
+            vanna_exposure = table.get('total_vanna_at_strike', zeros)
             
-            # Core exposure inputs - properly access DataFrame columns
-            gamma_exposure = df_strike['total_gxoi_at_strike'].fillna(0) if 'total_gxoi_at_strike' in df_strike.columns else pd.Series([0] * len(df_strike))
-            delta_exposure = df_strike['total_dxoi_at_strike'].fillna(0) if 'total_dxoi_at_strike' in df_strike.columns else pd.Series([0] * len(df_strike))
-            vanna_exposure = df_strike['total_vanna_at_strike'].fillna(0) if 'total_vanna_at_strike' in df_strike.columns else pd.Series([0] * len(df_strike))
-            
-            # Flow inputs - properly access DataFrame columns
-            net_gamma_flow = df_strike['net_cust_gamma_flow_at_strike_proxy'].fillna(0) if 'net_cust_gamma_flow_at_strike_proxy' in df_strike.columns else pd.Series([0] * len(df_strike))
-            net_delta_flow = df_strike['net_cust_delta_flow_at_strike'].fillna(0) if 'net_cust_delta_flow_at_strike' in df_strike.columns else pd.Series([0] * len(df_strike))
-            net_vanna_flow = df_strike['net_cust_vanna_flow_at_strike_proxy'].fillna(0) if 'net_cust_vanna_flow_at_strike_proxy' in df_strike.columns else pd.Series([0] * len(df_strike))
+            net_gamma_flow = table.get('net_cust_gamma_flow_at_strike_proxy', zeros)
+            net_delta_flow = table.get('net_cust_delta_flow_at_strike', zeros)
+            net_vanna_flow = table.get('net_cust_vanna_flow_at_strike_proxy', zeros)
             
             # Weights
             gamma_weight = 0.4
@@ -1079,33 +1314,24 @@ class MetricsCalculatorV2_5:
             vanna_weight = 0.2
             flow_weight = 0.1
             
-            # Calculate normalized intensities - ensure they match DataFrame length
-            gamma_intensity = self._normalize_flow(gamma_exposure, 'gamma', symbol) * gamma_weight
-            delta_intensity = self._normalize_flow(delta_exposure, 'delta', symbol) * delta_weight
-            vanna_intensity = self._normalize_flow(vanna_exposure, 'vanna', symbol) * vanna_weight
-            
-            # Ensure arrays match DataFrame length
-            num_rows = len(df_strike)
-            if len(gamma_intensity) == 1 and num_rows > 1:
-                gamma_intensity = np.full(num_rows, gamma_intensity[0])
-            if len(delta_intensity) == 1 and num_rows > 1:
-                delta_intensity = np.full(num_rows, delta_intensity[0])
-            if len(vanna_intensity) == 1 and num_rows > 1:
-                vanna_intensity = np.full(num_rows, vanna_intensity[0])
-            
-            # Flow alignment factors - FIX: Convert Series to arrays for comparison
+            # Calculate normalized intensities
+            gamma_intensity = self._normalize_flow_segments(table, gamma_exposure, 'gamma') * gamma_weight
+            delta_intensity = self._normalize_flow_segments(table, delta_exposure, 'delta') * delta_weight
+            vanna_intensity = self._normalize_flow_segments(table, vanna_exposure, 'vanna') * vanna_weight
+            
+            # Flow alignment factors
             gamma_flow_factor = np.where(
-                np.sign(gamma_exposure.values) == np.sign(net_gamma_flow.values),
+                np.sign(gamma_exposure) == np.sign(net_gamma_flow),
                 1.2, 0.8
             )
             
             delta_flow_factor = np.where(
-                np.sign(delta_exposure.values) == np.sign(net_delta_flow.values),
+                np.sign(delta_exposure) == np.sign(net_delta_flow),
                 1.2, 0.8
             )
             
             vanna_flow_factor = np.where(
-                np.sign(vanna_exposure.values) == np.sign(net_vanna_flow.values),
+                np.sign(vanna_exposure) == np.sign(net_vanna_flow),
                 1.2, 0.8
             )
             
@@ -1114,73 +1340,59 @@ class MetricsCalculatorV2_5:
             delta_intensity_adj = delta_intensity * delta_flow_factor
             vanna_intensity_adj = vanna_intensity * vanna_flow_factor
             
-            # Flow component - FIX: Convert Series to arrays for addition
-            flow_intensity = self._normalize_flow(
-                net_gamma_flow.values + net_delta_flow.values + net_vanna_flow.values, 'combined_flow', symbol
+            # Flow component
+            flow_intensity = self._normalize_flow_segments(
+                table, net_gamma_flow + net_delta_flow + net_vanna_flow, 'combined_flow'
             ) * flow_weight
             
-            # Ensure flow_intensity matches DataFrame length
-            if len(flow_intensity) == 1 and num_rows > 1:
-                flow_intensity = np.full(num_rows, flow_intensity[0])
-            
             # Multi-dimensional heatmap calculation
             composite_intensity = (
                 gamma_intensity_adj + delta_intensity_adj + 
                 vanna_intensity_adj + flow_intensity
             )
             
-            # Store main heatmap intensity
-            df_strike['sgdhp_data'] = composite_intensity
-            df_strike['ivsdh_data'] = vanna_intensity_adj
-            df_strike['ugch_data'] = delta_intensity_adj
-            
-            # Calculate proper SGDHP and UGCH scores according to system guide
-            df_strike = self._calculate_sgdhp_scores(df_strike, und_data)
-            df_strike = self._calculate_ugch_scores(df_strike, und_data)
+            # Main heatmap intensity, then the SGDHP and UGCH scores according to system guide
+            columns = {
+                'sgdhp_data': composite_intensity,
+                'ivsdh_data': vanna_intensity_adj,
+                'ugch_data': delta_intensity_adj,
+            }
+            columns.update(self._sgdhp_score_columns(table, prices))
+            columns.update(self._ugch_score_columns(table))
             
             # Additional heatmap metrics
-            df_strike['heatmap_regime_scaling'] = 1.0
-            df_strike['heatmap_gamma_component'] = gamma_intensity_adj
-            df_strike['heatmap_delta_component'] = delta_intensity_adj
-            df_strike['heatmap_vanna_component'] = vanna_intensity_adj
-            df_strike['heatmap_flow_component'] = flow_intensity
-            
-            return df_strike
+            columns['heatmap_regime_scaling'] = np.ones(len(table))
+            columns['heatmap_gamma_component'] = gamma_intensity_adj
+            columns['heatmap_delta_component'] = delta_intensity_adj
+            columns['heatmap_vanna_component'] = vanna_intensity_adj
+            columns['heatmap_flow_component'] = flow_intensity
+            return columns
             
         except Exception as e:
             self.logger.error(f"Error calculating enhanced heatmap data: {e}", exc_info=True)
-            df_strike['sgdhp_data'] = 0.0
-            df_strike['ivsdh_data'] = 0.0
-            df_strike['ugch_data'] = 0.0
-            return df_strike
+            return {name: np.zeros(len(table)) for name in ('sgdhp_data', 'ivsdh_data', 'ugch_data')}
 
-    def _calculate_sgdhp_scores(self, df_strike: pd.DataFrame, und_data: Dict) -> pd.DataFrame:
-        """Calculate SGDHP scores according to system guide specifications."""
+    def _sgdhp_score_columns(self, table: RaggedStrikeTableV2_5, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """Calculate SGDHP scores according to system guide specifications (0 for a symbol without a price)."""
         try:
-            current_price = und_data.get('price', 0.0)
-            if current_price <= 0:
-                df_strike['sgdhp_score_strike'] = 0.0
-                return df_strike
-            
             # Get required data
-            gxoi_at_strike = df_strike['total_gxoi_at_strike'].fillna(0)
-            dxoi_at_strike = df_strike['total_dxoi_at_strike'].fillna(0)
-            strikes = df_strike['strike'].fillna(0)
+            gxoi_at_strike = table.arrays['total_gxoi_at_strike']
+            dxoi_at_strike = table.arrays['total_dxoi_at_strike']
+            priced = table.broadcast(prices > 0).astype(bool)
+            current_price = np.where(priced, table.broadcast(prices), 1.0)
             
             # Calculate price proximity factor (Gaussian-like decay)
             proximity_sensitivity = self._get_metric_config('heatmap_generation_settings', 'sgdhp_params.proximity_sensitivity_param', 0.05)
-            price_proximity_factor = np.exp(-((strikes - current_price) / current_price) ** 2 / (2 * proximity_sensitivity ** 2))
+            price_proximity_factor = np.exp(-((table.strikes - current_price) / current_price) ** 2 / (2 * proximity_sensitivity ** 2))
             
-            # Calculate DXOI normalized impact
-            max_abs_dxoi = dxoi_at_strike.abs().max()
-            if max_abs_dxoi > 0:
-                dxoi_normalized_impact = dxoi_at_strike.abs() / (max_abs_dxoi + 1e-6)
-            else:
-                dxoi_normalized_impact = pd.Series([0.0] * len(df_strike))
+            # Calculate DXOI normalized impact against each symbol's largest |DXOI|
+            max_abs_dxoi = table.broadcast(table.segment_max(np.abs(dxoi_at_strike)))
+            dxoi_normalized_impact = np.divide(np.abs(dxoi_at_strike), max_abs_dxoi + 1e-6,
+                                               out=np.zeros(len(table)), where=max_abs_dxoi > 0)
             
             # Recent flow confirmation factor (simplified for now)
             # In full implementation, this would use strike-level recent flows
-            recent_flow_confirmation = pd.Series([0.1] * len(df_strike))  # Small positive confirmation
+            recent_flow_confirmation = 0.1  # Small positive confirmation
             
             # Calculate SGDHP score according to system guide formula
             sgdhp_scores = (
@@ -1189,42 +1401,24 @@ class MetricsCalculatorV2_5:
                 dxoi_normalized_impact * 
                 (1 + recent_flow_confirmation)
             )
+            sgdhp_scores = np.where(priced, sgdhp_scores, 0.0)
             
-            df_strike['sgdhp_score_strike'] = sgdhp_scores
-            
-            self.logger.debug(f"SGDHP scores calculated: min={sgdhp_scores.min():.2f}, max={sgdhp_scores.max():.2f}, mean={sgdhp_scores.mean():.2f}")
-            
-            return df_strike
+            if len(table):
+                self.logger.debug(f"SGDHP scores calculated: min={sgdhp_scores.min():.2f}, max={sgdhp_scores.max():.2f}, mean={sgdhp_scores.mean():.2f}")
+            return {'sgdhp_score_strike': sgdhp_scores}
             
         except Exception as e:
             self.logger.error(f"Error calculating SGDHP scores: {e}", exc_info=True)
-            df_strike['sgdhp_score_strike'] = 0.0
-            return df_strike
+            return {'sgdhp_score_strike': np.zeros(len(table))}
     
-    def _calculate_ugch_scores(self, df_strike: pd.DataFrame, und_data: Dict) -> pd.DataFrame:
+    def _ugch_score_columns(self, table: RaggedStrikeTableV2_5) -> Dict[str, np.ndarray]:
         """Calculate UGCH scores according to system guide specifications."""
         try:
-            # Get Greek exposures at strike level
-            dxoi_at_strike = df_strike['total_dxoi_at_strike'].fillna(0)
-            gxoi_at_strike = df_strike['total_gxoi_at_strike'].fillna(0)
-            vxoi_at_strike = df_strike['total_vxoi_at_strike'].fillna(0)
-            txoi_at_strike = df_strike['total_txoi_at_strike'].fillna(0)
-            charm_at_strike = df_strike['total_charmxoi_at_strike'].fillna(0)
-            vanna_at_strike = df_strike['total_vannaxoi_at_strike'].fillna(0)
-            
-            # Normalize each Greek series (Z-score normalization)
-            def normalize_series(series):
-                if series.std() > 0:
-                    return (series - series.mean()) / series.std()
-                else:
-                    return pd.Series([0.0] * len(series))
-            
-            norm_dxoi = normalize_series(dxoi_at_strike)
-            norm_gxoi = normalize_series(gxoi_at_strike)
-            norm_vxoi = normalize_series(vxoi_at_strike)
-            norm_txoi = normalize_series(txoi_at_strike)
-            norm_charm = normalize_series(charm_at_strike)
-            norm_vanna = normalize_series(vanna_at_strike)
+            # Normalize each Greek series per symbol (Z-score normalization, sample std)
+            def normalize_series(values):
+                std = table.broadcast(table.segment_std(values, ddof=1))
+                centered = values - table.broadcast(table.segment_mean(values))
+                return np.divide(centered, std, out=np.zeros(len(table)), where=std > 0)
             
             # Get Greek weights from config (with defaults)
             greek_weights = self._get_metric_config('heatmap_generation_settings', 'ugch_params.greek_weights', {
@@ -1238,24 +1432,33 @@ class MetricsCalculatorV2_5:
             
             # Calculate weighted confluence score
             ugch_scores = (
-                greek_weights.get('norm_DXOI', 1.5) * norm_dxoi +
-                greek_weights.get('norm_GXOI', 2.0) * norm_gxoi +
-                greek_weights.get('norm_VXOI', 1.2) * norm_vxoi +
-                greek_weights.get('norm_TXOI', 0.8) * norm_txoi +
-                greek_weights.get('norm_CHARM', 0.6) * norm_charm +
-                greek_weights.get('norm_VANNA', 1.0) * norm_vanna
+                greek_weights.get('norm_DXOI', 1.5) * normalize_series(table.arrays['total_dxoi_at_strike']) +
+                greek_weights.get('norm_GXOI', 2.0) * normalize_series(table.arrays['total_gxoi_at_strike']) +
+                greek_weights.get('norm_VXOI', 1.2) * normalize_series(table.arrays['total_vxoi_at_strike']) +
+                greek_weights.get('norm_TXOI', 0.8) * normalize_series(table.arrays['total_txoi_at_strike']) +
+                greek_weights.get('norm_CHARM', 0.6) * normalize_series(table.arrays['total_charmxoi_at_strike']) +
+                greek_weights.get('norm_VANNA', 1.0) * normalize_series(table.arrays['total_vannaxoi_at_strike'])
             )
             
-            df_strike['ugch_score_strike'] = ugch_scores
-            
-            self.logger.debug(f"UGCH scores calculated: min={ugch_scores.min():.2f}, max={ugch_scores.max():.2f}, mean={ugch_scores.mean():.2f}")
-            
-            return df_strike
+            if len(table):
+                self.logger.debug(f"UGCH scores calculated: min={ugch_scores.min():.2f}, max={ugch_scores.max():.2f}, mean={ugch_scores.mean():.2f}")
+            return {'ugch_score_strike': ugch_scores}
             
         except Exception as e:
             self.logger.error(f"Error calculating UGCH scores: {e}", exc_info=True)
-            df_strike['ugch_score_strike'] = 0.0
+            return {'ugch_score_strike': np.zeros(len(table))}
+
+    def _calculate_enhanced_heatmap_data(self, df_strike: pd.DataFrame, und_data: Dict,
+                                         context: Optional[MetricCalculationContextV2_5] = None) -> pd.DataFrame:
+        """Calculate Enhanced Heatmap Data (SGDHP, IVSDH, UGCH)."""
+        if df_strike.empty:
             return df_strike
+        context = context or MetricCalculationContextV2_5(und_data.get('symbol', 'UNKNOWN'))
+        table = RaggedStrikeTableV2_5.single(context.symbol, context.strike_arrays(df_strike))
+        prices, _, _ = self._segment_contexts([und_data])
+        for column, values in self._heatmap_columns(table, prices).items():
+            df_strike[column] = values
+        return df_strike
 
     def _get_dte_scaling_factor(self, dte_context: str) -> float:
         """Get DTE scaling factor for adaptive calculations."""
@@ -1294,53 +1497,61 @@ class MetricsCalculatorV2_5:
             self.logger.error(f"Error calculating time weight: {e}")
             return 1.0
     
-    def _normalize_flow(self, flow_values, flow_type: str, symbol: str = None) -> np.ndarray:
-        """Normalize flow values using historical context."""
+    def _normalize_flow_segments(self, table: RaggedStrikeTableV2_5, flow_values, flow_type: str) -> np.ndarray:
+        """
+        Z-scores of a per-strike flow for every symbol of a ragged table, each strike
+        against its own history.
+
+        Each symbol keeps a strike x time history matrix per flow type; this cycle's
+        values become its newest row, and strikes with more than 10 cycles of history
+        are normalized with their column mean and std. Other strikes (new to the chain,
+        or without variation) fall back to the z-score across the symbol's strikes.
+        A scalar input is returned as-is across the table.
+        """
+        if np.ndim(flow_values) == 0:
+            return np.full(len(table), float(flow_values))
+        values = np.asarray(flow_values, dtype=np.float64)
         try:
-            if symbol and hasattr(flow_values, '__iter__'):
-                # Use isolated cache for normalization
-                cache = self._get_isolated_cache('enhanced_heatmap', symbol)
-                cache_key = f"{flow_type}_normalization_history"
-                
-                if cache_key not in cache:
-                    cache[cache_key] = []
-                
-                # Add current values to history
-                if isinstance(flow_values, (list, np.ndarray, pd.Series)):
-                    cache[cache_key].extend(list(flow_values))
-                else:
-                    cache[cache_key].append(flow_values)
-                
-                # Keep only recent history
-                if len(cache[cache_key]) > 100:
-                    cache[cache_key] = cache[cache_key][-100:]
-                
-                # Normalize using historical context
-                if len(cache[cache_key]) > 10:
-                    mean_val = np.mean(cache[cache_key])
-                    std_val = np.std(cache[cache_key])
-                    if std_val > 0:
-                        if isinstance(flow_values, (list, np.ndarray, pd.Series)):
-                            return (np.array(flow_values) - mean_val) / std_val
-                        else:
-                            return (flow_values - mean_val) / std_val
-            
-            # Fallback: simple normalization
-            if isinstance(flow_values, (list, np.ndarray, pd.Series)):
-                flow_array = np.array(flow_values)
-                if len(flow_array) > 0:
-                    return (flow_array - np.mean(flow_array)) / (np.std(flow_array) + 1e-6)
-                else:
-                    return np.array([0.0])
-            else:
-                return np.array([flow_values])
-                
+            # Fallback: simple normalization across each symbol's strikes
+            means = table.broadcast(table.segment_mean(values))
+            scales = table.broadcast(table.segment_std(values) + 1e-6)
+            for symbol in table.symbols:
+                start, stop = table.bounds(symbol)
+                if start == stop:
+                    continue
+                strikes = table.strikes[start:stop]
+                with self._metric_caches.locked(symbol):
+                    history = self._strike_history(symbol, flow_type, create=True)
+                    history.append(strikes, values[start:stop])
+                    counts, strike_means, strike_stds = history.column_stats(strikes)
+                # Normalize using each strike's own historical context
+                own = (counts > 10) & (strike_stds > 0)
+                means[start:stop][own] = strike_means[own]
+                scales[start:stop][own] = strike_stds[own]
+            return (values - means) / scales
         except Exception as e:
             self.logger.error(f"Error normalizing flow {flow_type}: {e}", exc_info=True)
-            if isinstance(flow_values, (list, np.ndarray, pd.Series)):
-                return np.zeros(len(flow_values))
-            else:
-                return np.array([0.0])
+            return np.zeros(len(values))
+
+    def _strike_history(self, symbol: str, flow_type: str, create: bool = False) -> Optional[StrikeHistoryMatrixV2_5]:
+        """A symbol's strike x time history of a flow type (created empty if asked to)."""
+        cache = self._get_isolated_cache('enhanced_heatmap', symbol)
+        cache_key = f"{flow_type}_strike_history"
+        history = cache.get(cache_key)
+        if history is None and create:
+            history = cache[cache_key] = StrikeHistoryMatrixV2_5(100)
+        return history
+
+    def get_strike_history(self, symbol: str, flow_type: str) -> pd.DataFrame:
+        """
+        The intraday strike x time history of a normalized flow input (e.g. 'gamma',
+        'delta', 'vanna', 'combined_flow', 'dxoi', 'theta_flow') as a DataFrame with one
+        row per cycle and one column per strike, ready for a strike-by-time heatmap.
+        Empty if this calculator has not calculated the symbol's strike metrics.
+        """
+        with self._metric_caches.locked(symbol):
+            history = self._strike_history(symbol, flow_type)
+            return history.frame() if history is not None else pd.DataFrame()
 
     def _calculate_atr(self, symbol: str, dte_max: int = 45) -> float:
         """Fetches OHLCV data and calculates the Average True Range (ATR)."""
@@ -1366,8 +1577,24 @@ class MetricsCalculatorV2_5:
             self.logger.error(f"Failed to calculate ATR for {symbol}: {e}", exc_info=True)
             return 0.0
     
+    _EXPOSURE_AGGREGATE_KEYS = (
+        'total_delta_flow', 'total_gamma_flow', 'total_vega_flow', 'total_theta_flow',
+        'total_delta_exposure', 'total_gamma_exposure', 'total_vega_exposure', 'total_theta_exposure',
+        'total_nvp', 'total_nvp_vol', 'vapi_fa_und_aggregate', 'dwfd_und_aggregate', 'tw_laf_und_aggregate'
+    )
+    _ADAPTIVE_AGGREGATE_KEYS = (
+        'a_dag_und_aggregate', 'vri_2_0_und_aggregate', 'a_sai_und_avg', 'a_ssi_und_avg',
+        'total_0dte_gamma', 'total_0dte_delta', 'total_0dte_vanna'
+    )
+
     def _calculate_underlying_aggregates(self, df_strike: Optional[pd.DataFrame]) -> Dict[str, float]:
         """Calculate underlying-level aggregate metrics from strike-level data."""
+        aggregates = self._calculate_exposure_aggregates(df_strike)
+        aggregates.update(self._calculate_adaptive_aggregates(df_strike))
+        return aggregates
+
+    def _calculate_exposure_aggregates(self, df_strike: Optional[pd.DataFrame]) -> Dict[str, float]:
+        """Sums of the strike table's flow, exposure and NVP columns (needs no adaptive metrics)."""
         aggregates = {}
         
         try:
@@ -1388,6 +1615,35 @@ class MetricsCalculatorV2_5:
                 aggregates['total_vega_exposure'] = df_strike['total_vxoi_at_strike'].fillna(0).sum() if 'total_vxoi_at_strike' in df_strike.columns else 0.0
                 aggregates['total_theta_exposure'] = df_strike['total_txoi_at_strike'].fillna(0).sum() if 'total_txoi_at_strike' in df_strike.columns else 0.0
                 
+                # Net value/volume metrics
+                aggregates['total_nvp'] = df_strike['nvp_at_strike'].fillna(0).sum() if 'nvp_at_strike' in df_strike.columns else 0.0
+                aggregates['total_nvp_vol'] = df_strike['nvp_vol_at_strike'].fillna(0).sum() if 'nvp_vol_at_strike' in df_strike.columns else 0.0
+                
+                # Legacy mapping for dashboard compatibility
+                aggregates['vapi_fa_und_aggregate'] = aggregates['total_vega_flow']
+                aggregates['dwfd_und_aggregate'] = aggregates['total_delta_flow']  
+                aggregates['tw_laf_und_aggregate'] = aggregates['total_theta_flow']
+                
+                self.logger.debug(f"Calculated exposure aggregates: {aggregates}")
+                
+            else:
+                # Set defaults when no strike data
+                self.logger.warning("No strike data available for aggregation")
+                aggregates = dict.fromkeys(self._EXPOSURE_AGGREGATE_KEYS, 0.0)
+                
+        except Exception as e:
+            self.logger.error(f"Error calculating underlying aggregates: {e}", exc_info=True)
+            # Set safe defaults
+            aggregates = dict.fromkeys(self._EXPOSURE_AGGREGATE_KEYS, 0.0)
+        
+        return aggregates
+
+    def _calculate_adaptive_aggregates(self, df_strike: Optional[pd.DataFrame]) -> Dict[str, float]:
+        """Aggregates of the adaptive (A-DAG, VRI 2.0, A-SAI/A-SSI) and 0DTE strike columns."""
+        aggregates = {}
+        
+        try:
+            if df_strike is not None and not df_strike.empty:
                 # Advanced metrics (sum or mean as appropriate)
                 aggregates['a_dag_und_aggregate'] = df_strike['a_dag_exposure'].fillna(0).sum() if 'a_dag_exposure' in df_strike.columns else 0.0
                 aggregates['vri_2_0_und_aggregate'] = df_strike['vri_2_0_strike'].fillna(0).mean() if 'vri_2_0_strike' in df_strike.columns else 0.0
@@ -1413,213 +1669,68 @@ class MetricsCalculatorV2_5:
                     aggregates['a_sai_und_avg'] = 0.0
                     aggregates['a_ssi_und_avg'] = 0.0
                 
-                # Net value/volume metrics
-                aggregates['total_nvp'] = df_strike['nvp_at_strike'].fillna(0).sum() if 'nvp_at_strike' in df_strike.columns else 0.0
-                aggregates['total_nvp_vol'] = df_strike['nvp_vol_at_strike'].fillna(0).sum() if 'nvp_vol_at_strike' in df_strike.columns else 0.0
-                
                 # 0DTE metrics (sum)
                 aggregates['total_0dte_gamma'] = df_strike['0dte_gamma_exposure'].fillna(0).sum() if '0dte_gamma_exposure' in df_strike.columns else 0.0
                 aggregates['total_0dte_delta'] = df_strike['0dte_delta_exposure'].fillna(0).sum() if '0dte_delta_exposure' in df_strike.columns else 0.0
                 aggregates['total_0dte_vanna'] = df_strike['0dte_vanna_exposure'].fillna(0).sum() if '0dte_vanna_exposure' in df_strike.columns else 0.0
                 
-                # Legacy mapping for dashboard compatibility
-                aggregates['vapi_fa_und_aggregate'] = aggregates['total_vega_flow']
-                aggregates['dwfd_und_aggregate'] = aggregates['total_delta_flow']  
-                aggregates['tw_laf_und_aggregate'] = aggregates['total_theta_flow']
-                
-                self.logger.debug(f"Calculated aggregates: {aggregates}")
+                self.logger.debug(f"Calculated adaptive aggregates: {aggregates}")
                 
             else:
-                # Set defaults when no strike data
-                self.logger.warning("No strike data available for aggregation")
-                aggregates = {
-                    'total_delta_flow': 0.0,
-                    'total_gamma_flow': 0.0,
-                    'total_vega_flow': 0.0,
-                    'total_theta_flow': 0.0,
-                    'total_delta_exposure': 0.0,
-                    'total_gamma_exposure': 0.0,
-                    'total_vega_exposure': 0.0,
-                    'total_theta_exposure': 0.0,
-                    'a_dag_und_aggregate': 0.0,
-                    'vri_2_0_und_aggregate': 0.0,
-                    'total_nvp': 0.0,
-                    'total_nvp_vol': 0.0,
-                    'total_0dte_gamma': 0.0,
-                    'total_0dte_delta': 0.0,
-                    'total_0dte_vanna': 0.0,
-                    'vapi_fa_und_aggregate': 0.0,
-                    'dwfd_und_aggregate': 0.0,
-                    'tw_laf_und_aggregate': 0.0,
-                    'a_sai_und_avg': 0.0,
-                    'a_ssi_und_avg': 0.0
-                }
+                aggregates = dict.fromkeys(self._ADAPTIVE_AGGREGATE_KEYS, 0.0)
                 
         except Exception as e:
-            self.logger.error(f"Error calculating underlying aggregates: {e}", exc_info=True)
-            # Set safe defaults
-            aggregates = {
-                'total_delta_flow': 0.0,
-                'total_gamma_flow': 0.0,
-                'total_vega_flow': 0.0,
-                'total_theta_flow': 0.0,
-                'total_delta_exposure': 0.0,
-                'total_gamma_exposure': 0.0,
-                'total_vega_exposure': 0.0,
-                'total_theta_exposure': 0.0,
-                'a_dag_und_aggregate': 0.0,
-                'vri_2_0_und_aggregate': 0.0,
-                'total_nvp': 0.0,
-                'total_nvp_vol': 0.0,
-                'total_0dte_gamma': 0.0,
-                'total_0dte_delta': 0.0,
-                'total_0dte_vanna': 0.0,
-                'vapi_fa_und_aggregate': 0.0,
-                'dwfd_und_aggregate': 0.0,
-                'tw_laf_und_aggregate': 0.0,
-                'a_sai_und_avg': 0.0,
-                'a_ssi_und_avg': 0.0
-            }
+            self.logger.error(f"Error calculating adaptive aggregates: {e}", exc_info=True)
+            aggregates = dict.fromkeys(self._ADAPTIVE_AGGREGATE_KEYS, 0.0)
         
         return aggregates
 
-    def _get_intraday_cache_file(self, symbol: str, metric_name: str) -> Path:
-        """Get the cache file path for intraday data."""
-        return self.intraday_cache_dir / f"{symbol}_{metric_name}_{self.current_trading_date}.json"
+    def _load_intraday_cache(self, symbol: str, metric_name: str) -> np.ndarray:
+        """Today's intraday values for a metric, oldest first."""
+        return self.intraday_store.values(symbol, metric_name)
 
-    def _load_intraday_cache(self, symbol: str, metric_name: str) -> List[float]:
-        """Load intraday cache from disk."""
-        cache_file = self._get_intraday_cache_file(symbol, metric_name)
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    # Check if it's today's data
-                    if data.get('date') == self.current_trading_date:
-                        return data.get('values', [])
-            except Exception as e:
-                self.logger.warning(f"Error loading intraday cache for {symbol}_{metric_name}: {e}")
-        return []
-
-    def _save_intraday_cache(self, symbol: str, metric_name: str, values: List[float]) -> None:
-        """Save intraday cache to disk."""
-        cache_file = self._get_intraday_cache_file(symbol, metric_name)
-        try:
-            cache_data = {
-                'date': self.current_trading_date,
-                'values': values,
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
-        except Exception as e:
-            self.logger.warning(f"Error saving intraday cache for {symbol}_{metric_name}: {e}")
-
-    def _add_to_intraday_cache(self, symbol: str, metric_name: str, value: float, max_size: int = 200) -> List[float]:
-        """Add value to intraday cache and return updated cache."""
-        cache_values = self._load_intraday_cache(symbol, metric_name)
-        
-        # If cache is empty (new ticker), seed it with baseline values
-        if not cache_values:
-            cache_values = self._seed_new_ticker_cache(symbol, metric_name, value)
-        else:
-            cache_values.append(value)
-        
-        # Keep only the most recent values (e.g., last 200 data points = ~1.5 hours at 30s intervals)
-        if len(cache_values) > max_size:
-            cache_values = cache_values[-max_size:]
-        
-        self._save_intraday_cache(symbol, metric_name, cache_values)
-        return cache_values
+    def _add_to_intraday_cache(self, symbol: str, metric_name: str, value: float, max_size: int = 200) -> np.ndarray:
+        """Add value to intraday cache and return updated cache (at most max_size most recent values)."""
+        # Seed, append and read back as one step per symbol, so two calculations of the
+        # same ticker cannot both seed it or interleave their values
+        with self._metric_caches.locked(symbol):
+            if len(self.intraday_store.values(symbol, metric_name)) == 0:
+                # New ticker: seed it with baseline values
+                for baseline_value in self._seed_new_ticker_cache(symbol, metric_name, value):
+                    self.intraday_store.append(symbol, metric_name, baseline_value, capacity=max_size)
+            self.intraday_store.append(symbol, metric_name, value, capacity=max_size)
+            return self.intraday_store.values(symbol, metric_name)
 
     def _seed_new_ticker_cache(self, symbol: str, metric_name: str, current_value: float) -> List[float]:
-        """Seed cache for new ticker with baseline values from existing tickers or defaults."""
+        """Baseline values for a new ticker's cache, from another ticker's history or defaults."""
         try:
-            # Try to find existing cache data from similar tickers
-            baseline_values = []
-            
-            # Look for existing cache files from other tickers
-            if self.intraday_cache_dir.exists():
-                for cache_file in self.intraday_cache_dir.glob(f"*_{metric_name}_{self.current_trading_date}.json"):
-                    if not cache_file.name.startswith(f"{symbol}_"):
-                        try:
-                            with open(cache_file, 'r') as f:
-                                data = json.load(f)
-                                if data.get('date') == self.current_trading_date:
-                                    existing_values = data.get('values', [])
-                                    if len(existing_values) >= 10:
-                                        # Use the last 10 values as baseline
-                                        baseline_values = existing_values[-10:]
-                                        if self.logger.isEnabledFor(logging.DEBUG):
-                                            self.logger.debug(f"Seeded {symbol} {metric_name} cache with {len(baseline_values)} values from {cache_file.name}")
-                                        break
-                        except Exception as e:
-                            continue
-            
-            # If no existing data found, use intelligent defaults based on metric type
-            if not baseline_values:
-                if metric_name == 'vapi_fa':
-                    # VAPI-FA typically ranges from -50k to +50k, seed around zero
-                    baseline_values = [0.0, 1000.0, -1000.0, 2000.0, -2000.0, 500.0, -500.0, 1500.0, -1500.0, 0.0]
-                elif metric_name == 'dwfd':
-                    # DWFD typically ranges from -500 to +500, seed around zero  
-                    baseline_values = [0.0, 50.0, -50.0, 100.0, -100.0, 25.0, -25.0, 75.0, -75.0, 0.0]
-                elif metric_name == 'tw_laf':
-                    # TW-LAF typically ranges from -100k to +100k, seed around zero
-                    baseline_values = [0.0, 5000.0, -5000.0, 10000.0, -10000.0, 2500.0, -2500.0, 7500.0, -7500.0, 0.0]
-                else:
-                    # Generic baseline for other metrics
-                    baseline_values = [0.0, 10.0, -10.0, 20.0, -20.0, 5.0, -5.0, 15.0, -15.0, 0.0]
-                
+            # Try to use existing history from other tickers (last 10 values)
+            peer_values = self.intraday_store.peer_values(metric_name, exclude_symbol=symbol, min_count=10)
+            if peer_values is not None:
                 if self.logger.isEnabledFor(logging.DEBUG):
-                    self.logger.debug(f"Seeded {symbol} {metric_name} cache with default baseline values")
+                    self.logger.debug(f"Seeded {symbol} {metric_name} cache with 10 values from another ticker")
+                return [float(x) for x in peer_values[-10:]]
             
-            # Add current value to the baseline
-            baseline_values.append(current_value)
+            # If no existing data found, use intelligent defaults based on metric type
+            if metric_name == 'vapi_fa':
+                # VAPI-FA typically ranges from -50k to +50k, seed around zero
+                baseline_values = [0.0, 1000.0, -1000.0, 2000.0, -2000.0, 500.0, -500.0, 1500.0, -1500.0, 0.0]
+            elif metric_name == 'dwfd':
+                # DWFD typically ranges from -500 to +500, seed around zero  
+                baseline_values = [0.0, 50.0, -50.0, 100.0, -100.0, 25.0, -25.0, 75.0, -75.0, 0.0]
+            elif metric_name == 'tw_laf':
+                # TW-LAF typically ranges from -100k to +100k, seed around zero
+                baseline_values = [0.0, 5000.0, -5000.0, 10000.0, -10000.0, 2500.0, -2500.0, 7500.0, -7500.0, 0.0]
+            else:
+                # Generic baseline for other metrics
+                baseline_values = [0.0, 10.0, -10.0, 20.0, -20.0, 5.0, -5.0, 15.0, -15.0, 0.0]
             
-            # Save the seeded cache
-            self._save_intraday_cache(symbol, metric_name, baseline_values)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Seeded {symbol} {metric_name} cache with default baseline values")
             
             return baseline_values
             
         except Exception as e:
             self.logger.error(f"Error seeding cache for {symbol} {metric_name}: {e}")
             # Fallback to simple baseline
-            return [0.0, current_value]
-
-    def _calculate_percentile_gauge_value(self, cache_values: List[float], current_value: float) -> float:
-        """Calculate gauge value (-3 to +3) based on percentile ranking in cache."""
-        try:
-            if len(cache_values) < 2:
-                # Not enough data for percentile calculation, return neutral
-                return 0.0
-            
-            # Create list including current value for ranking
-            all_values = list(cache_values) + [current_value]
-            sorted_values = sorted(all_values)
-            
-            # Handle duplicate values by finding the range of positions
-            current_positions = [i for i, val in enumerate(sorted_values) if val == current_value]
-            
-            if len(current_positions) == 1:
-                # Unique value, use its position
-                position = current_positions[0]
-            else:
-                # Duplicate values, use middle position
-                position = current_positions[len(current_positions) // 2]
-            
-            # Calculate percentile (0.0 to 1.0)
-            percentile = position / (len(sorted_values) - 1) if len(sorted_values) > 1 else 0.5
-            
-            # Convert to gauge scale (-3 to +3)
-            # 0% = -3, 50% = 0, 100% = +3
-            gauge_value = (percentile - 0.5) * 6.0
-            
-            # Ensure within bounds
-            gauge_value = max(-3.0, min(3.0, gauge_value))
-            
-            return float(gauge_value)
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating percentile gauge value: {e}")
-            return 0.0
\ No newline at end of file
+            return [0.0]
@@ -0,0 +1,116 @@
+# core_analytics_engine/ragged_strike_table_v2_5.py
+# EOTS v2.5 - RAGGED MULTI-SYMBOL STRIKE TABLE
+#
+# Concatenates the per-strike arrays of several symbols into one set of flat
+# float64 arrays, with a symbol-offset index: the strikes of symbol i occupy
+# rows offsets[i]:offsets[i + 1]. Per-strike metrics then run as one vectorized
+# pass over every symbol, per-symbol reductions (sum, mean, std, max) are single
+# bincount/reduceat calls, and each symbol's results are split back out as
+# zero-copy slices.
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core_analytics_engine.strike_index_v2_5 import StrikeIndexV2_5
+
+
+class RaggedStrikeTableV2_5:
+    """
+    Per-strike arrays of several symbols laid end to end.
+
+    `arrays[name]` has one value per strike of every symbol; a measure a symbol
+    does not have is zeros in its segment. Segments are in `symbols` order.
+    """
+
+    def __init__(self, symbols: Sequence[str], offsets: np.ndarray, strikes: np.ndarray,
+                 arrays: Optional[Dict[str, np.ndarray]] = None):
+        self.symbols: List[str] = list(symbols)
+        self.offsets = np.asarray(offsets, dtype=np.intp)
+        if len(self.offsets) != len(self.symbols) + 1:
+            raise ValueError("offsets must have one more entry than symbols")
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.arrays: Dict[str, np.ndarray] = arrays or {}
+        self.lengths = np.diff(self.offsets)
+        # Segment (symbol position) of every row
+        self.segment_ids = np.repeat(np.arange(len(self.symbols)), self.lengths)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_strike_indexes(cls, items: Sequence[Tuple[str, StrikeIndexV2_5]]) -> 'RaggedStrikeTableV2_5':
+        """Concatenates the strikes and per-strike arrays of (symbol, strike index) pairs, in order."""
+        symbols = [symbol for symbol, _ in items]
+        indexes = [index for _, index in items]
+        offsets = np.concatenate(([0], np.cumsum([len(index) for index in indexes]))).astype(np.intp)
+        strikes = np.concatenate([index.strikes for index in indexes]) if indexes else np.empty(0)
+        names = list(dict.fromkeys(name for index in indexes for name in index.arrays))
+        arrays = {
+            name: np.concatenate([index.arrays[name] if name in index.arrays else np.zeros(len(index))
+                                  for index in indexes])
+            for name in names
+        }
+        return cls(symbols, offsets, strikes, arrays)
+
+    @classmethod
+    def single(cls, symbol: str, strike_index: StrikeIndexV2_5) -> 'RaggedStrikeTableV2_5':
+        """A one-segment table sharing the strike index's arrays (no copy)."""
+        return cls([symbol], np.array([0, len(strike_index)]), strike_index.strikes, dict(strike_index.arrays))
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.symbols)
+
+    def get(self, name: str, default: Any = 0.0) -> Any:
+        """Concatenated array for `name`, or `default` as given when no symbol has the measure."""
+        return self.arrays.get(name, default)
+
+    def bounds(self, symbol: str) -> Tuple[int, int]:
+        i = self._positions[symbol]
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    # --- Per-segment reductions (one value per symbol) ---
+
+    def broadcast(self, per_segment: Any) -> np.ndarray:
+        """Repeats one value per symbol across that symbol's rows."""
+        return np.repeat(np.asarray(per_segment, dtype=np.float64), self.lengths)
+
+    def segment_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.segment_ids, weights=values, minlength=self.n_segments)
+
+    def segment_mean(self, values: np.ndarray) -> np.ndarray:
+        """Mean per symbol (NaN for a symbol without strikes)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.segment_sum(values) / self.lengths
+
+    def segment_std(self, values: np.ndarray, ddof: int = 0) -> np.ndarray:
+        """Standard deviation per symbol (two-pass); NaN where a symbol has ddof strikes or fewer."""
+        deviations = values - self.broadcast(self.segment_mean(values))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = self.segment_sum(deviations * deviations) / (self.lengths - ddof)
+        variance[self.lengths <= ddof] = np.nan
+        return np.sqrt(variance)
+
+    def segment_max(self, values: np.ndarray) -> np.ndarray:
+        """Maximum per symbol (NaN for a symbol without strikes)."""
+        result = np.full(self.n_segments, np.nan)
+        present = self.lengths > 0
+        if present.any():
+            result[present] = np.maximum.reduceat(values, self.offsets[:-1][present])
+        return result
+
+    # --- Splitting results back out ---
+
+    def segment(self, values: np.ndarray, symbol: str) -> np.ndarray:
+        """One symbol's rows of a concatenated array, as a view."""
+        start, stop = self.bounds(symbol)
+        return values[start:stop]
+
+    def split(self, columns: Dict[str, np.ndarray]) -> Dict[str, Dict[str, np.ndarray]]:
+        """{column: concatenated array} -> {symbol: {column: view of that symbol's rows}}."""
+        return {
+            symbol: {name: values[self.offsets[i]:self.offsets[i + 1]] for name, values in columns.items()}
+            for i, symbol in enumerate(self.symbols)
+        }
@@ -4,11 +4,12 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import pandas as pd
 import numpy as np
 
 from data_models.eots_schemas_v2_5 import ProcessedDataBundleV2_5, SignalPayloadV2_5, ProcessedUnderlyingAggregatesV2_5
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 
 
@@ -52,12 +53,12 @@ class SignalGeneratorV2_5:
         
         self.logger.info("SignalGeneratorV2_5 initialized with activation settings.")
 
-    def generate_all_signals(self, bundle: ProcessedDataBundleV2_5) -> Dict[str, List[SignalPayloadV2_5]]:
+    def generate_all_signals(self, bundle: Union[ProcessedDataBundleV2_5, ColumnarProcessedDataBundleV2_5]) -> Dict[str, List[SignalPayloadV2_5]]:
         """
         Orchestrates the generation of all signal categories, passing the full data
         bundle to the specialized methods.
         """
-        if not isinstance(bundle, ProcessedDataBundleV2_5):
+        if not isinstance(bundle, (ProcessedDataBundleV2_5, ColumnarProcessedDataBundleV2_5)):
             self.logger.error("generate_all_signals received an invalid data bundle type. Returning empty signals dict.")
             return {}
 
@@ -76,11 +77,15 @@ class SignalGeneratorV2_5:
 
         # Create DataFrames once for performance
         # Ensure strike_level_data_with_metrics is not None before list comprehension
-        strike_metrics_list = bundle.strike_level_data_with_metrics or []
-        df_strike = pd.DataFrame([s.model_dump() for s in strike_metrics_list])
-        if not df_strike.empty:
-            df_strike.set_index('strike', inplace=True, drop=False)
+        if isinstance(bundle, ColumnarProcessedDataBundleV2_5):
+            # Shared, strike-indexed table built once per cycle
+            df_strike = bundle.strike_frame()
         else:
+            strike_metrics_list = bundle.strike_level_data_with_metrics or []
+            df_strike = pd.DataFrame([s.model_dump() for s in strike_metrics_list])
+            if not df_strike.empty:
+                df_strike.set_index('strike', inplace=True, drop=False)
+        if df_strike.empty:
             self.logger.debug("Strike level metrics data is empty or None. df_strike will be empty.")
 
 
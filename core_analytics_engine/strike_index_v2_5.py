@@ -0,0 +1,124 @@
+# core_analytics_engine/strike_index_v2_5.py
+# EOTS v2.5 - REUSABLE STRIKE INDEX AND AGGREGATION KERNEL
+#
+# Factorizes a chain's strikes once (sorted unique strikes + per-contract inverse
+# positions) and reduces any per-contract column to per-strike totals with
+# np.bincount. The per-strike arrays stay aligned with the strike table, so the
+# adaptive metrics read NumPy arrays instead of re-pulling DataFrame columns.
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+# Per-strike output column -> per-contract chain column, summed per strike
+STRIKE_SUM_COLUMNS: Dict[str, str] = {
+    'total_dxoi_at_strike': 'dxoi',
+    'total_gxoi_at_strike': 'gxoi',
+    'total_vxoi_at_strike': 'vxoi',
+    'total_txoi_at_strike': 'txoi',
+    'total_charmxoi_at_strike': 'charmxoi',
+    'total_vannaxoi_at_strike': 'vannaxoi',
+    'total_vommaxoi_at_strike': 'vommaxoi',
+    'nvp_at_strike': 'value_bs',
+    'nvp_vol_at_strike': 'volm_bs',
+}
+
+
+class StrikeIndexV2_5:
+    """
+    Sorted unique strikes of one chain, each contract's position among them, and
+    the per-strike arrays computed for the cycle (all aligned with `strikes`).
+    """
+
+    def __init__(self, strikes: np.ndarray, inverse: Optional[np.ndarray] = None):
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        # inverse[i] is the strike position of contract i, or -1 if its strike is missing
+        self.inverse = inverse
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_chain(cls, chain_strikes: Iterable[float]) -> 'StrikeIndexV2_5':
+        """Factorizes the strikes of a contract-level chain; contracts without a strike are skipped."""
+        values = np.asarray(chain_strikes, dtype=np.float64)
+        valid = ~np.isnan(values)
+        strikes, positions = np.unique(values[valid], return_inverse=True)
+        inverse = np.full(len(values), -1, dtype=np.intp)
+        inverse[valid] = positions
+        return cls(strikes, inverse)
+
+    @classmethod
+    def from_strike_frame(cls, df_strike: pd.DataFrame) -> 'StrikeIndexV2_5':
+        """Wraps an existing strike-level frame (one row per strike) and its numeric columns."""
+        index = cls(df_strike['strike'].to_numpy(dtype=np.float64) if 'strike' in df_strike.columns else np.zeros(len(df_strike)))
+        index.adopt_columns(df_strike)
+        return index
+
+    def adopt_columns(self, df_strike: pd.DataFrame) -> None:
+        """Adds the frame's numeric columns this index has no array for yet (NaN as 0)."""
+        for column in df_strike.select_dtypes(include=[np.number]).columns:
+            name = str(column)
+            if name != 'strike' and name not in self.arrays:
+                self.arrays[name] = df_strike[column].fillna(0).to_numpy(dtype=np.float64)
+
+    def copy(self) -> 'StrikeIndexV2_5':
+        """A new index sharing this one's arrays; arrays set or adopted on it do not affect this index."""
+        index = StrikeIndexV2_5(self.strikes, self.inverse)
+        index.arrays = dict(self.arrays)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.strikes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def matches(self, df_strike: pd.DataFrame) -> bool:
+        """True if the frame's rows are exactly this index's strikes, in order."""
+        return (len(df_strike) == len(self.strikes) and 'strike' in df_strike.columns
+                and np.array_equal(df_strike['strike'].to_numpy(dtype=np.float64), self.strikes))
+
+    def reduce_sum(self, values: Any) -> np.ndarray:
+        """Per-strike sums of a per-contract column (NaN counts as 0), accumulated in float64."""
+        if self.inverse is None:
+            raise ValueError("reduce_sum needs an index built from a contract-level chain")
+        weights = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+        valid = self.inverse >= 0
+        return np.bincount(self.inverse[valid], weights=weights[valid], minlength=len(self.strikes))
+
+    def aggregate(self, chain: pd.DataFrame, sums: Mapping[str, str] = STRIKE_SUM_COLUMNS) -> Dict[str, np.ndarray]:
+        """Sums every mapped chain column per strike and stores the results. Missing columns sum to 0."""
+        results = {}
+        for output, source in sums.items():
+            if source in chain.columns:
+                results[output] = self.reduce_sum(chain[source].to_numpy())
+            else:
+                results[output] = np.zeros(len(self.strikes))
+        self.arrays.update(results)
+        return results
+
+    def nearest(self, price: float) -> int:
+        """Position of the strike closest to price (the lower strike on a tie), found by binary search."""
+        if len(self.strikes) == 0:
+            raise ValueError("strike index is empty")
+        right = int(np.searchsorted(self.strikes, price))
+        if right == 0:
+            return 0
+        if right == len(self.strikes):
+            return right - 1
+        left = right - 1
+        return left if price - self.strikes[left] <= self.strikes[right] - price else right
+
+    def set(self, name: str, values: np.ndarray) -> None:
+        self.arrays[name] = np.asarray(values, dtype=np.float64)
+
+    def get(self, name: str, default: Any = 0.0) -> Any:
+        """Aligned per-strike array for `name`, or `default` as given when the measure is absent (like DataFrame.get)."""
+        return self.arrays.get(name, default)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Strike-level DataFrame with a 'strike' column followed by the requested (default: all) arrays."""
+        names = list(self.arrays) if columns is None else [name for name in columns if name in self.arrays]
+        data = {'strike': self.strikes}
+        data.update({name: self.arrays[name] for name in names})
+        return pd.DataFrame(data)
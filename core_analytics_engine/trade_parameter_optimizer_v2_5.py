@@ -13,6 +13,7 @@ from data_models.eots_schemas_v2_5 import (
     ATIFStrategyDirectivePayloadV2_5, ActiveRecommendationPayloadV2_5,
     KeyLevelsDataV2_5, ProcessedDataBundleV2_5
 )
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5
 
 logger = logging.getLogger(__name__)
 EPSILON = 1e-9
@@ -71,11 +72,15 @@ class TradeParameterOptimizerV2_5:
         processed_data: ProcessedDataBundleV2_5, key_levels: KeyLevelsDataV2_5
     ) -> Optional[ActiveRecommendationPayloadV2_5]:
         """Main method to generate a fully parameterized trade recommendation."""
-        if not all(isinstance(arg, (ATIFStrategyDirectivePayloadV2_5, ProcessedDataBundleV2_5, KeyLevelsDataV2_5)) for arg in [directive, processed_data, key_levels]):
+        if not all(isinstance(arg, (ATIFStrategyDirectivePayloadV2_5, ProcessedDataBundleV2_5, ColumnarProcessedDataBundleV2_5, KeyLevelsDataV2_5)) for arg in [directive, processed_data, key_levels]):
             self.logger.error("Invalid input types to TPO. Aborting.")
             return None
         try:
-            options_chain_df = pd.DataFrame(processed_data.options_data_with_metrics)
+            if isinstance(processed_data, ColumnarProcessedDataBundleV2_5):
+                # Memoized on the bundle, so every directive of the cycle shares one frame
+                options_chain_df = processed_data.chain_frame()
+            else:
+                options_chain_df = pd.DataFrame([c.model_dump() for c in processed_data.options_data_with_metrics])
             if options_chain_df.empty:
                 self.logger.warning("Options chain is empty. Cannot select contract.")
                 return None
@@ -89,6 +89,8 @@ def main():
         adaptive_trade_idea_framework=adaptive_trade_idea_framework,
         initial_processor=initial_processor
     )
+    orchestrator.startup()
+    atexit.register(orchestrator.shutdown)
     logger.info("All backend components and orchestrator initialized.")
 
     # --- 3. Dash Application Setup ---
@@ -0,0 +1,164 @@
+# data_management/convexvalue_chain_parser_v2_5.py
+# EOTS v2.5 - COLUMNAR FAST-PATH PARSER FOR CONVEXVALUE CHAIN ROWS
+#
+# Turns the raw get_chain_as_rows payload ([symbol, expiration, strike, kind, *params])
+# into a typed pandas DataFrame in a handful of vectorized passes. DTE is computed once
+# per unique expiration and the DTE/strike filters are applied before any numeric
+# column is converted, so discarded contracts are never materialized.
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_models.chain_frame_schema_v2_5 import compact_chain_frame
+
+logger = logging.getLogger(__name__)
+
+# Leading metadata columns of every chain row, in order.
+CHAIN_ROW_METADATA: List[str] = ["contract_symbol", "expiration", "strike", "opt_kind"]
+
+# ConvexValue parameter name -> RawOptionsContractV2_5 field name.
+# Parameters not listed here keep their ConvexValue name.
+CHAIN_PARAM_RENAMES: Dict[str, str] = {
+    "oi": "open_interest",
+    "volatility": "iv",
+    "price": "raw_price",
+    "delta": "delta_contract",
+    "gamma": "gamma_contract",
+    "theta": "theta_contract",
+    "vega": "vega_contract",
+    "vanna": "vanna_contract",
+    "vomma": "vomma_contract",
+    "charm": "charm_contract",
+}
+
+
+def _dte_by_expiration(expirations: np.ndarray, now: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes DTE once per unique expiration string; returns (per-row DTE, unique expirations)."""
+    unique_exps, inverse = np.unique(expirations.astype(str), return_inverse=True)
+    unique_dte = np.zeros(len(unique_exps), dtype=np.int64)
+    for i, expiration in enumerate(unique_exps):
+        try:
+            unique_dte[i] = (datetime.strptime(expiration, '%Y-%m-%d') - now).days
+        except ValueError:
+            unique_dte[i] = 0  # Default if calculation fails
+    return unique_dte[inverse], unique_exps
+
+
+def _to_float_block(block: np.ndarray) -> np.ndarray:
+    """Converts an object block to float64; None, non-numeric and non-finite values become 0.0."""
+    try:
+        values = block.astype(np.float64)
+    except (TypeError, ValueError):
+        # Mixed payload (e.g. stray strings): fall back to per-column coercion
+        values = np.column_stack([
+            pd.to_numeric(pd.Series(block[:, j]), errors='coerce').to_numpy(dtype=np.float64)
+            for j in range(block.shape[1])
+        ]) if block.shape[1] else np.empty(block.shape, dtype=np.float64)
+    values[~np.isfinite(values)] = 0.0
+    return values
+
+
+def parse_chain_rows(
+    rows: Optional[Sequence[Sequence[Any]]],
+    params: Sequence[str],
+    dte_min: Optional[int] = None,
+    dte_max: Optional[int] = None,
+    strike_min: Optional[float] = None,
+    strike_max: Optional[float] = None,
+    now: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    Parses get_chain_as_rows output into a typed, filtered DataFrame.
+
+    Args:
+        rows: Raw rows of the form [contract_symbol, expiration, strike, opt_kind, *params]
+        params: The parameter list the rows were requested with (column order)
+        dte_min: Optional inclusive lower DTE bound
+        dte_max: Optional inclusive upper DTE bound
+        strike_min: Optional inclusive lower strike bound
+        strike_max: Optional inclusive upper strike bound
+        now: Reference time for DTE (defaults to datetime.now())
+
+    Returns:
+        DataFrame with one row per surviving contract and RawOptionsContractV2_5 field names,
+        in the compact chain schema (float32 params, float64 strike, categorical opt_kind).
+        attrs['expirations'] lists every expiration present in the input rows.
+    """
+    columns = ["contract_symbol", "strike", "opt_kind", "dte_calc"] + [CHAIN_PARAM_RENAMES.get(p, p) for p in params]
+    if not rows:
+        return compact_chain_frame(pd.DataFrame(columns=columns))
+
+    width = len(CHAIN_ROW_METADATA) + len(params)
+    # Rows shorter than the metadata prefix are unusable; pad/trim the rest to a rectangle
+    usable = [row for row in rows if row is not None and len(row) >= len(CHAIN_ROW_METADATA)]
+    if not usable:
+        return compact_chain_frame(pd.DataFrame(columns=columns))
+    if any(len(row) != width for row in usable):
+        usable = [list(row[:width]) + [None] * (width - len(row)) for row in usable]
+    table = np.empty((len(usable), width), dtype=object)
+    table[:] = usable
+
+    # Cheap columns first: DTE (once per expiration) and strike drive the filters
+    dte, expirations = _dte_by_expiration(table[:, 1], now or datetime.now())
+    strike = pd.to_numeric(pd.Series(table[:, 2]), errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+
+    mask = np.ones(len(table), dtype=bool)
+    if dte_min is not None:
+        mask &= dte >= dte_min
+    if dte_max is not None:
+        mask &= dte <= dte_max
+    if strike_min is not None:
+        mask &= strike >= strike_min
+    if strike_max is not None:
+        mask &= strike <= strike_max
+
+    if not mask.all():
+        table = table[mask]
+        dte = dte[mask]
+        strike = strike[mask]
+
+    values = _to_float_block(table[:, len(CHAIN_ROW_METADATA):]).astype(np.float32)
+
+    data: Dict[str, Any] = {
+        "contract_symbol": table[:, 0],
+        "strike": strike,
+        "opt_kind": table[:, 3],
+        "dte_calc": dte,
+    }
+    for j, param in enumerate(params):
+        data[CHAIN_PARAM_RENAMES.get(param, param)] = values[:, j]
+
+    df = compact_chain_frame(pd.DataFrame(data, columns=columns))
+    # Every expiration present in the response (before filtering), for the expiration calendar
+    df.attrs['expirations'] = [str(exp) for exp in expirations]
+    return df
+
+
+def slice_chain_frame(
+    chain_df: pd.DataFrame,
+    dte_min: Optional[int] = None,
+    dte_max: Optional[int] = None,
+    strike_min: Optional[float] = None,
+    strike_max: Optional[float] = None
+) -> pd.DataFrame:
+    """Returns the rows of an already parsed chain frame that fall inside the DTE/strike window."""
+    if chain_df.empty:
+        return chain_df
+    mask = np.ones(len(chain_df), dtype=bool)
+    dte = chain_df["dte_calc"].to_numpy()
+    strike = chain_df["strike"].to_numpy()
+    if dte_min is not None:
+        mask &= dte >= dte_min
+    if dte_max is not None:
+        mask &= dte <= dte_max
+    if strike_min is not None:
+        mask &= strike >= strike_min
+    if strike_max is not None:
+        mask &= strike <= strike_max
+    if mask.all():
+        return chain_df
+    return chain_df[mask].reset_index(drop=True)
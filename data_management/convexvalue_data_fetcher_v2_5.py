@@ -1,18 +1,26 @@
 # data_management/convexvalue_data_fetcher_v2_5.py
 # EOTS v2.5 - SENTRY-APPROVED, CANONICAL V2.5.3 IMPLEMENTATION (FIXED FOR CONVEXVALUE API)
 
+import atexit
 import logging
 import os
+import threading
+import time
 from datetime import datetime, date
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Optional, Union
 import asyncio
 import concurrent.futures
 
+import pandas as pd
+
 # Import ConvexValue Python API
 from convexlib.api import ConvexApi
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from data_models.eots_schemas_v2_5 import RawOptionsContractV2_5, RawUnderlyingDataCombinedV2_5
+from data_management.convexvalue_chain_parser_v2_5 import parse_chain_rows, slice_chain_frame
+from data_management.expiration_calendar_v2_5 import ExpirationCalendarV2_5, ExpirationSelection, expiration_dte
+from utils.async_resilience_v2_5 import CircuitOpenError, configure_provider
 
 logger = logging.getLogger(__name__)
 
@@ -43,15 +51,51 @@ OPTIONS_CHAIN_REQUIRED_PARAMS: List[str] = [
 ]
 
 
+class _ChainCacheEntry(NamedTuple):
+    fetched_at: float  # time.monotonic() of the fetch
+    exps: Tuple[int, ...]  # 1-based expiration indices requested
+    rng: float         # strike range (decimal) requested
+    frame: pd.DataFrame
+
+
 class ConvexValueDataFetcherV2_5:
     """
     Data fetcher for ConvexValue using the official Python API library.
     Replaces the incorrect web API implementation with proper ConvexValue integration.
+
+    The ConvexValue client is synchronous, so every API leg runs on a single
+    process-wide, size-bounded worker pool owned by this class. The pool is
+    created on first use and shut down once at interpreter exit.
     """
-    def __init__(self, config_manager: ConfigManagerV2_5):
+    _executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, config_manager: ConfigManagerV2_5, expiration_calendar: Optional[ExpirationCalendarV2_5] = None):
         self.logger = logger.getChild(self.__class__.__name__)
         self.config_manager = config_manager
         self.timeout = self.config_manager.get_setting("data_fetcher_settings.timeout", 30.0)
+        self.max_workers = int(self.config_manager.get_setting("data_fetcher_settings.convexvalue_max_workers", 8) or 8)
+
+        # Per-leg latency counters, updated from the worker threads
+        self._latency_lock = threading.Lock()
+        self._latency_stats: Dict[str, Dict[str, float]] = {}
+
+        # Shared rate limiter / circuit breaker for every ConvexValue call in this process
+        self.provider_guard = configure_provider(
+            "convexvalue",
+            rate=float(self.config_manager.get_setting("data_fetcher_settings.convexvalue_rate_limit_per_second", 5.0) or 5.0),
+            burst=int(self.config_manager.get_setting("data_fetcher_settings.convexvalue_rate_limit_burst", 10) or 10),
+            failure_threshold=int(self.config_manager.get_setting("data_fetcher_settings.circuit_breaker_failure_threshold", 5) or 5),
+            recovery_timeout=float(self.config_manager.get_setting("data_fetcher_settings.circuit_breaker_recovery_seconds", 30.0) or 30.0)
+        )
+        # Widest recent chain per symbol; narrower DTE/price windows are sliced from it
+        self.chain_cache_ttl_seconds = float(self.config_manager.get_setting("data_fetcher_settings.convexvalue_chain_cache_ttl_seconds", 30.0) or 0.0)
+        self._chain_cache_lock = threading.Lock()
+        self._chain_cache: Dict[str, _ChainCacheEntry] = {}
+
+        # Per-symbol expiration calendar (shared with the Tradier fetcher when injected)
+        self.expiration_calendar = expiration_calendar or ExpirationCalendarV2_5()
+
         self.email = os.getenv("CONVEX_EMAIL")
         self.password = os.getenv("CONVEX_PASSWORD")
         
@@ -74,180 +118,297 @@ class ConvexValueDataFetcherV2_5:
         
         self.logger.info("ConvexValueDataFetcherV2_5 initialized.")
 
-    def _convert_underlying_to_model(self, symbol: str, raw_data: Any) -> Optional[RawUnderlyingDataCombinedV2_5]:
-        """Convert ConvexValue underlying data to our internal model."""
+    @classmethod
+    def _get_executor(cls, max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+        """Return the shared worker pool, creating it on first use."""
+        if cls._executor is None:
+            with cls._executor_lock:
+                if cls._executor is None:
+                    cls._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        thread_name_prefix="convexvalue"
+                    )
+                    atexit.register(cls.shutdown_executor)
+        return cls._executor
+
+    @classmethod
+    def shutdown_executor(cls) -> None:
+        """Shut down the shared worker pool. Safe to call more than once."""
+        with cls._executor_lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            try:
+                executor.shutdown(wait=True, cancel_futures=True)
+            except Exception as cleanup_error:
+                logger.warning(f"Error during ConvexValue executor cleanup: {cleanup_error}")
+
+    def _record_latency(self, leg: str, elapsed: float, success: bool) -> None:
+        """Accumulate latency counters for one API leg."""
+        with self._latency_lock:
+            stats = self._latency_stats.setdefault(leg, {
+                'calls': 0, 'errors': 0, 'total_seconds': 0.0,
+                'last_seconds': 0.0, 'max_seconds': 0.0
+            })
+            stats['calls'] += 1
+            if not success:
+                stats['errors'] += 1
+            stats['total_seconds'] += elapsed
+            stats['last_seconds'] = elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Snapshot of per-leg latency counters (calls, errors, last/avg/max seconds)."""
+        with self._latency_lock:
+            snapshot = {leg: dict(stats) for leg, stats in self._latency_stats.items()}
+        for stats in snapshot.values():
+            stats['avg_seconds'] = stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0
+        return snapshot
+
+    async def _run_in_pool(self, leg: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking ConvexValue call on the shared pool and time it.
+        The call first passes the shared ConvexValue rate limiter and circuit breaker
+        (raises CircuitOpenError while the circuit is open).
+        """
+        def timed_call():
+            start = time.perf_counter()
+            success = False
+            try:
+                result = func(*args, **kwargs)
+                success = True
+                return result
+            finally:
+                self._record_latency(leg, time.perf_counter() - start, success)
+
+        loop = asyncio.get_running_loop()
         try:
-            # ConvexValue API can return data in different formats
-            # Handle both dict format and direct list format
-            if isinstance(raw_data, dict):
-                if 'data' not in raw_data or not raw_data['data']:
-                    self.logger.error(f"No data returned for underlying {symbol}")
-                    return None
-                data_rows = raw_data['data']
-            elif isinstance(raw_data, list):
-                data_rows = raw_data
+            await self.provider_guard.acquire()
+            result = await loop.run_in_executor(self._get_executor(self.max_workers), timed_call)
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.provider_guard.record_failure(e)
+            raise
+        except BaseException:
+            self.provider_guard.breaker.release_probe()
+            raise
+        self.provider_guard.record_success()
+        return result
+
+    def _underlying_row_to_model(self, symbol: str, symbol_data: List[Any]) -> RawUnderlyingDataCombinedV2_5:
+        """Map one get_und row ([symbol, *UNDERLYING_REQUIRED_PARAMS]) to our internal model."""
+        # Map the data to our parameter names
+        # The order matches the params we requested
+        param_values = {}
+        for i, param in enumerate(UNDERLYING_REQUIRED_PARAMS):
+            if i + 1 < len(symbol_data):  # +1 because first element is symbol
+                value = symbol_data[i + 1]
+                # Convert None values to 0 for numeric calculations
+                if value is None:
+                    param_values[param] = 0.0
+                else:
+                    param_values[param] = float(value) if isinstance(value, (int, float, str)) and str(value).replace('.', '').replace('-', '').isdigit() else 0.0
             else:
-                self.logger.error(f"Unexpected data format for underlying {symbol}: {type(raw_data)}")
-                return None
-            
-            # Extract the data row for our symbol
-            symbol_data = None
-            
-            for row in data_rows:
-                if row and len(row) > 0:
-                    # Try exact match first
-                    if str(row[0]).upper() == symbol.upper():
-                        symbol_data = row
-                        break
-                    # Try partial match for different symbol formats
-                    elif symbol.upper() in str(row[0]).upper() or str(row[0]).upper() in symbol.upper():
-                        symbol_data = row
-                        break
-            
+                param_values[param] = 0.0
+
+        # Create the model
+        model_data = {
+            'symbol': symbol,
+            'timestamp': datetime.now(),
+            **param_values
+        }
+
+        return RawUnderlyingDataCombinedV2_5(**model_data)
+
+    def _convert_underlying_rows_to_models(self, symbols: List[str], raw_data: Any) -> Dict[str, RawUnderlyingDataCombinedV2_5]:
+        """Parse a (possibly multi-symbol) get_und response once into a symbol -> model map."""
+        # ConvexValue API can return data in different formats
+        # Handle both dict format and direct list format
+        if isinstance(raw_data, dict):
+            if 'data' not in raw_data or not raw_data['data']:
+                self.logger.error(f"No data returned for underlying {symbols}")
+                return {}
+            data_rows = raw_data['data']
+        elif isinstance(raw_data, list):
+            data_rows = raw_data
+        else:
+            self.logger.error(f"Unexpected data format for underlying {symbols}: {type(raw_data)}")
+            return {}
+
+        # Index the returned rows by symbol once
+        rows_by_symbol: Dict[str, List[Any]] = {}
+        for row in data_rows:
+            if row and len(row) > 0:
+                rows_by_symbol.setdefault(str(row[0]).upper(), row)
+
+        models: Dict[str, RawUnderlyingDataCombinedV2_5] = {}
+        for symbol in symbols:
+            key = symbol.upper()
+            # Try exact match first
+            symbol_data = rows_by_symbol.get(key)
+            if symbol_data is None:
+                # Try partial match for different symbol formats
+                symbol_data = next(
+                    (row for row_key, row in rows_by_symbol.items() if key in row_key or row_key in key),
+                    None
+                )
             if not symbol_data:
-                self.logger.error(f"Symbol {symbol} not found in underlying data. Available: {[row[0] if row and len(row) > 0 else 'None' for row in data_rows[:3]]}")
-                return None
-            
-            # Map the data to our parameter names
-            # The order matches the params we requested
-            param_values = {}
-            for i, param in enumerate(UNDERLYING_REQUIRED_PARAMS):
-                if i + 1 < len(symbol_data):  # +1 because first element is symbol
-                    value = symbol_data[i + 1]
-                    # Convert None values to 0 for numeric calculations
-                    if value is None:
-                        param_values[param] = 0.0
-                    else:
-                        param_values[param] = float(value) if isinstance(value, (int, float, str)) and str(value).replace('.', '').replace('-', '').isdigit() else 0.0
-                else:
-                    param_values[param] = 0.0
-            
-            # Create the model
-            model_data = {
-                'symbol': symbol,
-                'timestamp': datetime.now(),
-                **param_values
-            }
-            
-            return RawUnderlyingDataCombinedV2_5(**model_data)
-            
+                self.logger.error(f"Symbol {symbol} not found in underlying data. Available: {list(rows_by_symbol)[:3]}")
+                continue
+            try:
+                models[symbol] = self._underlying_row_to_model(symbol, symbol_data)
+            except Exception as e:
+                self.logger.error(f"Error converting underlying data for {symbol}: {str(e)}")
+        return models
+
+    def _convert_underlying_to_model(self, symbol: str, raw_data: Any) -> Optional[RawUnderlyingDataCombinedV2_5]:
+        """Convert ConvexValue underlying data to our internal model."""
+        try:
+            return self._convert_underlying_rows_to_models([symbol], raw_data).get(symbol)
         except Exception as e:
             self.logger.error(f"Error converting underlying data for {symbol}: {str(e)}")
             return None
 
+    def _extract_chain_rows(self, symbol: str, raw_data: Any) -> List[Any]:
+        """Return the raw chain rows from either the dict-wrapped or the direct list format."""
+        if isinstance(raw_data, dict):
+            if 'data' not in raw_data or not raw_data['data']:
+                self.logger.warning(f"No options chain data returned for {symbol}")
+                return []
+            return raw_data['data']
+        if isinstance(raw_data, list):
+            return raw_data
+        self.logger.warning(f"Unexpected chain data format for {symbol}: {type(raw_data)}")
+        return []
+
+    def _convert_chain_to_frame(self, symbol: str, raw_data: Any, dte_min: Optional[int] = None,
+                                dte_max: Optional[int] = None) -> pd.DataFrame:
+        """
+        Convert ConvexValue options chain rows to a typed DataFrame using the columnar parser.
+        DTE filtering happens before the numeric columns are converted.
+        """
+        try:
+            data_rows = self._extract_chain_rows(symbol, raw_data)
+            return parse_chain_rows(data_rows, OPTIONS_CHAIN_REQUIRED_PARAMS, dte_min=dte_min, dte_max=dte_max)
+        except Exception as e:
+            self.logger.error(f"Error converting chain data for {symbol}: {str(e)}")
+            return parse_chain_rows([], OPTIONS_CHAIN_REQUIRED_PARAMS)
+
+    def contracts_from_chain_frame(self, chain_df: pd.DataFrame) -> List[RawOptionsContractV2_5]:
+        """Materialize RawOptionsContractV2_5 models from a parsed chain DataFrame."""
+        contracts = []
+        for record in chain_df.to_dict('records'):
+            try:
+                contracts.append(RawOptionsContractV2_5(**record))
+            except Exception as e:
+                self.logger.warning(f"Error parsing contract row: {str(e)}")
+        return contracts
+
     def _convert_chain_to_models(self, symbol: str, raw_data: Any) -> List[RawOptionsContractV2_5]:
         """Convert ConvexValue options chain data to our internal models."""
-        try:
-            contracts = []
-            
-            # Handle both dict format and direct list format
-            if isinstance(raw_data, dict):
-                if 'data' not in raw_data or not raw_data['data']:
-                    self.logger.warning(f"No options chain data returned for {symbol}")
-                    return contracts
-                data_rows = raw_data['data']
-            elif isinstance(raw_data, list):
-                data_rows = raw_data
-            else:
-                self.logger.warning(f"Unexpected chain data format for {symbol}: {type(raw_data)}")
-                return contracts
-            
-            # ConvexValue returns chain data as rows: [symbol, expiration, strike, kind, ...params]
-            for row in data_rows:
+        contracts = self.contracts_from_chain_frame(self._convert_chain_to_frame(symbol, raw_data))
+        self.logger.info(f"Successfully converted {len(contracts)} contracts for {symbol}")
+        return contracts
+
+    def _get_cached_chain(self, symbol: str, exps: Tuple[int, ...], rng: float) -> Optional[_ChainCacheEntry]:
+        """Returns the cached superset chain if it is fresh and covers the requested window."""
+        with self._chain_cache_lock:
+            entry = self._chain_cache.get(symbol)
+        if entry is None or time.monotonic() - entry.fetched_at > self.chain_cache_ttl_seconds:
+            return None
+        if not set(exps) <= set(entry.exps) or entry.rng < rng:
+            return None
+        return entry
+
+    def _widen_chain_request(self, symbol: str, exps: Tuple[int, ...], rng: float) -> Tuple[Tuple[int, ...], float]:
+        """Grows a chain request to also cover a still-fresh cached window, so the cache only widens."""
+        with self._chain_cache_lock:
+            entry = self._chain_cache.get(symbol)
+        if entry is None or time.monotonic() - entry.fetched_at > self.chain_cache_ttl_seconds:
+            return exps, rng
+        return tuple(sorted(set(exps) | set(entry.exps))), max(rng, entry.rng)
+
+    def _store_cached_chain(self, symbol: str, exps: Tuple[int, ...], rng: float, frame: pd.DataFrame) -> None:
+        with self._chain_cache_lock:
+            self._chain_cache[symbol] = _ChainCacheEntry(time.monotonic(), exps, rng, frame)
+
+    def _learn_expirations(self, symbol: str, requested: Tuple[int, ...], returned: List[str],
+                           selection: Optional[ExpirationSelection], dte_min: int, dte_max: int) -> None:
+        """
+        Feeds a chain response back into the expiration calendar.
+
+        A response for indices 1..N lists the nearest N expirations, which is recorded as a
+        partial calendar. A response for calendar-selected indices is checked against the
+        expected dates; on mismatch the calendar is dropped so the next call re-learns it.
+        """
+        if requested == tuple(range(1, len(requested) + 1)):
+            self.expiration_calendar.update(symbol, returned, complete=False)
+        if selection is not None:
+            now = datetime.now()
+            in_window = set()
+            for value in returned:
                 try:
-                    if len(row) < 4:
-                        continue
-                    
-                    contract_symbol = row[0]
-                    expiration = row[1]
-                    strike = row[2]
-                    opt_kind = row[3]
-                    
-                    # Map remaining values to parameters
-                    param_values = {}
-                    for i, param in enumerate(OPTIONS_CHAIN_REQUIRED_PARAMS):
-                        if i + 4 < len(row):  # +4 because first 4 elements are metadata
-                            value = row[i + 4]
-                            # Convert None values to 0 for numeric calculations
-                            if value is None:
-                                param_values[param] = 0.0
-                            else:
-                                param_values[param] = float(value) if isinstance(value, (int, float, str)) and str(value).replace('.', '').replace('-', '').isdigit() else 0.0
-                        else:
-                            param_values[param] = 0.0
-                    
-                    # Calculate days to expiration
-                    from datetime import datetime
-                    try:
-                        exp_datetime = datetime.strptime(expiration, '%Y-%m-%d')
-                        current_datetime = datetime.now()
-                        dte_calc = (exp_datetime - current_datetime).days
-                    except:
-                        dte_calc = 0  # Default if calculation fails
-                    
-                    # Create contract model
-                    contract_data = {
-                        'contract_symbol': contract_symbol,
-                        'strike': float(strike) if strike else 0.0,
-                        'opt_kind': opt_kind,
-                        'dte_calc': dte_calc,  # Required field!
-                        # Map ConvexValue fields to schema fields with explicit field mapping
-                        'open_interest': param_values.get('oi', 0.0),
-                        'iv': param_values.get('volatility', 0.0),
-                        'raw_price': param_values.get('price', 0.0),
-                        'delta_contract': param_values.get('delta', 0.0),
-                        'gamma_contract': param_values.get('gamma', 0.0),
-                        'theta_contract': param_values.get('theta', 0.0),
-                        'vega_contract': param_values.get('vega', 0.0),
-                        'vanna_contract': param_values.get('vanna', 0.0),
-                        'vomma_contract': param_values.get('vomma', 0.0),
-                        'charm_contract': param_values.get('charm', 0.0),
-                        # Explicit mapping for critical OI-based Greeks
-                        'dxoi': param_values.get('dxoi', 0.0),
-                        'gxoi': param_values.get('gxoi', 0.0),
-                        'vxoi': param_values.get('vxoi', 0.0),
-                        'txoi': param_values.get('txoi', 0.0),
-                        'vannaxoi': param_values.get('vannaxoi', 0.0),
-                        'vommaxoi': param_values.get('vommaxoi', 0.0),
-                        'charmxoi': param_values.get('charmxoi', 0.0),
-                        # Flow data
-                        'value_bs': param_values.get('value_bs', 0.0),
-                        'volm_bs': param_values.get('volm_bs', 0.0),
-                        'volm': param_values.get('volm', 0.0),
-                        # Rolling flows
-                        'valuebs_5m': param_values.get('valuebs_5m', 0.0),
-                        'volmbs_5m': param_values.get('volmbs_5m', 0.0),
-                        'valuebs_15m': param_values.get('valuebs_15m', 0.0),
-                        'volmbs_15m': param_values.get('volmbs_15m', 0.0),
-                        'valuebs_30m': param_values.get('valuebs_30m', 0.0),
-                        'volmbs_30m': param_values.get('volmbs_30m', 0.0),
-                        'valuebs_60m': param_values.get('valuebs_60m', 0.0),
-                        'volmbs_60m': param_values.get('volmbs_60m', 0.0),
-                        # Additional parameters from the schema
-                        **{k: v for k, v in param_values.items() if k not in [
-                            'oi', 'volatility', 'price', 'delta', 'gamma', 'theta', 'vega',
-                            'vanna', 'vomma', 'charm', 'dxoi', 'gxoi', 'vxoi', 'txoi',
-                            'vannaxoi', 'vommaxoi', 'charmxoi', 'value_bs', 'volm_bs', 'volm',
-                            'valuebs_5m', 'volmbs_5m', 'valuebs_15m', 'volmbs_15m',
-                            'valuebs_30m', 'volmbs_30m', 'valuebs_60m', 'volmbs_60m'
-                        ]}
-                    }
-                    
-                    contract = RawOptionsContractV2_5(**contract_data)
-                    contracts.append(contract)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error parsing contract row: {str(e)}")
+                    expiration = datetime.strptime(value, '%Y-%m-%d').date()
+                except ValueError:
                     continue
-            
-            self.logger.info(f"Successfully converted {len(contracts)} contracts for {symbol}")
-            return contracts
-            
+                if dte_min <= expiration_dte(expiration, now) <= dte_max:
+                    in_window.add(expiration)
+            if in_window != set(selection.dates):
+                self.logger.warning(f"📅 Expiration calendar for {symbol} does not match the chain response; re-learning it")
+                self.expiration_calendar.invalidate(symbol)
+
+    def clear_chain_cache(self, symbol: Optional[str] = None) -> None:
+        """Drops the cached chain for one symbol, or for all symbols."""
+        with self._chain_cache_lock:
+            if symbol is None:
+                self._chain_cache.clear()
+            else:
+                self._chain_cache.pop(symbol, None)
+
+    async def fetch_underlying(self, symbol: str) -> Optional[RawUnderlyingDataCombinedV2_5]:
+        """Fetch UNDERLYING_REQUIRED_PARAMS for a single symbol. API errors propagate to the caller."""
+        und_response = await self._run_in_pool(
+            'get_und',
+            self.convex_api.get_und,
+            symbols=[symbol],
+            params=UNDERLYING_REQUIRED_PARAMS
+        )
+        return self._convert_underlying_to_model(symbol, und_response)
+
+    async def fetch_underlying_batch(self, symbols: List[str]) -> Dict[str, RawUnderlyingDataCombinedV2_5]:
+        """
+        Fetch UNDERLYING_REQUIRED_PARAMS for many symbols with a single get_und request.
+
+        Args:
+            symbols: Ticker symbols to fetch (e.g. intraday_collector_settings.watched_tickers)
+
+        Returns:
+            Mapping of symbol -> underlying model for every symbol present in the response.
+        """
+        if not self.authenticated or not self.convex_api:
+            self.logger.error("ConvexValue API not authenticated or initialized")
+            return {}
+        if not symbols:
+            return {}
+
+        try:
+            self.logger.info(f"🔄 Fetching ConvexValue underlying snapshot for {len(symbols)} symbols...")
+            und_response = await self._run_in_pool(
+                'get_und_batch',
+                self.convex_api.get_und,
+                symbols=list(symbols),
+                params=UNDERLYING_REQUIRED_PARAMS
+            )
+            snapshot = self._convert_underlying_rows_to_models(list(symbols), und_response)
+            self.logger.info(f"✅ Underlying snapshot contains {len(snapshot)}/{len(symbols)} symbols")
+            return snapshot
         except Exception as e:
-            self.logger.error(f"Error converting chain data for {symbol}: {str(e)}")
-            return []
+            self.logger.error(f"❌ Error fetching underlying snapshot for {symbols}: {str(e)}")
+            return {}
 
-    async def fetch_chain_and_underlying(self, session, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20) -> Tuple[Optional[List[RawOptionsContractV2_5]], Optional[RawUnderlyingDataCombinedV2_5]]:
+    async def fetch_chain_and_underlying(self, session, symbol: str, dte_min: int = 0, dte_max: int = 45, price_range_percent: int = 20,
+                                         underlying: Optional[Union[RawUnderlyingDataCombinedV2_5, "asyncio.Future"]] = None,
+                                         as_frame: bool = False) -> Tuple[Optional[Union[List[RawOptionsContractV2_5], pd.DataFrame]], Optional[RawUnderlyingDataCombinedV2_5]]:
         """
         Fetch both options chain and underlying data for a symbol using ConvexValue API.
         Note: session parameter is kept for compatibility but not used with ConvexValue API.
@@ -258,101 +419,121 @@ class ConvexValueDataFetcherV2_5:
             dte_min: Minimum days to expiration filter
             dte_max: Maximum days to expiration filter
             price_range_percent: Strike price range percentage around current price
+            underlying: Pre-fetched underlying model (e.g. from fetch_underlying_batch), or a
+                future resolving to one (e.g. a hedged fetch_underlying call already in flight);
+                when given, the per-symbol get_und request is skipped
+            as_frame: Return the chain as the parsed DataFrame instead of building
+                RawOptionsContractV2_5 models
         """
         if not self.authenticated or not self.convex_api:
             self.logger.error("ConvexValue API not authenticated or initialized")
             return None, None
         
-        executor = None
         try:
             self.logger.info(f"🔄 Fetching ConvexValue data for {symbol} with DTE range [{dte_min}, {dte_max}] and price range ±{price_range_percent}%...")
-            
-            # Fetch underlying data in thread executor (since ConvexValue API is synchronous)
+
+            # Convert price range percentage to decimal (e.g., 20% -> 0.20)
+            price_range_decimal = price_range_percent / 100.0
+
+            # Expirations to request: the exact indices inside the DTE window when the calendar
+            # knows them, otherwise an estimate based on weekly expirations (and learn from the result)
+            selection = self.expiration_calendar.select(symbol, dte_min, dte_max)
+            if selection is not None:
+                wanted_exps = tuple(selection.indices)
+            else:
+                max_expirations = min(10, max(3, (dte_max // 7) + 1))
+                wanted_exps = tuple(range(1, max_expirations + 1))
+
+            # Serve narrower windows from the widest recent chain; only grow the request when needed
+            cached_chain = self._get_cached_chain(symbol, wanted_exps, price_range_decimal) if wanted_exps else None
+            if not wanted_exps:
+                self.logger.info(f"📅 No {symbol} expirations fall inside DTE [{dte_min}, {dte_max}]; skipping chain request")
+                chain_task = asyncio.sleep(0, result=self._convert_chain_to_frame(symbol, []))
+            elif cached_chain is not None:
+                chain_task = asyncio.sleep(0, result=cached_chain.frame)
+                self.logger.info(f"♻️ Serving {symbol} chain from cache (exps={cached_chain.exps}, rng={cached_chain.rng})")
+            else:
+                request_exps, request_rng = self._widen_chain_request(symbol, wanted_exps, price_range_decimal)
+                self.logger.info(f"🔍 ConvexValue API call: symbol={symbol}, exps={request_exps}, rng={request_rng}")
+                chain_task = self._run_in_pool(
+                    'get_chain_as_rows',
+                    self.convex_api.get_chain_as_rows,
+                    symbol,
+                    params=OPTIONS_CHAIN_REQUIRED_PARAMS,
+                    exps=list(request_exps),  # Only the expirations we need
+                    rng=request_rng  # Control panel price range (or the wider cached one)
+                )
+
+            self.logger.debug(f"Requesting underlying data and options chain for {symbol}")
+
+            # Both legs are independent, so run them concurrently on the shared pool
+            if isinstance(underlying, asyncio.Future):
+                und_task = underlying
+            elif underlying is not None:
+                und_task = asyncio.sleep(0, result=underlying)
+            else:
+                und_task = self.fetch_underlying(symbol)
+            und_response, chain_response = await asyncio.gather(und_task, chain_task, return_exceptions=True)
+
             underlying_data = None
-            try:
-                self.logger.debug(f"Requesting underlying data for {symbol}")
-                
-                # Run synchronous ConvexValue API call in thread executor
-                def fetch_underlying():
-                    if self.convex_api is not None:
-                        return self.convex_api.get_und(
-                            symbols=[symbol], 
-                            params=UNDERLYING_REQUIRED_PARAMS
-                        )
-                    return None
-                
-                loop = asyncio.get_event_loop()
-                executor = concurrent.futures.ThreadPoolExecutor()
-                und_response = await loop.run_in_executor(executor, fetch_underlying)
-                
-                underlying_data = self._convert_underlying_to_model(symbol, und_response)
+            if isinstance(und_response, BaseException):
+                self.logger.error(f"❌ Error fetching underlying data for {symbol}: {str(und_response)}")
+            elif underlying is not None:
+                underlying_data = und_response
+                self.logger.debug(f"Using pre-fetched underlying data for {symbol}")
+            else:
+                underlying_data = und_response
                 if underlying_data:
                     self.logger.info(f"✅ Successfully fetched underlying data for {symbol}")
                 else:
                     self.logger.warning(f"⚠️ No underlying data returned for {symbol}")
-            except Exception as e:
-                self.logger.error(f"❌ Error fetching underlying data for {symbol}: {str(e)}")
-            
-            # Fetch options chain data in thread executor
-            chain_data = None
-            try:
-                self.logger.debug(f"Requesting options chain for {symbol} with DTE range [{dte_min}, {dte_max}] and price range ±{price_range_percent}%")
-                
-                def fetch_chain():
-                    if self.convex_api is not None:
-                        # Convert price range percentage to decimal (e.g., 20% -> 0.20)
-                        price_range_decimal = price_range_percent / 100.0
-                        
-                        # Calculate number of expirations to fetch based on DTE range
-                        # For now, we'll fetch more expirations and filter later
-                        # ConvexValue API doesn't directly support DTE filtering, so we'll get more data and filter
-                        max_expirations = min(10, max(3, (dte_max // 7) + 1))  # Estimate based on weekly expirations
-                        
-                        self.logger.info(f"🔍 ConvexValue API call: symbol={symbol}, exps={max_expirations}, rng={price_range_decimal}")
-                        
-                        return self.convex_api.get_chain_as_rows(
-                            symbol,
-                            params=OPTIONS_CHAIN_REQUIRED_PARAMS,
-                            exps=list(range(1, max_expirations + 1)),  # Get multiple expirations
-                            rng=price_range_decimal  # Use control panel price range
-                        )
-                    return None
-                
-                loop = asyncio.get_event_loop()
-                if executor is None:
-                    executor = concurrent.futures.ThreadPoolExecutor()
-                chain_response = await loop.run_in_executor(executor, fetch_chain)
-                
-                # Convert and filter the chain data
-                all_chain_data = self._convert_chain_to_models(symbol, {'data': chain_response})
-                
-                # Filter by DTE range if we have data
-                if all_chain_data:
-                    chain_data = [
-                        contract for contract in all_chain_data 
-                        if dte_min <= contract.dte_calc <= dte_max
-                    ]
-                    
-                    self.logger.info(f"✅ Successfully fetched {len(all_chain_data)} total contracts, {len(chain_data)} after DTE filtering [{dte_min}, {dte_max}] for {symbol}")
+
+            chain_data: Union[List[RawOptionsContractV2_5], pd.DataFrame] = []
+            if isinstance(chain_response, Exception):
+                self.logger.error(f"❌ Error fetching options chain for {symbol}: {str(chain_response)}")
+            else:
+                if not wanted_exps:
+                    full_df, cached_rng = chain_response, price_range_decimal
+                elif cached_chain is not None:
+                    full_df, cached_rng = chain_response, cached_chain.rng
+                else:
+                    # Parse the whole (superset) response once and keep it for narrower requests
+                    full_df, cached_rng = self._convert_chain_to_frame(symbol, chain_response), request_rng
+                    if not full_df.empty:
+                        self._store_cached_chain(symbol, request_exps, request_rng, full_df)
+                        self._learn_expirations(symbol, request_exps, full_df.attrs.get('expirations', []),
+                                                selection, dte_min, dte_max)
+
+                # Slice locally: DTE window always, strike band only if the cached range is wider
+                strike_min = strike_max = None
+                if price_range_decimal < cached_rng:
+                    price = getattr(underlying_data, 'price', None)
+                    if price:
+                        strike_min, strike_max = price * (1 - price_range_decimal), price * (1 + price_range_decimal)
+                    else:
+                        self.logger.debug(f"No underlying price for {symbol}; returning the cached ±{cached_rng:.0%} strike band")
+                chain_df = slice_chain_frame(full_df, dte_min=dte_min, dte_max=dte_max, strike_min=strike_min, strike_max=strike_max)
+
+                if not full_df.empty:
+                    if as_frame:
+                        # Never hand out the cached frame itself
+                        chain_data = chain_df.copy() if chain_df is full_df else chain_df
+                    else:
+                        chain_data = self.contracts_from_chain_frame(chain_df)
+                    self.logger.info(f"✅ Successfully fetched {len(full_df)} total contracts, {len(chain_df)} after DTE filtering [{dte_min}, {dte_max}] for {symbol}")
                 else:
                     self.logger.warning(f"⚠️ No options chain data returned for {symbol}")
-                    chain_data = []
-            except Exception as e:
-                self.logger.error(f"❌ Error fetching options chain for {symbol}: {str(e)}")
-                chain_data = []
-            
+                    if as_frame:
+                        chain_data = chain_df
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"ConvexValue latency stats: {self.get_latency_stats()}")
+
             return chain_data, underlying_data
-            
+
         except Exception as e:
             self.logger.error(f"❌ Critical error in ConvexValue data fetch for {symbol}: {str(e)}")
             return None, None
-        finally:
-            # CRITICAL FIX: Properly shutdown ThreadPoolExecutor to prevent 'futures after interpreter shutdown'
-            if executor is not None:
-                try:
-                    executor.shutdown(wait=True, cancel_futures=True)
-                except Exception as cleanup_error:
-                    self.logger.warning(f"Error during executor cleanup: {cleanup_error}")
 
     # Legacy method for compatibility
     async def authenticate(self, session) -> bool:
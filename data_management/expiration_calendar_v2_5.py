@@ -0,0 +1,128 @@
+# data_management/expiration_calendar_v2_5.py
+# EOTS v2.5 - PER-SYMBOL EXPIRATION CALENDAR
+#
+# Caches each symbol's listed expirations once per day and maps a DTE window to
+# the exact expiration dates (Tradier) or 1-based expiration indices
+# (ConvexValue `exps`), so fetchers only download expirations that survive filtering.
+
+import logging
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class ExpirationSelection(NamedTuple):
+    dates: List[date]    # expirations inside the DTE window, ascending
+    indices: List[int]   # matching 1-based positions among non-expired expirations
+
+
+class _CalendarEntry(NamedTuple):
+    as_of: date          # day the entry was built; entries expire at the date change
+    expirations: List[date]
+    complete: bool       # False when only the nearest expirations are known
+
+
+def expiration_dte(expiration: date, now: datetime) -> int:
+    """DTE using the same convention as the chain parser: whole days from now to expiration midnight."""
+    return (datetime.combine(expiration, datetime.min.time()) - now).days
+
+
+def _to_date(value: Union[date, str]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+class ExpirationCalendarV2_5:
+    """
+    Thread-safe, once-per-day cache of listed expirations per symbol.
+
+    A complete calendar comes from a listing endpoint (Tradier markets/options/expirations).
+    A partial one can be learned from a chain response that covered the nearest N
+    expirations; it can answer any window that ends before its last known expiration.
+    """
+
+    def __init__(self):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _CalendarEntry] = {}
+
+    def update(self, symbol: str, expirations: Iterable[Union[date, str]], complete: bool, today: Optional[date] = None) -> None:
+        """
+        Records expirations for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            expirations: Expiration dates (date objects or YYYY-MM-DD strings)
+            complete: True if this is the full listing; False if only the nearest expirations are known
+            today: Override for the current date (tests)
+        """
+        today = today or date.today()
+        dates = set()
+        for value in expirations:
+            try:
+                dates.add(_to_date(value))
+            except (TypeError, ValueError):
+                continue
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if not complete and entry is not None and entry.as_of == today:
+                # Partial knowledge only adds to what is already known today
+                dates |= set(entry.expirations)
+                complete = entry.complete
+            self._entries[symbol] = _CalendarEntry(today, sorted(dates), complete)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Forgets the calendar for one symbol, or for all symbols."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def has_complete(self, symbol: str, today: Optional[date] = None) -> bool:
+        """True if a full listing for the symbol was loaded today."""
+        today = today or date.today()
+        with self._lock:
+            entry = self._entries.get(symbol)
+        return entry is not None and entry.as_of == today and entry.complete
+
+    def listed(self, symbol: str, today: Optional[date] = None) -> List[date]:
+        """Today's known, not yet expired expirations for a symbol (ascending)."""
+        today = today or date.today()
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None or entry.as_of != today:
+            return []
+        return [exp for exp in entry.expirations if exp >= today]
+
+    def select(self, symbol: str, dte_min: int, dte_max: int, now: Optional[datetime] = None) -> Optional[ExpirationSelection]:
+        """
+        Maps a DTE window to expiration dates and 1-based indices.
+
+        Returns:
+            The selection, or None if today's calendar is missing or too short to answer exactly.
+        """
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None or entry.as_of != now.date():
+            return None
+
+        listed = [exp for exp in entry.expirations if exp >= now.date()]
+        if not entry.complete and (not listed or expiration_dte(listed[-1], now) < dte_max):
+            # A later, not yet known expiration could still fall inside the window
+            return None
+
+        dates: List[date] = []
+        indices: List[int] = []
+        for position, expiration in enumerate(listed, start=1):
+            dte = expiration_dte(expiration, now)
+            if dte_min <= dte <= dte_max:
+                dates.append(expiration)
+                indices.append(position)
+        return ExpirationSelection(dates, indices)
@@ -0,0 +1,119 @@
+# data_management/flow_window_accumulator_v2_5.py
+# EOTS v2.5 - STREAMING MULTI-WINDOW NET FLOW ACCUMULATOR
+#
+# Net value and volume flow of one symbol in fixed time buckets (one minute by
+# default) on a ring covering the longest window. The flow of each cycle is the
+# change of the underlying's cumulative value_bs / volm_bs totals since the
+# previous cycle; it is added to the current bucket and to a running sum per
+# window. When time moves into a new bucket, the bucket falling out of each
+# window is subtracted from that window's sum, so adding flow and reading a
+# 5/15/30/60 minute sum are O(1) whatever the cycle rate. Rolling window sums
+# supplied by the data feed (the chain's valuebs_5m ... volmbs_60m columns) take
+# precedence over the bucketed sums for the windows they cover.
+
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+FLOW_WINDOW_MINUTES = (5, 15, 30, 60)
+
+
+class FlowWindowAccumulatorV2_5:
+    """
+    Windowed net (value, volume) flow sums of one symbol over the trailing
+    `windows` minutes, fed with the cumulative flow totals of each cycle.
+
+    A window is only reported once the deltas cover all of it (or the feed supplied
+    it), so callers can tell a warming-up window from a quiet one. The totals are
+    session-cumulative: a new trading day starts the accumulator afresh.
+    """
+
+    def __init__(self, windows: Sequence[int] = FLOW_WINDOW_MINUTES, bucket_seconds: int = 60):
+        if not windows or min(windows) <= 0 or bucket_seconds <= 0:
+            raise ValueError("windows and bucket_seconds must be positive")
+        if any(minutes * 60 % bucket_seconds for minutes in windows):
+            raise ValueError("every window must be a whole number of buckets")
+        self.windows = tuple(sorted(set(int(minutes) for minutes in windows)))
+        self.bucket_seconds = bucket_seconds
+        self._lengths = np.array([minutes * 60 // bucket_seconds for minutes in self.windows], dtype=np.int64)
+        self._buckets = np.zeros((int(self._lengths.max()), 2), dtype=np.float64)
+        self._sums = np.zeros((len(self.windows), 2), dtype=np.float64)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets all flow and the baseline totals."""
+        self._buckets[:] = 0.0
+        self._sums[:] = 0.0
+        self._current: Optional[int] = None    # absolute index of the newest bucket
+        self._started: Optional[int] = None    # bucket of the baseline totals
+        self._last_totals: Optional[Tuple[float, float]] = None
+        self._last_day = None
+        self._rolling: Dict[int, Tuple[float, float]] = {}
+
+    def _advance(self, bucket: int) -> None:
+        """Moves the newest bucket forward to `bucket`, evicting what leaves each window."""
+        if bucket - self._current >= len(self._buckets):
+            # Nothing in the ring is still inside any window
+            self._buckets[:] = 0.0
+            self._sums[:] = 0.0
+        else:
+            slots = len(self._buckets)
+            for step in range(self._current + 1, bucket + 1):
+                self._sums -= self._buckets[(step - self._lengths) % slots]
+                self._buckets[step % slots] = 0.0
+        self._current = bucket
+
+    def add(self, timestamp: float, value_flow: float, volume_flow: float) -> None:
+        """Adds flow at a time (epoch seconds); flow older than the newest bucket is counted in it."""
+        bucket = int(timestamp // self.bucket_seconds)
+        if self._current is None:
+            self._current = self._started = bucket
+        elif bucket > self._current:
+            self._advance(bucket)
+        flow = np.array([value_flow, volume_flow], dtype=np.float64)
+        self._buckets[self._current % len(self._buckets)] += flow
+        self._sums += flow
+
+    def observe(self, timestamp: float, value_total: float, volume_total: float,
+                rolling: Optional[Mapping[int, Tuple[float, float]]] = None) -> None:
+        """
+        Records one cycle: the cumulative net value and volume flow totals at `timestamp`
+        (epoch seconds) and, when the feed has them, its own rolling (value, volume) sums
+        by window minutes. The first cycle of a day only sets the baseline.
+        """
+        day = datetime.fromtimestamp(timestamp).date()
+        if self._last_day is not None and day != self._last_day:
+            self.reset()
+        self._last_day = day
+        totals = (float(value_total), float(volume_total))
+        if self._last_totals is None or not np.isfinite(totals).all():
+            # Time still moves on; a missing total keeps the previous baseline
+            self.add(timestamp, 0.0, 0.0)
+            if np.isfinite(totals).all():
+                self._last_totals = totals
+        else:
+            self.add(timestamp, totals[0] - self._last_totals[0], totals[1] - self._last_totals[1])
+            self._last_totals = totals
+        self._rolling = {int(minutes): (float(value), float(volume))
+                         for minutes, (value, volume) in (rolling or {}).items()}
+
+    def covered_minutes(self) -> float:
+        """Minutes of flow deltas held since the baseline."""
+        if self._current is None:
+            return 0.0
+        return (self._current - self._started) * self.bucket_seconds / 60.0
+
+    def windows_available(self) -> Dict[int, Tuple[float, float]]:
+        """
+        (net value flow, net volume flow) of each window that is known: the feed's own
+        rolling sum from the latest cycle, else the bucketed sum once it spans the window.
+        """
+        covered = self.covered_minutes()
+        available = {}
+        for position, minutes in enumerate(self.windows):
+            if minutes in self._rolling:
+                available[minutes] = self._rolling[minutes]
+            elif covered >= minutes:
+                available[minutes] = (float(self._sums[position, 0]), float(self._sums[position, 1]))
+        return available
@@ -8,19 +8,22 @@ import pandas as pd
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from data_management.database_manager_v2_5 import DatabaseManagerV2_5
+from data_management.ohlcv_bar_store_v2_5 import OHLCVBarStoreV2_5, OHLCV_COLUMNS
 
 logger = logging.getLogger(__name__)
 
 class HistoricalDataManagerV2_5:
     """
     Manages the retrieval of historical market data.
-    This version simulates functionality by returning empty data structures, allowing
-    downstream components like MetricsCalculator to run without a live database.
+    Daily OHLCV bars are served from a local on-disk bar store that is topped up
+    incrementally from Tradier. Metric history is still simulated by returning
+    empty data structures, allowing downstream components like MetricsCalculator
+    to run without a live database.
     """
 
     def __init__(self, config_manager: ConfigManagerV2_5, db_manager: DatabaseManagerV2_5):
         self.logger = logger.getChild(self.__class__.__name__)
-        self.logger.warning("HISTORICAL DATA MANAGER IS IN STUBBED MODE. ALL QUERIES WILL RETURN EMPTY DATA.")
+        self.logger.warning("HISTORICAL DATA MANAGER IS IN STUBBED MODE FOR METRICS. METRIC QUERIES WILL RETURN EMPTY DATA.")
         self.config_manager = config_manager
         
         if not isinstance(db_manager, DatabaseManagerV2_5):
@@ -28,7 +31,12 @@ class HistoricalDataManagerV2_5:
             raise TypeError("db_manager must be an instance of DatabaseManagerV2_5")
             
         self.db_manager = db_manager
-        self.logger.info("HistoricalDataManagerV2_5 initialized in stubbed mode.")
+
+        # Completed daily bars live on disk; today's (still changing) bar is kept in memory only
+        store_path = self.config_manager.get_resolved_path("data_management_settings.ohlcv_store_path", "data/ohlcv_bars_v2_5.db")
+        self.ohlcv_store = OHLCVBarStoreV2_5(store_path)
+        self._live_bars: Dict[str, Dict[str, Any]] = {}
+        self.logger.info("HistoricalDataManagerV2_5 initialized (OHLCV bar store active, metrics stubbed).")
 
     def get_historical_metric(self, symbol: str, metric_name: str, lookback_days: int) -> Optional[pd.Series]:
         """
@@ -39,10 +47,51 @@ class HistoricalDataManagerV2_5:
 
     def get_historical_ohlcv(self, symbol: str, lookback_days: int) -> Optional[pd.DataFrame]:
         """
-        STUBBED: Returns an empty pandas DataFrame to prevent errors in downstream calculations.
+        Returns daily OHLCV bars for the last `lookback_days` calendar days from the local bar store,
+        with today's live bar appended when one has been fetched. Indexed by date.
+        """
+        today = date.today()
+        df = self.ohlcv_store.get_bars(symbol, start=today - timedelta(days=lookback_days), end=today - timedelta(days=1))
+        live_bar = self._live_bars.get(symbol)
+        if live_bar and live_bar.get('date') == today.isoformat():
+            live_df = pd.DataFrame([{col: live_bar.get(col, 0) for col in OHLCV_COLUMNS}],
+                                   index=pd.DatetimeIndex([pd.Timestamp(today)], name='date'))
+            df = live_df if df.empty else pd.concat([df, live_df])
+        return df
+
+    async def get_ohlcv_async(self, symbol: str, lookback_days: int, tradier_fetcher: Any) -> Optional[pd.DataFrame]:
         """
-        self.logger.debug(f"STUBBED: get_historical_ohlcv for '{symbol}' called. Returning empty DataFrame.")
-        return pd.DataFrame()
+        Tops up the bar store from Tradier and returns the lookback window.
+
+        Only the missing tail (day after the last stored bar through today) is requested when the
+        store already covers the lookback; otherwise the full window is requested once and persisted.
+        Completed bars (dated before today) are written to disk; today's bar is held in memory.
+        If the request fails, whatever is already stored is returned.
+        """
+        today = date.today()
+        start = today - timedelta(days=lookback_days)
+        coverage = self.ohlcv_store.get_coverage(symbol)
+        if coverage and coverage[0] <= start:
+            last_bar = coverage[1]
+            fetch_from = max(start, last_bar + timedelta(days=1)) if last_bar else start
+        else:
+            fetch_from = start
+
+        try:
+            result = await tradier_fetcher.fetch_historical_data(symbol, start_date=fetch_from)
+            if result and result.get('data'):
+                today_str = today.isoformat()
+                completed = [bar for bar in result['data'] if bar.get('date') and bar['date'] < today_str]
+                written = self.ohlcv_store.upsert_bars(symbol, completed, covered_from=fetch_from)
+                live = [bar for bar in result['data'] if bar.get('date') == today_str]
+                if live:
+                    self._live_bars[symbol] = live[-1]
+                self.logger.debug(f"OHLCV store for {symbol}: requested from {fetch_from}, stored {written} completed bars")
+        except Exception as e:
+            self.logger.warning(f"Could not top up OHLCV history for {symbol}, using stored bars: {e}")
+
+        df = self.get_historical_ohlcv(symbol, lookback_days)
+        return df if not df.empty else None
 
     def store_daily_eots_metrics(self, symbol: str, metric_date: date, metrics_data: Dict[str, Any]) -> None:
         """
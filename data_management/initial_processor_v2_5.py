@@ -8,7 +8,7 @@
 import logging
 import sys
 from datetime import datetime
-from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 try:
     import pandas as pd
@@ -23,12 +23,12 @@ except ImportError as e_dep:
 from utils.config_manager_v2_5 import ConfigManagerV2_5
 from data_models.eots_schemas_v2_5 import (
     UnprocessedDataBundleV2_5,
-    ProcessedDataBundleV2_5,
     RawOptionsContractV2_5,
-    ProcessedContractMetricsV2_5,
-    ProcessedStrikeLevelMetricsV2_5,
     ProcessedUnderlyingAggregatesV2_5
 )
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5
+from data_models.chain_frame_schema_v2_5 import chain_memory_bytes, compact_chain_frame, set_row_constants
+from utils.validation_policy_v2_5 import ValidationPolicyV2_5
 if TYPE_CHECKING:
     from core_analytics_engine.metrics_calculator_v2_5 import MetricsCalculatorV2_5
 
@@ -38,10 +38,10 @@ logger = logging.getLogger(__name__)
 class InitialDataProcessorV2_5:
     """
     Processes raw data bundles from data fetchers.
-    1. Converts Pydantic models to a DataFrame for processing.
+    1. Takes the fetched chain frame as-is (or converts Pydantic models to a DataFrame).
     2. Validates and prepares inputs.
     3. Invokes the MetricsCalculator to compute all system metrics.
-    4. Returns a comprehensive, processed data bundle as a Pydantic model.
+    4. Returns a comprehensive, processed data bundle that keeps the metric tables columnar.
     """
 
     def __init__(self, config_manager: ConfigManagerV2_5, metrics_calculator: 'MetricsCalculatorV2_5'):
@@ -62,6 +62,14 @@ class InitialDataProcessorV2_5:
 
         self.config_manager = config_manager
         self.metrics_calculator = metrics_calculator
+        # Metric tables are produced by our own calculator, so full per-row
+        # validation is configurable (full / construct / sampled)
+        self.validation_policy = ValidationPolicyV2_5.from_config(config_manager)
+        self.logger.info(f"Row validation policy: {self.validation_policy.mode} (sample {self.validation_policy.sample_percent}%)")
+        # Optional process-pool backend for the per-strike metric work (None = in-process).
+        # Imported here: core_analytics_engine imports this module (circular import)
+        from core_analytics_engine.metric_process_pool_v2_5 import MetricProcessPoolV2_5
+        self.metric_process_pool = MetricProcessPoolV2_5.from_config(config_manager)
 
         self.logger.info("InitialDataProcessorV2_5 Initialized successfully.")
 
@@ -87,46 +95,75 @@ class InitialDataProcessorV2_5:
         except Exception as e:
             raise ValueError(f"Failed to convert Pydantic models to DataFrame for {symbol}: {e}")
 
-        # Add essential context columns
-        df["underlying_price_at_fetch"] = float(underlying_data.get("price", np.nan))
-        df["processing_time_dt_obj"] = current_time
-        df["symbol"] = symbol.upper()
-
         # Ensure critical numeric types
         # Note: 'open_interest' is not in the v2.5 schema; removed from this loop.
         for col in ["strike"]:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        return df, underlying_data
+        return self._prepare_chain_frame(df, underlying_data, symbol, current_time), underlying_data
+
+    def _prepare_chain_frame(self, df: pd.DataFrame, underlying_data: Dict[str, Any], symbol: str,
+                             current_time: datetime) -> pd.DataFrame:
+        """Returns a compact copy of a chain frame with the cycle's constants attached (the input is left as is)."""
+        prep_logger = self.logger.getChild("PrepareDataFrame")
+        # Compact schema: float32 metrics, categorical labels. The essential context
+        # values are the same for every row, so they ride along as frame constants
+        # instead of being broadcast into per-row columns.
+        df = compact_chain_frame(df)
+        set_row_constants(
+            df,
+            underlying_price_at_fetch=float(underlying_data.get("price", np.nan)),
+            processing_time_dt_obj=current_time,
+            symbol=symbol.upper()
+        )
+        if prep_logger.isEnabledFor(logging.DEBUG):
+            prep_logger.debug(f"Compact chain frame for {symbol}: {chain_memory_bytes(df) / 1024:.0f} KiB")
+        return df
+
+    def _prepare_inputs(self, raw_data_bundle: Union[UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5],
+                        symbol: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """The (chain frame, underlying dict) calculator inputs of a raw bundle; a columnar bundle's frame skips the models."""
+        underlying_data = raw_data_bundle.underlying_data.model_dump()
+        if isinstance(raw_data_bundle, ColumnarUnprocessedDataBundleV2_5):
+            if raw_data_bundle.options_frame.empty:
+                self.logger.getChild("PrepareDataFrame").warning(f"Input options frame for {symbol} is empty.")
+                return pd.DataFrame(), underlying_data
+            return self._prepare_chain_frame(raw_data_bundle.options_frame, underlying_data, symbol,
+                                             raw_data_bundle.fetch_timestamp), underlying_data
+        return self._prepare_dataframe_from_models(
+            options_contracts=raw_data_bundle.options_contracts,
+            underlying_data=underlying_data,
+            symbol=symbol,
+            current_time=raw_data_bundle.fetch_timestamp
+        )
 
-    def process_data_and_calculate_metrics(self, raw_data_bundle: UnprocessedDataBundleV2_5, dte_max: int = 45) -> ProcessedDataBundleV2_5:
+    def process_data_and_calculate_metrics(self, raw_data_bundle: Union[UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5], dte_max: int = 45,
+                                           requested_metrics: Optional[List[str]] = None) -> ColumnarProcessedDataBundleV2_5:
         """
         Main processing method. Validates raw data, prepares it, and orchestrates metric calculation.
 
         Args:
-            raw_data_bundle: An UnprocessedDataBundleV2_5 object from the data fetching layer.
+            raw_data_bundle: An UnprocessedDataBundleV2_5 (or its columnar counterpart) from the data fetching layer.
             dte_max: Maximum DTE from control panel settings for DTE-aware calculations.
+            requested_metrics: Optional metric names to limit the calculation to (with their
+                dependencies); all metrics are calculated when None.
 
         Returns:
-            A ProcessedDataBundleV2_5 object containing all calculated metrics.
+            A ColumnarProcessedDataBundleV2_5 carrying the metric tables as DataFrames;
+            call to_pydantic() on it where a ProcessedDataBundleV2_5 is required.
         """
         proc_logger = self.logger.getChild("ProcessAndCalculate")
         
-        if not isinstance(raw_data_bundle, UnprocessedDataBundleV2_5):
+        if not isinstance(raw_data_bundle, (UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5)):
              raise TypeError("Input must be a valid UnprocessedDataBundleV2_5 object.")
 
         symbol = raw_data_bundle.underlying_data.symbol.upper()
         proc_logger.info(f"--- InitialProcessor: START for '{symbol}' at {raw_data_bundle.fetch_timestamp.isoformat()} ---")
 
         try:
-            # 1. Prepare DataFrame from Pydantic models
-            df_prepared, und_data_prepared = self._prepare_dataframe_from_models(
-                options_contracts=raw_data_bundle.options_contracts,
-                underlying_data=raw_data_bundle.underlying_data.model_dump(),
-                symbol=symbol,
-                current_time=raw_data_bundle.fetch_timestamp
-            )
+            # 1. Prepare the chain DataFrame (columnar bundles skip the Pydantic models)
+            df_prepared, und_data_prepared = self._prepare_inputs(raw_data_bundle, symbol)
 
             # 2. Invoke the Metrics Calculator with the correct method and arguments
             proc_logger.info(f"Invoking MetricsCalculator for {symbol}...")
@@ -134,32 +171,12 @@ class InitialDataProcessorV2_5:
                 df_strike_all_metrics,     # Strike-level data (first return value)
                 df_chain_all_metrics,      # Contract-level data (second return value)
                 und_data_enriched
-            ) = self.metrics_calculator.calculate_all_metrics(
-                options_df_raw=df_prepared,
-                und_data_api_raw=und_data_prepared,
-                dte_max=dte_max
-            )
+            ) = self._calculate_metrics({symbol: (df_prepared, und_data_prepared)}, dte_max, requested_metrics)[symbol]
             proc_logger.info(f"MetricsCalculator finished for {symbol}.")
 
-            # 3. Assemble the final ProcessedDataBundle Pydantic model
-            # This step inherently validates the output of the metrics calculator.
-            
-            # Handle case where strike data might be None
-            if df_strike_all_metrics is None:
-                proc_logger.warning("Strike-level data is None from metrics calculator")
-                df_strike_all_metrics = pd.DataFrame()
-            
-            # LIVE MODE VALIDATION: Debug data structures
-            if proc_logger.isEnabledFor(logging.DEBUG):
-                proc_logger.debug(f"Strike-level DataFrame shape: {df_strike_all_metrics.shape}")
-                proc_logger.debug(f"Contract-level DataFrame shape: {df_chain_all_metrics.shape}")
-            
-            processed_bundle = ProcessedDataBundleV2_5(
-                options_data_with_metrics=[ProcessedContractMetricsV2_5(**{str(k): v for k, v in row.items()}) for row in df_chain_all_metrics.to_dict('records')],
-                strike_level_data_with_metrics=[ProcessedStrikeLevelMetricsV2_5(**{str(k): v for k, v in row.items()}) for row in df_strike_all_metrics.to_dict('records')],
-                underlying_data_enriched=ProcessedUnderlyingAggregatesV2_5(**und_data_enriched if isinstance(und_data_enriched, dict) else und_data_enriched.model_dump()),
-                processing_timestamp=datetime.now(),
-                errors=raw_data_bundle.errors
+            # 3. Assemble the columnar bundle
+            processed_bundle = self._assemble_processed_bundle(
+                raw_data_bundle, df_strike_all_metrics, df_chain_all_metrics, und_data_enriched, proc_logger
             )
 
             proc_logger.info(f"--- InitialProcessor: END for '{symbol}'. Successfully created ProcessedDataBundle. ---")
@@ -170,4 +187,110 @@ class InitialDataProcessorV2_5:
             proc_logger.fatal(err_msg, exc_info=True)
             # In a real system, you might return a ProcessedDataBundle with an error state
             # For now, we re-raise to halt the cycle, as this indicates a severe issue.
-            raise RuntimeError(err_msg) from e
\ No newline at end of file
+            raise RuntimeError(err_msg) from e
+
+    def process_batch_and_calculate_metrics(self, raw_data_bundles: Dict[str, Union[UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5]], dte_max: int = 45,
+                                            requested_metrics: Optional[List[str]] = None) -> Dict[str, ColumnarProcessedDataBundleV2_5]:
+        """
+        Batch variant of process_data_and_calculate_metrics for several symbols (e.g. the watchlist).
+
+        Every symbol is prepared as usual, then all of them are calculated together:
+        in one MetricsCalculatorV2_5.calculate_metrics_batch() call, which vectorizes the
+        per-strike metrics across symbols, or spread over the metric worker processes
+        when the process pool is enabled.
+
+        Args:
+            raw_data_bundles: {symbol: UnprocessedDataBundleV2_5 or its columnar counterpart} from the data fetching layer.
+            dte_max: Maximum DTE from control panel settings for DTE-aware calculations.
+            requested_metrics: Optional metric names to limit the calculation to.
+
+        Returns:
+            {symbol: ColumnarProcessedDataBundleV2_5}. A symbol whose data fails to
+            prepare or assemble is logged and left out, so it does not stop the others.
+        """
+        proc_logger = self.logger.getChild("ProcessAndCalculateBatch")
+        prepared: Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]] = {}
+        for key, raw_data_bundle in raw_data_bundles.items():
+            if not isinstance(raw_data_bundle, (UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5)):
+                proc_logger.error(f"Skipping {key}: input is not an UnprocessedDataBundleV2_5")
+                continue
+            symbol = raw_data_bundle.underlying_data.symbol.upper()
+            try:
+                prepared[key] = self._prepare_inputs(raw_data_bundle, symbol)
+            except (ValidationError, ValueError, TypeError, KeyError) as e:
+                proc_logger.error(f"Critical data processing or validation error for '{symbol}': {e}", exc_info=True)
+
+        proc_logger.info(f"Invoking MetricsCalculator batch for {len(prepared)} symbols...")
+        calculated = self._calculate_metrics(prepared, dte_max, requested_metrics)
+
+        processed_bundles: Dict[str, ColumnarProcessedDataBundleV2_5] = {}
+        for key, (df_strike_all_metrics, df_chain_all_metrics, und_data_enriched) in calculated.items():
+            try:
+                processed_bundles[key] = self._assemble_processed_bundle(
+                    raw_data_bundles[key], df_strike_all_metrics, df_chain_all_metrics, und_data_enriched, proc_logger
+                )
+            except (ValidationError, ValueError, TypeError, KeyError) as e:
+                proc_logger.error(f"Could not assemble processed bundle for '{key}': {e}", exc_info=True)
+        proc_logger.info(f"--- InitialProcessor: batch END. {len(processed_bundles)}/{len(raw_data_bundles)} bundles created. ---")
+        return processed_bundles
+
+    def _calculate_metrics(self, prepared: Dict[str, Tuple[pd.DataFrame, Dict[str, Any]]], dte_max: int,
+                           requested_metrics: Optional[List[str]]) -> Dict[str, Tuple[Optional[pd.DataFrame], pd.DataFrame, Dict[str, Any]]]:
+        """
+        Runs the metrics calculator for prepared (chain, underlying) inputs.
+
+        In-process, several symbols go through one calculate_metrics_batch() call. With
+        the process pool, the per-strike and aggregate groups of every symbol run on the
+        worker processes in parallel and this process's calculator finishes each symbol
+        (intraday flow metrics, ATR, flow history); a symbol the pool could not
+        calculate is calculated entirely in-process.
+        """
+        if self.metric_process_pool is None:
+            if len(prepared) == 1:
+                key, (options_df, und_data) = next(iter(prepared.items()))
+                return {key: self.metrics_calculator.calculate_all_metrics(
+                    options_df_raw=options_df, und_data_api_raw=und_data,
+                    dte_max=dte_max, requested_metrics=requested_metrics)}
+            return self.metrics_calculator.calculate_metrics_batch(prepared, dte_max=dte_max,
+                                                                   requested_metrics=requested_metrics)
+        precomputed = self.metric_process_pool.calculate(prepared, requested_metrics)
+        return {
+            key: self.metrics_calculator.calculate_all_metrics(
+                options_df_raw=options_df, und_data_api_raw=und_data, dte_max=dte_max,
+                requested_metrics=requested_metrics, precomputed_groups=precomputed.get(key))
+            for key, (options_df, und_data) in prepared.items()
+        }
+
+    def shutdown(self) -> None:
+        """Stops the metric worker processes, if any. Safe to call more than once."""
+        if self.metric_process_pool is not None:
+            self.metric_process_pool.shutdown()
+
+    def _assemble_processed_bundle(self, raw_data_bundle: Union[UnprocessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5], df_strike_all_metrics: Optional[pd.DataFrame],
+                                   df_chain_all_metrics: Optional[pd.DataFrame], und_data_enriched: Any,
+                                   proc_logger: logging.Logger) -> ColumnarProcessedDataBundleV2_5:
+        """
+        Wraps the calculator's outputs in a columnar bundle. Contract and strike rows stay in
+        the calculator's DataFrames; per-row models are only built if a consumer asks.
+        """
+        # Handle case where strike data might be None
+        if df_strike_all_metrics is None:
+            proc_logger.warning("Strike-level data is None from metrics calculator")
+            df_strike_all_metrics = pd.DataFrame()
+        if df_chain_all_metrics is None:
+            proc_logger.warning("Contract-level data is None from metrics calculator")
+            df_chain_all_metrics = pd.DataFrame()
+        
+        # LIVE MODE VALIDATION: Debug data structures
+        if proc_logger.isEnabledFor(logging.DEBUG):
+            proc_logger.debug(f"Strike-level DataFrame shape: {df_strike_all_metrics.shape}")
+            proc_logger.debug(f"Contract-level DataFrame shape: {df_chain_all_metrics.shape}")
+        
+        return ColumnarProcessedDataBundleV2_5(
+            options_data=df_chain_all_metrics,
+            strike_data=df_strike_all_metrics,
+            underlying_data_enriched=ProcessedUnderlyingAggregatesV2_5(**und_data_enriched if isinstance(und_data_enriched, dict) else und_data_enriched.model_dump()),
+            processing_timestamp=datetime.now(),
+            errors=raw_data_bundle.errors,
+            validation_policy=self.validation_policy
+        )
\ No newline at end of file
@@ -0,0 +1,331 @@
+# data_management/intraday_metric_store_v2_5.py
+# EOTS v2.5 - IN-MEMORY INTRADAY METRIC HISTORY WITH WRITE-BEHIND PERSISTENCE
+#
+# Keeps the intraday history of each (symbol, metric) in a fixed-capacity NumPy
+# ring buffer of (timestamp, value) pairs. Appends are O(1) and never touch the
+# disk on the calculation path: they are queued and written to an append-only
+# daily log by a background thread. Every writing process (the dashboard, the
+# intraday collector) has its own log file, so processes never interleave or
+# replace each other's lines. On startup the process's log for the day is
+# replayed, so a crashed or restarted process resumes with its history (minus
+# at most one flush interval). Each buffer also keeps its values in sorted order, so the
+# percentile gauges are answered by binary search instead of a sort per call,
+# and rolling mean/std of the window are maintained incrementally.
+
+import atexit
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.rolling_stats_v2_5 import RollingStatsV2_5, WindowStats
+
+logger = logging.getLogger(__name__)
+
+_LOG_NAME = re.compile(r"intraday_metrics_(?:(?P<writer>.+)_)?(?P<day>\d{4}-\d{2}-\d{2})\.log$")
+
+
+def default_log_writer() -> str:
+    """Log writer name of this process: its launching script's name, stable across restarts."""
+    script = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else ""))[0]
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", script) or "python"
+
+
+def percentile_gauge(sorted_history: Sequence[float], current_value: float) -> float:
+    """
+    Gauge value (-3 to +3) of current_value ranked within sorted_history plus itself.
+
+    The current value is placed among the history (ties: the middle of the run of
+    equal values), its position is scaled to a 0..1 percentile and mapped linearly
+    so that 0% = -3, 50% = 0 and 100% = +3. Fewer than 2 history values (or a NaN
+    current value) give the neutral 0.0. O(log n) on an already sorted history.
+    """
+    n_history = len(sorted_history)
+    if n_history < 2 or current_value != current_value:
+        return 0.0
+    lower = bisect_left(sorted_history, current_value)
+    equal = bisect_right(sorted_history, current_value, lower) - lower + 1  # + the current value itself
+    position = lower + equal // 2
+    percentile = position / n_history  # n_history + 1 ranked values, positions 0..n_history
+    return float(max(-3.0, min(3.0, (percentile - 0.5) * 6.0)))
+
+
+class MetricRingBufferV2_5:
+    """
+    Fixed-capacity ring buffer of (epoch seconds, value) pairs; the oldest pair is overwritten when full.
+
+    A sorted copy of the (non-NaN) values is maintained on every append and eviction
+    for rank queries, and `stats` tracks their rolling mean and std.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._sorted: List[float] = []
+        self.stats = RollingStatsV2_5(capacity)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        if self._count == self.capacity:
+            evicted = float(self._values[self._next])
+            if evicted == evicted:
+                del self._sorted[bisect_left(self._sorted, evicted)]
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        value = float(value)
+        if value == value:  # NaN has no rank
+            insort(self._sorted, value)
+        self.stats.push(value)
+
+    def gauge(self, current_value: float) -> float:
+        """percentile_gauge() of current_value against the buffered values."""
+        return percentile_gauge(self._sorted, current_value)
+
+    def _ordered(self, data: np.ndarray) -> np.ndarray:
+        if self._count < self.capacity:
+            return data[:self._count].copy()
+        return np.concatenate((data[self._next:], data[:self._next]))
+
+    def values(self) -> np.ndarray:
+        """Values, oldest first (a copy)."""
+        return self._ordered(self._values)
+
+    def timestamps(self) -> np.ndarray:
+        """Epoch-second timestamps, oldest first (a copy)."""
+        return self._ordered(self._times)
+
+    def clear(self) -> None:
+        self._next = 0
+        self._count = 0
+        self._sorted = []
+        self.stats = RollingStatsV2_5(self.capacity)
+
+
+class IntradayMetricStoreV2_5:
+    """
+    Per-(symbol, metric) intraday ring buffers with an append-only daily log.
+
+    Each log line is a JSON array [symbol, metric, epoch_seconds, value]. The log
+    for a trading day is compacted (rewritten with only the retained pairs) when
+    it is recovered at startup, so it stays bounded across restarts.
+
+    `writer` names this process's log (default: the launching script's name);
+    processes sharing log_dir must use different writers, and each only reads,
+    compacts and removes its own files.
+    """
+
+    def __init__(self, log_dir: str, capacity: int = 200, flush_interval_seconds: float = 5.0,
+                 writer: Optional[str] = None):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = re.sub(r"[^A-Za-z0-9_-]+", "_", writer) if writer else default_log_writer()
+        self.capacity = capacity
+        self.flush_interval_seconds = flush_interval_seconds
+        self._lock = threading.RLock()
+        self._file_lock = threading.Lock()  # serializes log writes; never taken while holding _lock
+        self._buffers: Dict[Tuple[str, str], MetricRingBufferV2_5] = {}
+        self._pending: List[str] = []
+        self.trading_date = date.today()
+        self._closed = threading.Event()
+        self._recover()
+        self._flusher = threading.Thread(target=self._flush_loop, name="IntradayMetricFlush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # --- Buffers ---
+
+    def append(self, symbol: str, metric: str, value: float, timestamp: Optional[float] = None,
+               capacity: Optional[int] = None) -> MetricRingBufferV2_5:
+        """Records a value (timestamped now unless given) and queues it for the log."""
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        with self._lock:
+            self._roll_over_if_new_day()
+            buffer = self._buffer(symbol, metric, capacity)
+            buffer.append(timestamp, float(value))
+            self._pending.append(json.dumps([symbol, metric, timestamp, float(value)]))
+            return buffer
+
+    def values(self, symbol: str, metric: str) -> np.ndarray:
+        with self._lock:
+            buffer = self._buffers.get((symbol, metric))
+            return buffer.values() if buffer is not None else np.empty(0)
+
+    def series(self, symbol: str, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(epoch-second timestamps, values) of a metric's history, oldest first."""
+        with self._lock:
+            buffer = self._buffers.get((symbol, metric))
+            if buffer is None:
+                return np.empty(0), np.empty(0)
+            return buffer.timestamps(), buffer.values()
+
+    def history(self, symbol: str, metric: str) -> Tuple[List[datetime], List[float]]:
+        """Like series(), as datetimes and floats for plotting."""
+        timestamps, values = self.series(symbol, metric)
+        return [datetime.fromtimestamp(t) for t in timestamps], values.tolist()
+
+    def gauge(self, symbol: str, metric: str, current_value: float) -> float:
+        """Percentile gauge (-3..+3) of current_value against a metric's intraday history."""
+        with self._lock:
+            buffer = self._buffers.get((symbol, metric))
+            return buffer.gauge(current_value) if buffer is not None else 0.0
+
+    def stats(self, symbol: str, metric: str) -> WindowStats:
+        """Count, mean and population std of a metric's intraday history (count 0 if none)."""
+        with self._lock:
+            buffer = self._buffers.get((symbol, metric))
+            return buffer.stats.snapshot() if buffer is not None else WindowStats(0, float('nan'), float('nan'))
+
+    def zscore(self, symbol: str, metric: str, current_value: float,
+               min_count: int = 1, min_std: float = 0.0) -> float:
+        """
+        current_value's z-score against a metric's rolling intraday mean and std (O(1));
+        0.0 while the history has fewer than min_count values.
+        """
+        with self._lock:
+            buffer = self._buffers.get((symbol, metric))
+            if buffer is None or len(buffer.stats) < max(min_count, 1):
+                return 0.0
+            return float(buffer.stats.zscore(current_value, min_std))
+
+    def gauges(self, metric: str, current_values: Mapping[str, float]) -> Dict[str, float]:
+        """Percentile gauges of one metric for many symbols at once ({symbol: current value} -> {symbol: gauge})."""
+        with self._lock:
+            results = {}
+            for symbol, current_value in current_values.items():
+                buffer = self._buffers.get((symbol, metric))
+                results[symbol] = buffer.gauge(current_value) if buffer is not None else 0.0
+            return results
+
+    def peer_values(self, metric: str, exclude_symbol: str, min_count: int = 1) -> Optional[np.ndarray]:
+        """Values of the same metric from another symbol with at least min_count points, if any."""
+        with self._lock:
+            for (symbol, name), buffer in self._buffers.items():
+                if name == metric and symbol != exclude_symbol and len(buffer) >= min_count:
+                    return buffer.values()
+        return None
+
+    def _buffer(self, symbol: str, metric: str, capacity: Optional[int] = None) -> MetricRingBufferV2_5:
+        key = (symbol, metric)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = MetricRingBufferV2_5(capacity or self.capacity)
+            self._buffers[key] = buffer
+        return buffer
+
+    # --- Persistence ---
+
+    def _log_path(self, day: Optional[date] = None) -> Path:
+        return self.log_dir / f"intraday_metrics_{self.writer}_{(day or self.trading_date).isoformat()}.log"
+
+    def _recover(self) -> None:
+        """
+        Replays this writer's log of today into the buffers and compacts it. Logs of
+        earlier days (of any writer) are removed; other writers' logs of today are left alone.
+        """
+        for stale in self.log_dir.glob("intraday_metrics_*.log"):
+            match = _LOG_NAME.match(stale.name)
+            if match is None or stale == self._log_path():
+                continue
+            writer = match.group('writer')
+            if writer not in (None, self.writer) and match.group('day') >= self.trading_date.isoformat():
+                continue
+            try:
+                stale.unlink()
+            except OSError as e:
+                self.logger.warning(f"Could not remove stale intraday log {stale.name}: {e}")
+        path = self._log_path()
+        if not path.exists():
+            return
+        lines = 0
+        skipped = 0
+        with open(path, 'r') as f:
+            for line in f:
+                lines += 1
+                try:
+                    symbol, metric, timestamp, value = json.loads(line)
+                    self._buffer(symbol, metric).append(float(timestamp), float(value))
+                except (ValueError, TypeError):
+                    skipped += 1  # a torn last line from a crash mid-write
+        retained = sum(len(buffer) for buffer in self._buffers.values())
+        if retained < lines:
+            self._compact()
+        self.logger.info(f"♻️ Recovered {retained} intraday metric points for {len(self._buffers)} series from {path.name}"
+                         + (f" ({skipped} unreadable lines skipped)" if skipped else ""))
+
+    def _compact(self) -> None:
+        """Rewrites the day's log with exactly the buffered pairs (atomically)."""
+        path = self._log_path()
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            for (symbol, metric), buffer in self._buffers.items():
+                for timestamp, value in zip(buffer.timestamps(), buffer.values()):
+                    f.write(json.dumps([symbol, metric, float(timestamp), float(value)]) + '\n')
+        os.replace(tmp_path, path)
+
+    def flush(self) -> int:
+        """
+        Appends queued points to the day's log. Returns the number of points written.
+        The queue is only locked while it is swapped out, so appends never wait on the disk.
+        """
+        with self._file_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                path = self._log_path()
+            if not pending:
+                return 0
+            try:
+                with open(path, 'a') as f:
+                    f.write('\n'.join(pending) + '\n')
+            except OSError as e:
+                # Keep the points queued for the next attempt
+                with self._lock:
+                    if path == self._log_path():
+                        self._pending = pending + self._pending
+                self.logger.warning(f"Could not write intraday metric log: {e}")
+                return 0
+            return len(pending)
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def _roll_over_if_new_day(self) -> None:
+        today = date.today()
+        if today == self.trading_date:
+            return
+        # The previous day's history and its queued points are dropped with its log
+        previous = self._log_path()
+        self._buffers.clear()
+        self._pending = []
+        self.trading_date = today
+        try:
+            previous.unlink()
+        except OSError:
+            pass
+        self.logger.info(f"📅 Intraday metric history reset for {today.isoformat()}")
+
+    def close(self) -> None:
+        """Stops the background writer and flushes what is queued. Safe to call more than once."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self.flush()
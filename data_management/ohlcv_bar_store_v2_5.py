@@ -0,0 +1,120 @@
+# data_management/ohlcv_bar_store_v2_5.py
+# EOTS v2.5 - LOCAL DAILY OHLCV BAR STORE
+#
+# Persists completed daily bars per symbol in a small SQLite file so that the
+# analysis cycle only has to request the missing tail from the broker API, and
+# a process restart does not re-download history.
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class OHLCVBarStoreV2_5:
+    """
+    SQLite-backed store of completed daily OHLCV bars.
+
+    Besides the bars themselves, the store remembers the earliest date it has
+    been filled from for each symbol, so a lookback that is already covered
+    (weekends and holidays included) is never re-requested.
+    """
+
+    def __init__(self, db_path: str):
+        self.logger = logger.getChild(self.__class__.__name__)
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        # WAL lets the dashboard and the intraday collector share the file
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS daily_bars ("
+                " symbol TEXT NOT NULL, date TEXT NOT NULL,"
+                " open REAL, high REAL, low REAL, close REAL, volume INTEGER,"
+                " PRIMARY KEY (symbol, date))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS bar_coverage ("
+                " symbol TEXT PRIMARY KEY, start_date TEXT NOT NULL)"
+            )
+        self.logger.info(f"OHLCV bar store ready at {db_path}")
+
+    def get_coverage(self, symbol: str) -> Optional[tuple]:
+        """Returns (covered_from, last_bar_date) for a symbol, or None if nothing is stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT c.start_date, MAX(b.date) FROM bar_coverage c"
+                " LEFT JOIN daily_bars b ON b.symbol = c.symbol WHERE c.symbol = ?",
+                (symbol,)
+            ).fetchone()
+        if not row or row[0] is None:
+            return None
+        covered_from = date.fromisoformat(row[0])
+        last_bar = date.fromisoformat(row[1]) if row[1] else None
+        return covered_from, last_bar
+
+    def upsert_bars(self, symbol: str, bars: Iterable[Dict[str, Any]], covered_from: Optional[date] = None) -> int:
+        """
+        Inserts or replaces completed bars for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            bars: Dicts with 'date' (YYYY-MM-DD) and OHLCV keys
+            covered_from: Start of the requested range the bars came from; widens the coverage record
+
+        Returns:
+            Number of bars written.
+        """
+        rows = [
+            (symbol, str(bar['date']), float(bar.get('open', 0) or 0), float(bar.get('high', 0) or 0),
+             float(bar.get('low', 0) or 0), float(bar.get('close', 0) or 0), int(bar.get('volume', 0) or 0))
+            for bar in bars if bar.get('date')
+        ]
+        with self._lock, self._conn:
+            if rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO daily_bars (symbol, date, open, high, low, close, volume)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            if covered_from is not None:
+                self._conn.execute(
+                    "INSERT INTO bar_coverage (symbol, start_date) VALUES (?, ?)"
+                    " ON CONFLICT(symbol) DO UPDATE SET start_date = MIN(start_date, excluded.start_date)",
+                    (symbol, covered_from.isoformat())
+                )
+        return len(rows)
+
+    def get_bars(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """Returns stored bars as a DataFrame indexed by date (datetime64) with OHLCV columns."""
+        query = "SELECT date, open, high, low, close, volume FROM daily_bars WHERE symbol = ?"
+        params: list = [symbol]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            query += " AND date <= ?"
+            params.append(end.isoformat())
+        query += " ORDER BY date"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        df = pd.DataFrame(rows, columns=['date'] + OHLCV_COLUMNS)
+        df['date'] = pd.to_datetime(df['date'])
+        return df.set_index('date')
+
+    def close(self) -> None:
+        """Closes the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
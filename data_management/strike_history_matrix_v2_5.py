@@ -0,0 +1,98 @@
+# data_management/strike_history_matrix_v2_5.py
+# EOTS v2.5 - ROLLING STRIKE x TIME HISTORY OF A PER-STRIKE MEASURE
+#
+# One row per calculation cycle, one column per strike, in a fixed-depth NumPy
+# ring matrix. The strike grid follows the chain: strikes seen for the first
+# time gain a column (empty history), and strikes without any observation left
+# in the window are dropped. Per-strike mean and std over time are column
+# reductions of the matrix, so every strike is normalized against its own
+# history in one vectorized pass, and the matrix itself is the strike-by-time
+# heatmap of the measure.
+
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class StrikeHistoryMatrixV2_5:
+    """
+    The last `capacity` cycles of a per-strike measure, as a (time x strike) ring matrix.
+
+    NaN marks a strike that had no value in a cycle (not in that cycle's chain, or a
+    NaN value); statistics ignore those cells. Strikes are kept sorted.
+    """
+
+    def __init__(self, capacity: int = 100):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.strikes = np.empty(0, dtype=np.float64)
+        self._values = np.empty((capacity, 0), dtype=np.float64)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Number of cycles held."""
+        return self._count
+
+    def _positions(self, strikes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Column of each strike in the grid, and whether the strike is in it."""
+        if not len(self.strikes):
+            return np.zeros(len(strikes), dtype=np.intp), np.zeros(len(strikes), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.strikes, strikes), len(self.strikes) - 1)
+        return positions, self.strikes[positions] == strikes
+
+    def append(self, strikes, values, timestamp: Optional[float] = None) -> None:
+        """Records one cycle's values at their strikes (overwriting the oldest cycle when full)."""
+        strikes = np.asarray(strikes, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        _, found = self._positions(strikes)
+        if not found.all():
+            # New strikes: widen the grid, the history of the new columns is empty
+            grid = np.union1d(self.strikes, strikes)
+            widened = np.full((self.capacity, len(grid)), np.nan)
+            widened[:, np.searchsorted(grid, self.strikes)] = self._values
+            self.strikes, self._values = grid, widened
+        positions, _ = self._positions(strikes)
+        row = np.full(len(self.strikes), np.nan)
+        row[positions] = values
+        self._values[self._next] = row
+        self._timestamps[self._next] = time.time() if timestamp is None else float(timestamp)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        # Strikes that left the chain are dropped once their last value leaves the window
+        observed = ~np.isnan(self._values).all(axis=0)
+        if not observed.all():
+            self.strikes, self._values = self.strikes[observed], self._values[:, observed]
+
+    def column_stats(self, strikes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (count, mean, population std) of each given strike's history; count 0 and NaN
+        statistics for a strike not in the grid.
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        counts = np.zeros(len(strikes), dtype=np.int64)
+        means = np.full(len(strikes), np.nan)
+        stds = np.full(len(strikes), np.nan)
+        positions, found = self._positions(strikes)
+        if not found.any():
+            return counts, means, stds
+        history = self._values[:, positions[found]]
+        valid = ~np.isnan(history)
+        n = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(valid, history, 0.0).sum(axis=0) / n
+            deviations = np.where(valid, history - mean, 0.0)
+            std = np.sqrt((deviations * deviations).sum(axis=0) / n)
+        counts[found], means[found], stds[found] = n, mean, std
+        return counts, means, stds
+
+    def frame(self) -> pd.DataFrame:
+        """The history as a DataFrame, one row per cycle (oldest first, indexed by time) and one column per strike."""
+        order = (np.arange(self._count) + self._next - self._count) % self.capacity
+        index = pd.DatetimeIndex([datetime.fromtimestamp(t) for t in self._timestamps[order]], name='timestamp')
+        return pd.DataFrame(self._values[order], index=index, columns=pd.Index(self.strikes, name='strike'))
@@ -3,7 +3,7 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 import random
 
@@ -12,7 +12,8 @@ from pydantic import ValidationError
 from dotenv import load_dotenv
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
-from utils.async_resilience_v2_5 import async_retry
+from utils.async_resilience_v2_5 import async_retry, configure_provider
+from data_management.expiration_calendar_v2_5 import ExpirationCalendarV2_5, expiration_dte
 
 # The schema is not strictly needed here as this fetcher now returns a dict,
 # but it's good practice to keep the import for context.
@@ -26,8 +27,13 @@ class TradierDataFetcherV2_5:
     """
     Asynchronous data fetcher for the Tradier API, precisely aligned
     with the unabridged canonical parameter lists.
+
+    A single long-lived ClientSession (keep-alive connection pool with DNS cache)
+    is shared by every request. Call start()/close() from the event loop that
+    owns the fetcher; the async context manager is kept for ad-hoc use and only
+    closes sessions it opened itself.
     """
-    def __init__(self, config_manager: ConfigManagerV2_5):
+    def __init__(self, config_manager: ConfigManagerV2_5, expiration_calendar: Optional[ExpirationCalendarV2_5] = None):
 
         self.logger = logger.getChild(self.__class__.__name__)
         self.config_manager = config_manager
@@ -43,49 +49,110 @@ class TradierDataFetcherV2_5:
                 'Authorization': f'Bearer {self.api_key}',
                 'Accept': 'application/json'
             }
+        # Connection pool settings
+        self.connection_limit = int(self.config_manager.get_setting("data_fetcher_settings.tradier_connection_limit", 20) or 20)
+        self.connection_limit_per_host = int(self.config_manager.get_setting("data_fetcher_settings.tradier_connection_limit_per_host", 10) or 10)
+        self.dns_cache_ttl = int(self.config_manager.get_setting("data_fetcher_settings.tradier_dns_cache_ttl_seconds", 300) or 300)
+        self.keepalive_timeout = float(self.config_manager.get_setting("data_fetcher_settings.tradier_keepalive_timeout_seconds", 30.0) or 30.0)
+
+        # Shared rate limiter / circuit breaker for every Tradier request in this process
+        self.provider_guard = configure_provider(
+            "tradier",
+            rate=float(self.config_manager.get_setting("data_fetcher_settings.tradier_rate_limit_per_second", 2.0) or 2.0),
+            burst=int(self.config_manager.get_setting("data_fetcher_settings.tradier_rate_limit_burst", 5) or 5),
+            failure_threshold=int(self.config_manager.get_setting("data_fetcher_settings.circuit_breaker_failure_threshold", 5) or 5),
+            recovery_timeout=float(self.config_manager.get_setting("data_fetcher_settings.circuit_breaker_recovery_seconds", 30.0) or 30.0)
+        )
+
+        # Per-symbol expiration calendar (shared with the ConvexValue fetcher when injected)
+        self.expiration_calendar = expiration_calendar or ExpirationCalendarV2_5()
+
         self.session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._persistent = False
         self.logger.info("TradierDataFetcherV2_5 initialized.")
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Builds a ClientSession backed by a keep-alive connection pool with DNS caching."""
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled session, (re)creating it if missing, closed or bound to another loop."""
+        loop = asyncio.get_running_loop()
+        if self.session is not None and not self.session.closed and self._session_loop is not loop:
+            # aiohttp sessions cannot be used across event loops
+            self.logger.warning("Tradier session belongs to a different event loop; opening a new one.")
+            self.session = None
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+            self._session_loop = loop
+            self.logger.debug(f"Opened Tradier connection pool (limit={self.connection_limit}, per_host={self.connection_limit_per_host})")
+        return self.session
+
+    async def start(self) -> None:
+        """Opens the long-lived connection pool. Subsequent context-manager use will not close it."""
+        await self._ensure_session()
+        self._persistent = True
+        self.logger.info("🔌 Tradier connection pool started.")
 
+    async def close(self) -> None:
+        """Closes the connection pool."""
+        self._persistent = False
+        if self.session is not None:
+            if not self.session.closed:
+                await self.session.close()
+            self.session = None
+            self._session_loop = None
+            self.logger.info("🔌 Tradier connection pool closed.")
 
     async def __aenter__(self):
         """Async context manager entry."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        await self._ensure_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Async context manager exit. Leaves a started (persistent) pool open."""
+        if not self._persistent:
+            await self.close()
 
     def _parse_chain_response(self, json_payload: Dict[str, Any]) -> List[RawOptionsContractV2_5]:
         """Parses the options/chain response into a list of Pydantic models."""
         parsed_contracts = []
-        options = json_payload.get('options', {}).get('option', [])
-        
+        options = (json_payload.get('options') or {}).get('option', [])
+        if isinstance(options, dict):
+            options = [options]  # Tradier returns a bare object for single-contract chains
+
         if not isinstance(options, list):
             self.logger.error(f"Expected 'options.option' in chain response to be a list, got {type(options)}.")
             return []
 
+        now = datetime.now()
         for contract_data in options:
             try:
-                # Convert Tradier's snake_case to our camelCase format
+                # Map Tradier fields onto the same RawOptionsContractV2_5 fields the ConvexValue parser fills
+                greeks = contract_data.get('greeks') or {}
+                expiration = datetime.strptime(contract_data.get('expiration_date', ''), '%Y-%m-%d').date()
                 contract_dict = {
                     'contract_symbol': contract_data.get('symbol'),
-                    'strike': float(contract_data.get('strike', 0)),
-                    'opt_kind': contract_data.get('option_type', '').lower(),
-                    'expiration_date': datetime.strptime(contract_data.get('expiration_date', ''), '%Y-%m-%d').date(),
-                    'price': float(contract_data.get('last', 0)),
-                    'volatility': float(contract_data.get('greeks', {}).get('smv_vol', 0)),
-                    'multiplier': 100,  # Standard for US options
-                    'oi': int(contract_data.get('open_interest', 0)),
-                    'delta': float(contract_data.get('greeks', {}).get('delta', 0)),
-                    'gamma': float(contract_data.get('greeks', {}).get('gamma', 0)),
-                    'theta': float(contract_data.get('greeks', {}).get('theta', 0)),
-                    'vega': float(contract_data.get('greeks', {}).get('vega', 0))
+                    'strike': float(contract_data.get('strike') or 0),
+                    'opt_kind': (contract_data.get('option_type') or '').lower(),
+                    'dte_calc': expiration_dte(expiration, now),
+                    'raw_price': float(contract_data.get('last') or 0),
+                    'iv': float(greeks.get('mid_iv') or greeks.get('smv_vol') or 0),
+                    'multiplier': float(contract_data.get('contract_size') or 100),  # Standard for US options
+                    'open_interest': float(contract_data.get('open_interest') or 0),
+                    'volm': float(contract_data.get('volume') or 0),
+                    'delta_contract': float(greeks.get('delta') or 0),
+                    'gamma_contract': float(greeks.get('gamma') or 0),
+                    'theta_contract': float(greeks.get('theta') or 0),
+                    'vega_contract': float(greeks.get('vega') or 0)
                 }
 
                 validated_contract = RawOptionsContractV2_5(**contract_dict)
@@ -117,7 +184,7 @@ class TradierDataFetcherV2_5:
             self.logger.error(f"Pydantic validation failed for Tradier underlying data: {e}", exc_info=True)
             return None
 
-    @async_retry(max_attempts=3, backoff_factor=0.7)
+    @async_retry(max_attempts=3, backoff_factor=0.7, provider="tradier")
     async def _fetch_raw_data(self, session: aiohttp.ClientSession, endpoint: str, params: Dict[str, Any]) -> Dict:
         """Private helper to perform a single resilient GET request."""
         if not session:
@@ -137,13 +204,10 @@ class TradierDataFetcherV2_5:
     async def fetch_underlying_quote(self, symbol: str) -> Optional[RawUnderlyingDataCombinedV2_5]:
         """Fetches the underlying quote data for a given symbol."""
         
-        # Make API call
-        if not self.session:
-            raise RuntimeError("No active session available. Use async with context manager.")
-            
         try:
+            session = await self._ensure_session()
             underlying_data = await self._fetch_raw_data(
-                self.session,
+                session,
                 "markets/quotes",
                 {'symbols': symbol}
             )
@@ -152,15 +216,18 @@ class TradierDataFetcherV2_5:
             self.logger.error(f"Error fetching underlying quote for {symbol}: {e}", exc_info=True)
             return None
 
-    async def fetch_historical_data(self, symbol: str, days: int = 30) -> Optional[Dict[str, Any]]:
-        """Fetches historical OHLCV data for technical analysis."""
-        if not self.session:
-            raise RuntimeError("No active session available. Use async with context manager.")
-            
+    async def fetch_historical_data(self, symbol: str, days: int = 30, start_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fetches historical OHLCV data for technical analysis.
+        When start_date is given it takes precedence over `days` (used to request only a missing tail).
+        """
         try:
+            session = await self._ensure_session()
+
             # Calculate start date
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+            if start_date is None:
+                start_date = end_date - timedelta(days=days)
             
             params = {
                 'symbol': symbol,
@@ -170,7 +237,7 @@ class TradierDataFetcherV2_5:
             }
             
             historical_data = await self._fetch_raw_data(
-                self.session,
+                session,
                 "markets/history",
                 params
             )
@@ -206,56 +273,71 @@ class TradierDataFetcherV2_5:
             self.logger.error(f"Error fetching historical data for {symbol}: {e}", exc_info=True)
             return None
 
-    async def fetch_chain_and_underlying(self, symbol: str) -> Tuple[Optional[List[RawOptionsContractV2_5]], Optional[RawUnderlyingDataCombinedV2_5]]:
-        """Concurrently fetches data from options/chain and markets/quotes."""
-        
-        # Make API calls
-        if not self.session:
-            raise RuntimeError("No active session available. Use async with context manager.")
-            
-        # Get expiration dates for the chain request
-        expirations = await self._fetch_raw_data(
-            self.session,
-            "markets/options/expirations",
-            {'symbol': symbol, 'includeAllRoots': 'true'}
-        )
-        
-        if not expirations or 'expirations' not in expirations:
-            self.logger.error("Failed to fetch expiration dates")
+    async def fetch_expirations(self, symbol: str) -> List[date]:
+        """Returns the symbol's listed expirations, fetched from Tradier at most once per day."""
+        if not self.expiration_calendar.has_complete(symbol):
+            session = await self._ensure_session()
+            expirations = await self._fetch_raw_data(
+                session,
+                "markets/options/expirations",
+                {'symbol': symbol, 'includeAllRoots': 'true'}
+            )
+            if not expirations or not expirations.get('expirations'):
+                self.logger.error("Failed to fetch expiration dates")
+                return []
+            expiration_dates = expirations['expirations'].get('date') or []
+            if not isinstance(expiration_dates, list):
+                expiration_dates = [expiration_dates]
+            self.expiration_calendar.update(symbol, expiration_dates, complete=True)
+        return self.expiration_calendar.listed(symbol)
+
+    async def fetch_chain_and_underlying(self, symbol: str, dte_min: Optional[int] = None,
+                                         dte_max: Optional[int] = None) -> Tuple[Optional[List[RawOptionsContractV2_5]], Optional[RawUnderlyingDataCombinedV2_5]]:
+        """
+        Concurrently fetches data from options/chain and markets/quotes.
+        With a DTE window only the expirations inside it are requested; otherwise the next 4.
+        The chains of the expirations are fetched concurrently and concatenated; the
+        contracts are None only if every chain request failed.
+        """
+        session = await self._ensure_session()
+
+        # Expiration dates for the chain request come from the once-per-day calendar
+        if dte_min is not None and dte_max is not None:
+            await self.fetch_expirations(symbol)
+            selection = self.expiration_calendar.select(symbol, dte_min, dte_max)
+            expiration_dates = [d.isoformat() for d in selection.dates] if selection else []
+        else:
+            expiration_dates = [d.isoformat() for d in (await self.fetch_expirations(symbol))[:4]]
+
+        if not expiration_dates:
+            self.logger.error(f"No expirations available for {symbol} in the requested window")
             return None, None
-            
-        expiration_dates = expirations['expirations']['date']
-        if not isinstance(expiration_dates, list):
-            expiration_dates = [expiration_dates]
-            
-        # Use the next 4 expiration dates
-        expiration_dates = expiration_dates[:4]
-        
-        chain_params = {
-            'symbol': symbol,
-            'expiration': ','.join(expiration_dates),
-            'greeks': 'true'
-        }
-        
-        und_params = {'symbols': symbol}
 
-        chain_task = self._fetch_raw_data(self.session, "markets/options/chains", chain_params)
-        und_task = self._fetch_raw_data(self.session, "markets/quotes", und_params)
-        
-        results = await asyncio.gather(chain_task, und_task, return_exceptions=True)
+        # markets/options/chains takes a single expiration: one request per expiration,
+        # each passing the shared Tradier rate limiter / circuit breaker in _fetch_raw_data
+        chain_tasks = [
+            self._fetch_raw_data(session, "markets/options/chains",
+                                 {'symbol': symbol, 'expiration': expiration, 'greeks': 'true'})
+            for expiration in expiration_dates
+        ]
+        und_task = self._fetch_raw_data(session, "markets/quotes", {'symbols': symbol})
+
+        *chain_results, und_result = await asyncio.gather(*chain_tasks, und_task, return_exceptions=True)
 
-        chain_result, und_result = results
-        
         parsed_contracts = None
-        if isinstance(chain_result, dict):
-            parsed_contracts = self._parse_chain_response(chain_result)
-        elif isinstance(chain_result, Exception):
-            self.logger.error(f"Failed to fetch Tradier chain data: {chain_result}", exc_info=True)
+        for expiration, chain_result in zip(expiration_dates, chain_results):
+            if isinstance(chain_result, dict):
+                if parsed_contracts is None:
+                    parsed_contracts = []
+                parsed_contracts.extend(self._parse_chain_response(chain_result))
+            elif isinstance(chain_result, BaseException):
+                self.logger.error(f"Failed to fetch Tradier chain data for {symbol} {expiration}: {chain_result}",
+                                  exc_info=chain_result)
 
         parsed_underlying = None
         if isinstance(und_result, dict):
             parsed_underlying = self._parse_underlying_response(und_result)
-        elif isinstance(und_result, Exception):
+        elif isinstance(und_result, BaseException):
             self.logger.error(f"Failed to fetch Tradier underlying data: {und_result}", exc_info=True)
             
         return parsed_contracts, parsed_underlying
@@ -0,0 +1,96 @@
+# data_models/chain_frame_schema_v2_5.py
+# EOTS v2.5 - COMPACT DTYPE SCHEMA FOR OPTIONS CHAIN FRAMES
+#
+# Chain DataFrames built from dicts default to float64 for every Greek, exposure
+# and flow column and to Python-object strings for kinds and symbols. This module
+# declares the compact layout used across the pipeline and moves per-cycle
+# constants (symbol, fetch price, processing time) out of the per-row columns.
+
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns kept at float64: the strike is the groupby/join key and is compared
+# exactly against prices and other frames' strikes.
+CHAIN_FLOAT64_COLUMNS = frozenset({"strike"})
+
+# Low-cardinality labels stored as categoricals (integer codes + one copy of each label).
+CHAIN_CATEGORICAL_COLUMNS = frozenset({"opt_kind", "expiration", "symbol"})
+
+# Fixed categories for option kinds, so frames sliced from one chain and frames
+# parsed separately share the same dtype (and concat/compare without recoding).
+OPT_KIND_DTYPE = pd.CategoricalDtype(["call", "put"])
+
+# Integer columns with a known small range.
+CHAIN_INTEGER_COLUMNS: Dict[str, Any] = {"dte_calc": np.int16}
+
+# Values that are identical for every row of a cycle's chain. They live in
+# frame.attrs[ROW_CONSTANTS_ATTR] instead of being broadcast into columns.
+CHAIN_ROW_CONSTANTS = ("symbol", "underlying_price_at_fetch", "processing_time_dt_obj")
+ROW_CONSTANTS_ATTR = "row_constants"
+
+
+def row_constants(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Per-cycle constants attached to a chain frame (empty dict if none)."""
+    return dict(frame.attrs.get(ROW_CONSTANTS_ATTR) or {})
+
+
+def set_row_constants(frame: pd.DataFrame, **constants: Any) -> pd.DataFrame:
+    """Attaches per-cycle constants to a frame (in place) and drops any broadcast copies of them."""
+    merged = row_constants(frame)
+    merged.update(constants)
+    frame.attrs[ROW_CONSTANTS_ATTR] = merged
+    broadcast = [name for name in constants if name in frame.columns]
+    if broadcast:
+        frame.drop(columns=broadcast, inplace=True)
+    return frame
+
+
+def compact_chain_frame(frame: pd.DataFrame, float64_columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Returns a copy of the chain frame in the compact schema (attrs are preserved).
+
+    float64 columns become float32 except the ones in `float64_columns`
+    (CHAIN_FLOAT64_COLUMNS by default); labels in CHAIN_CATEGORICAL_COLUMNS become
+    categoricals and known small integer columns are narrowed. Integer columns are
+    range-checked before narrowing, so nothing is silently wrapped.
+    """
+    keep64 = CHAIN_FLOAT64_COLUMNS if float64_columns is None else frozenset(float64_columns)
+    dtypes: Dict[str, Any] = {}
+    for column, dtype in frame.dtypes.items():
+        if column == "opt_kind" and dtype != OPT_KIND_DTYPE:
+            kinds = frame[column]
+            # Unknown labels would become NaN under the fixed categories
+            known = kinds.isin(OPT_KIND_DTYPE.categories).all()
+            dtypes[column] = OPT_KIND_DTYPE if known else "category"
+        elif column in CHAIN_CATEGORICAL_COLUMNS:
+            if not isinstance(dtype, pd.CategoricalDtype):
+                dtypes[column] = "category"
+        elif column in CHAIN_INTEGER_COLUMNS:
+            series = frame[column]
+            target = CHAIN_INTEGER_COLUMNS[column]
+            info = np.iinfo(target)
+            integral = dtype.kind in "iu" or (dtype.kind == "f" and bool((series % 1 == 0).all()))
+            if integral and series.notna().all() and (
+                    series.empty or (series.min() >= info.min and series.max() <= info.max)):
+                dtypes[column] = target
+            elif dtype == np.float64 and column not in keep64:
+                dtypes[column] = np.float32
+        elif dtype == np.float64 and column not in keep64:
+            dtypes[column] = np.float32
+    if not dtypes:
+        return frame
+    # Rebuilding from columns (rather than astype) consolidates same-dtype columns
+    # into single blocks, which keeps column-wise groupby aggregations fast
+    compacted = pd.DataFrame(
+        {column: frame[column].astype(dtypes[column]) if column in dtypes else frame[column] for column in frame.columns},
+        index=frame.index
+    )
+    compacted.attrs = dict(frame.attrs)
+    return compacted
+
+
+def chain_memory_bytes(frame: pd.DataFrame) -> int:
+    """Deep in-memory size of a frame, including string payloads."""
+    return int(frame.memory_usage(deep=True).sum())
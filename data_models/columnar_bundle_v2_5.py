@@ -0,0 +1,273 @@
+# data_models/columnar_bundle_v2_5.py
+# EOTS v2.5 - COLUMNAR PROCESSED DATA BUNDLE
+#
+# Carries the contract- and strike-level metric tables produced by the
+# MetricsCalculator as DataFrames (column arrays) through the analysis cycle,
+# instead of expanding them into one Pydantic model per row and dumping them
+# back into DataFrames at every stage. The fetched chain travels to the
+# processor the same way. Per-row models are only built on demand.
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type, Union
+
+import pandas as pd
+from pydantic import BaseModel
+
+from data_models.eots_schemas_v2_5 import (
+    ProcessedDataBundleV2_5,
+    ProcessedContractMetricsV2_5,
+    ProcessedStrikeLevelMetricsV2_5,
+    ProcessedUnderlyingAggregatesV2_5,
+    RawOptionsContractV2_5,
+    RawUnderlyingDataCombinedV2_5,
+    UnprocessedDataBundleV2_5
+)
+from data_models.chain_frame_schema_v2_5 import row_constants
+from utils.validation_policy_v2_5 import ValidationPolicyV2_5, ValidationReport
+
+
+class LazyModelRowsV2_5(Sequence):
+    """
+    Read-only sequence view over the rows of a DataFrame that builds one Pydantic
+    model per row the first time that row is accessed.
+
+    Supports len(), truthiness, indexing, slicing and iteration, so code written
+    against List[ProcessedStrikeLevelMetricsV2_5] keeps working unchanged.
+    Rows are validated or model_construct()ed according to `validate`. Per-cycle
+    constants stored in the frame's attrs (see chain_frame_schema_v2_5) are merged
+    into every row.
+    """
+
+    def __init__(self, frame: pd.DataFrame, model_cls: Type[BaseModel],
+                 policy: Optional[ValidationPolicyV2_5] = None, validate: bool = True):
+        self._frame = frame
+        self._model_cls = model_cls
+        self._policy = policy or ValidationPolicyV2_5("full")
+        self._validate = validate
+        self._constants = row_constants(frame)
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._models: Optional[List[Optional[BaseModel]]] = None
+        self.built_rows = 0
+        self.build_seconds = 0.0
+
+    @property
+    def validates_rows(self) -> bool:
+        return self._validate
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def __bool__(self) -> bool:
+        return len(self._frame) > 0
+
+    def _row_model(self, position: int) -> BaseModel:
+        if self._records is None:
+            # to_dict('records') boxes numpy scalars to native Python values
+            self._records = self._frame.to_dict('records')
+            self._models = [None] * len(self._records)
+        model = self._models[position]
+        if model is None:
+            start = time.perf_counter()
+            record = self._records[position]
+            if self._constants:
+                record = {**self._constants, **record}
+            model = self._policy.build_row(self._model_cls, record, self._validate)
+            self.build_seconds += time.perf_counter() - start
+            self.built_rows += 1
+            self._models[position] = model
+        return model
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BaseModel, List[BaseModel]]:
+        if isinstance(index, slice):
+            return [self._row_model(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._row_model(index)
+
+    def __iter__(self) -> Iterator[BaseModel]:
+        for position in range(len(self)):
+            yield self._row_model(position)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._model_cls.__name__}, rows={len(self)})"
+
+
+class ColumnarUnprocessedDataBundleV2_5:
+    """
+    Column-oriented counterpart of UnprocessedDataBundleV2_5.
+
+    `options_frame` is the chain as parsed by the ConvexValue chain parser (compact
+    schema, one row per contract), handed to the InitialDataProcessor as-is.
+    `options_contracts` exposes the same rows as lazily built RawOptionsContractV2_5
+    models, and `to_pydantic()` materializes a regular UnprocessedDataBundleV2_5.
+    """
+
+    def __init__(
+        self,
+        options_frame: pd.DataFrame,
+        underlying_data: RawUnderlyingDataCombinedV2_5,
+        fetch_timestamp: datetime,
+        errors: Optional[List[str]] = None
+    ):
+        self.options_frame = options_frame if options_frame is not None else pd.DataFrame()
+        self.underlying_data = underlying_data
+        self.fetch_timestamp = fetch_timestamp
+        self.errors: List[str] = list(errors or [])
+        self._contracts = LazyModelRowsV2_5(self.options_frame, RawOptionsContractV2_5)
+
+    @property
+    def options_contracts(self) -> LazyModelRowsV2_5:
+        """Contract rows as RawOptionsContractV2_5 models, built on access."""
+        return self._contracts
+
+    def model_copy(self, update: Optional[Dict[str, Any]] = None) -> 'ColumnarUnprocessedDataBundleV2_5':
+        """A new bundle over the same chain frame (which is never modified), with `update` applied."""
+        fields = {
+            'options_frame': self.options_frame,
+            'underlying_data': self.underlying_data,
+            'fetch_timestamp': self.fetch_timestamp,
+            'errors': self.errors
+        }
+        fields.update(update or {})
+        return ColumnarUnprocessedDataBundleV2_5(**fields)
+
+    def to_pydantic(self) -> UnprocessedDataBundleV2_5:
+        """Materializes the contract models once and returns a standard UnprocessedDataBundleV2_5."""
+        return UnprocessedDataBundleV2_5(
+            options_contracts=list(self._contracts),
+            underlying_data=self.underlying_data,
+            fetch_timestamp=self.fetch_timestamp,
+            errors=self.errors
+        )
+
+    def __repr__(self) -> str:
+        symbol = getattr(self.underlying_data, 'symbol', None)
+        return f"{self.__class__.__name__}(symbol={symbol!r}, contracts={len(self.options_frame)})"
+
+
+class ColumnarProcessedDataBundleV2_5:
+    """
+    Column-oriented counterpart of ProcessedDataBundleV2_5.
+
+    `options_data` and `strike_data` hold the MetricsCalculator output frames as-is.
+    `options_data_with_metrics` / `strike_level_data_with_metrics` expose the same
+    rows as lazily built Pydantic models for consumers that still iterate objects,
+    and `to_pydantic()` materializes a regular ProcessedDataBundleV2_5 for
+    serialization at the end of the cycle. `strike_frame()` / `chain_frame()` give
+    every stage the same indexed tables without rebuilding them. How much of that
+    row materialization is validated is decided by the ValidationPolicyV2_5 (full
+    validation if none is given); sampled checks run once, when the bundle is created.
+    """
+
+    def __init__(
+        self,
+        options_data: pd.DataFrame,
+        strike_data: pd.DataFrame,
+        underlying_data_enriched: ProcessedUnderlyingAggregatesV2_5,
+        processing_timestamp: datetime,
+        errors: Optional[List[str]] = None,
+        validation_policy: Optional[ValidationPolicyV2_5] = None
+    ):
+        self.options_data = options_data if options_data is not None else pd.DataFrame()
+        self.strike_data = strike_data if strike_data is not None else pd.DataFrame()
+        self.underlying_data_enriched = underlying_data_enriched
+        self.processing_timestamp = processing_timestamp
+        self.errors: List[str] = list(errors or [])
+        self.validation_policy = validation_policy or ValidationPolicyV2_5("full")
+
+        # Sampled/schema checks run eagerly so a bad table fails the cycle here,
+        # not later in whichever consumer happens to touch the bad row
+        validate_options, sampled_options, options_seconds = self.validation_policy.prepare_table(self.options_data, ProcessedContractMetricsV2_5)
+        validate_strikes, sampled_strikes, strike_seconds = self.validation_policy.prepare_table(self.strike_data, ProcessedStrikeLevelMetricsV2_5)
+        self._checked_rows = sampled_options + sampled_strikes
+        self._check_seconds = options_seconds + strike_seconds
+        self._options_rows = LazyModelRowsV2_5(self.options_data, ProcessedContractMetricsV2_5, self.validation_policy, validate_options)
+        self._strike_rows = LazyModelRowsV2_5(self.strike_data, ProcessedStrikeLevelMetricsV2_5, self.validation_policy, validate_strikes)
+
+        self._frames_lock = threading.Lock()
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def options_data_with_metrics(self) -> LazyModelRowsV2_5:
+        """Contract rows as ProcessedContractMetricsV2_5 models, built on access."""
+        return self._options_rows
+
+    @property
+    def strike_level_data_with_metrics(self) -> LazyModelRowsV2_5:
+        """Strike rows as ProcessedStrikeLevelMetricsV2_5 models, built on access."""
+        return self._strike_rows
+
+    def _cached_frame(self, name: str, build) -> pd.DataFrame:
+        with self._frames_lock:
+            frame = self._frames.get(name)
+            if frame is None:
+                frame = build()
+                self._frames[name] = frame
+        # Shallow copy: no data is copied, but columns added, replaced or re-indexed
+        # by one stage stay private to that stage instead of leaking into the cache
+        return frame.copy(deep=False)
+
+    def strike_frame(self) -> pd.DataFrame:
+        """
+        Strike-level table indexed by strike (the 'strike' column is kept), built once per bundle.
+
+        The returned frame shares its data with the cache: treat it as read-only and
+        copy() it before writing values in place.
+        """
+        def build() -> pd.DataFrame:
+            if self.strike_data.empty or 'strike' not in self.strike_data.columns:
+                return pd.DataFrame(columns=['strike'])
+            return self.strike_data.set_index('strike', drop=False)
+        return self._cached_frame('strike', build)
+
+    def chain_frame(self) -> pd.DataFrame:
+        """
+        Contract-level table indexed by contract_symbol (the column is kept), built once per bundle.
+
+        Falls back to a positional index when contract symbols are missing or not unique.
+        Same sharing rules as strike_frame().
+        """
+        def build() -> pd.DataFrame:
+            if 'contract_symbol' in self.options_data.columns and self.options_data['contract_symbol'].is_unique:
+                return self.options_data.set_index('contract_symbol', drop=False)
+            return self.options_data.reset_index(drop=True)
+        return self._cached_frame('chain', build)
+
+    def to_pydantic(self) -> ProcessedDataBundleV2_5:
+        """Materializes the row models once and returns a standard ProcessedDataBundleV2_5."""
+        return ProcessedDataBundleV2_5(
+            options_data_with_metrics=list(self._options_rows),
+            strike_level_data_with_metrics=list(self._strike_rows),
+            underlying_data_enriched=self.underlying_data_enriched,
+            processing_timestamp=self.processing_timestamp,
+            errors=self.errors
+        )
+
+    def validation_report(self) -> ValidationReport:
+        """
+        Time spent on validation for this bundle so far (eager checks plus rows
+        materialized), compared with the estimated cost of validating the same rows fully.
+        """
+        built_rows = 0
+        validated_rows = self._checked_rows
+        elapsed = self._check_seconds
+        estimated: Optional[float] = 0.0
+        for rows, frame, model_cls in ((self._options_rows, self.options_data, ProcessedContractMetricsV2_5),
+                                       (self._strike_rows, self.strike_data, ProcessedStrikeLevelMetricsV2_5)):
+            built_rows += rows.built_rows
+            elapsed += rows.build_seconds
+            if rows.validates_rows:
+                validated_rows += rows.built_rows
+                self.validation_policy.record_row_cost(model_cls, rows.build_seconds, rows.built_rows)
+            table_estimate = self.validation_policy.estimated_full_seconds(model_cls, frame, rows.built_rows)
+            estimated = None if estimated is None or table_estimate is None else estimated + table_estimate
+        return ValidationReport(self.validation_policy.mode, built_rows, validated_rows, elapsed, estimated)
+
+    def __repr__(self) -> str:
+        symbol = getattr(self.underlying_data_enriched, 'symbol', None)
+        return (f"{self.__class__.__name__}(symbol={symbol!r}, contracts={len(self.options_data)}, "
+                f"strikes={len(self.strike_data)})")
@@ -1,3 +1,4 @@
+import atexit
 import time
 from datetime import datetime, time as dtime
 import logging
@@ -6,6 +7,7 @@ from pathlib import Path
 import json
 
 from utils.config_manager_v2_5 import ConfigManagerV2_5
+from utils.async_resilience_v2_5 import get_provider_stats
 from data_management.database_manager_v2_5 import DatabaseManagerV2_5
 from data_management.historical_data_manager_v2_5 import HistoricalDataManagerV2_5
 from data_management.performance_tracker_v2_5 import PerformanceTrackerV2_5
@@ -71,6 +73,8 @@ def main():
         calibrated_pairs.clear()
 
     orchestrator = build_orchestrator()
+    orchestrator.startup()
+    atexit.register(orchestrator.shutdown)
     last_reset_date = None
     while True:
         today = datetime.now().date()
@@ -78,15 +82,25 @@ def main():
             clear_intraday_cache()
             last_reset_date = today
         if is_market_open():
+            # One batched underlying request for the whole watchlist, shared by every symbol this cycle
+            underlying_snapshot = orchestrator.refresh_underlying_snapshot(watched_tickers)
+            # Metrics for the whole watchlist in one batch; only the metrics the collector
+            # stores (and what they depend on) are calculated
+            try:
+                bundles = orchestrator.run_metrics_batch(watched_tickers, requested_metrics=gauge_metrics,
+                                                         underlying_snapshot=underlying_snapshot)
+            except Exception as e:
+                logger.error(f"Error calculating watchlist metrics: {e}")
+                bundles = {}
             for symbol in watched_tickers:
                 try:
                     logger.info(f"Processing {symbol}...")
-                    bundle = orchestrator.run_full_analysis_cycle(symbol)
+                    bundle = bundles.get(symbol)
                     logger.info(f"Completed {symbol}.")
                     # Extract enriched underlying data
                     und_data = None
-                    if bundle and hasattr(bundle, 'processed_data_bundle') and bundle.processed_data_bundle is not None:
-                        und_data = getattr(bundle.processed_data_bundle, 'underlying_data_enriched', None)
+                    if bundle is not None:
+                        und_data = getattr(bundle, 'underlying_data_enriched', None)
                         if und_data is not None and hasattr(und_data, 'model_dump'):
                             und_data = und_data.model_dump()
                     if not und_data:
@@ -124,6 +138,9 @@ def main():
                             logger.warning(f"Could not store/check calibration for {symbol} {metric}: {e}")
                 except Exception as e:
                     logger.error(f"Error processing {symbol}: {e}")
+            degraded = {name: stats for name, stats in get_provider_stats().items() if stats['state'] != 'closed'}
+            if degraded:
+                logger.warning(f"Degraded data providers (failing fast this cycle): {degraded}")
             time.sleep(collection_interval)
         else:
             logger.info("Market closed. Sleeping until next check.")
@@ -0,0 +1,37 @@
+# tests/conftest.py
+# Shared fixtures for tests that run a MetricsCalculatorV2_5 against stub settings.
+
+import pytest
+
+
+class StubConfigManager:
+    """Looks settings up by their dotted path in a flat dict, like ConfigManagerV2_5.get_setting."""
+
+    def __init__(self, settings=None):
+        self.settings = dict(settings or {})
+
+    def get_setting(self, path, default=None):
+        return self.settings.get(path, default)
+
+    def get_resolved_path(self, path, default=None):
+        return self.settings.get(path, default)
+
+
+@pytest.fixture
+def make_metrics_calculator(tmp_path):
+    """
+    Builds MetricsCalculatorV2_5 instances without historical data, each with its own
+    intraday metric log directory under tmp_path; their stores are closed afterwards.
+    """
+    from core_analytics_engine.metrics_calculator_v2_5 import MetricsCalculatorV2_5
+    calculators = []
+
+    def make(name='calculator', **settings):
+        settings.setdefault('data_management_settings.intraday_metric_log_directory', str(tmp_path / name))
+        calculator = MetricsCalculatorV2_5(StubConfigManager(settings), None)
+        calculators.append(calculator)
+        return calculator
+
+    yield make
+    for calculator in calculators:
+        calculator.intraday_store.close()
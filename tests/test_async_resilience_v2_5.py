@@ -0,0 +1,126 @@
+# tests/test_async_resilience_v2_5.py
+import asyncio
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from utils.async_resilience_v2_5 import (
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    async_retry,
+    configure_provider,
+)
+
+
+def test_token_bucket_allows_burst_then_queues():
+    bucket = TokenBucket(rate=10.0, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+
+
+def test_circuit_breaker_opens_and_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow_request() is True  # recovery elapsed: single probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request() is False  # probe already in flight
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_records_timeouts_and_trips_breaker():
+    guard = configure_provider("test-provider", rate=1000.0, burst=100, failure_threshold=2, recovery_timeout=60.0)
+    calls = []
+
+    @async_retry(max_attempts=5, backoff_factor=0.0, provider="test-provider")
+    async def flaky():
+        calls.append(1)
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(flaky())
+    assert len(calls) == 2  # stopped once the circuit opened
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(flaky())
+
+    stats = guard.get_stats()
+    assert stats['state'] == CircuitBreaker.OPEN
+    assert stats['timeouts'] == 2
+    assert stats['rejected'] == 1
+
+
+def test_retry_recovers_from_client_error():
+    attempts = []
+
+    @async_retry(max_attempts=3, backoff_factor=0.0)
+    async def recovers():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise aiohttp.ClientError("boom")
+        return "ok"
+
+    assert asyncio.run(recovers()) == "ok"
+    assert len(attempts) == 2
+
+
+def _response_error(status):
+    url = URL("https://api.example.com/quote")
+    request_info = aiohttp.RequestInfo(url, "GET", CIMultiDictProxy(CIMultiDict()), url)
+    return aiohttp.ClientResponseError(request_info, (), status=status, message="error")
+
+
+def test_cancelled_token_wait_frees_the_half_open_probe():
+    guard = configure_provider("test-probe", rate=0.5, burst=1, failure_threshold=1, recovery_timeout=0.0)
+    guard.record_failure(asyncio.TimeoutError())
+    assert guard.breaker.state == CircuitBreaker.OPEN
+    guard.bucket.reserve()  # the probe has to queue for a token
+
+    @async_retry(max_attempts=1, backoff_factor=0.0, provider="test-probe")
+    async def probe():
+        return "ok"
+
+    async def cancel_while_queued():
+        task = asyncio.ensure_future(probe())
+        await asyncio.sleep(0.05)
+        assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_while_queued())
+    guard.configure(rate=1000.0, burst=100, failure_threshold=1, recovery_timeout=0.0)
+    assert asyncio.run(probe()) == "ok"  # the next call gets the probe slot
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_only_provider_failures_count_against_the_breaker():
+    guard = configure_provider("test-status", rate=1000.0, burst=100, failure_threshold=2, recovery_timeout=60.0)
+
+    @async_retry(max_attempts=1, backoff_factor=0.0, provider="test-status")
+    async def respond(status):
+        raise _response_error(status)
+
+    @async_retry(max_attempts=1, backoff_factor=0.0, provider="test-status")
+    async def broken():
+        raise ValueError("unparseable payload")
+
+    for _ in range(3):
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(respond(404))
+        with pytest.raises(ValueError):
+            asyncio.run(broken())
+    assert guard.get_stats()['state'] == CircuitBreaker.CLOSED
+    assert guard.get_stats()['request_errors'] == 6
+    for status in (503, 429):
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(respond(status))
+    assert guard.get_stats()['state'] == CircuitBreaker.OPEN
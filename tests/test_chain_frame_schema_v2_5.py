@@ -0,0 +1,52 @@
+# tests/test_chain_frame_schema_v2_5.py
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_models.chain_frame_schema_v2_5 import (
+    OPT_KIND_DTYPE,
+    chain_memory_bytes,
+    compact_chain_frame,
+    row_constants,
+    set_row_constants
+)
+
+
+def _chain(rows=200):
+    return pd.DataFrame({
+        'contract_symbol': [f"SPY240607C{i:08d}" for i in range(rows)],
+        'strike': np.linspace(450.0, 550.0, rows),
+        'opt_kind': ['call', 'put'] * (rows // 2),
+        'dte_calc': [4.0] * rows,
+        'gamma_contract': np.full(rows, 0.0125),
+        'dxoi': np.full(rows, 1.5e6),
+        'symbol': ['SPY'] * rows,
+        'underlying_price_at_fetch': [501.25] * rows,
+    })
+
+
+def test_compact_schema_dtypes():
+    df = compact_chain_frame(_chain())
+    assert df['strike'].dtype == np.float64
+    assert df['gamma_contract'].dtype == np.float32
+    assert df['dte_calc'].dtype == np.int16
+    assert df['opt_kind'].dtype == OPT_KIND_DTYPE
+    assert isinstance(df['symbol'].dtype, pd.CategoricalDtype)
+    assert df['dxoi'].iloc[0] == 1.5e6
+
+
+def test_unknown_kinds_and_fractional_dte_are_not_mangled():
+    df = compact_chain_frame(_chain(4).assign(opt_kind=['C', 'P', 'C', 'P'], dte_calc=[0.5, 1.0, 2.0, 3.0]))
+    assert df['opt_kind'].tolist() == ['C', 'P', 'C', 'P']
+    assert df['dte_calc'].dtype == np.float32
+
+
+def test_row_constants_replace_broadcast_columns():
+    df = compact_chain_frame(_chain())
+    before = chain_memory_bytes(df)
+    set_row_constants(df, symbol='SPY', underlying_price_at_fetch=501.25, processing_time_dt_obj=datetime(2024, 6, 3))
+    assert 'symbol' not in df.columns and 'underlying_price_at_fetch' not in df.columns
+    assert row_constants(df)['symbol'] == 'SPY'
+    assert chain_memory_bytes(df) < before
+    assert row_constants(df.copy())['underlying_price_at_fetch'] == 501.25  # attrs follow copies
@@ -0,0 +1,90 @@
+# tests/test_columnar_bundle_v2_5.py
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data_models.eots_schemas_v2_5 import (
+    ProcessedDataBundleV2_5,
+    ProcessedStrikeLevelMetricsV2_5,
+    ProcessedUnderlyingAggregatesV2_5,
+    RawOptionsContractV2_5,
+    RawUnderlyingDataCombinedV2_5,
+    UnprocessedDataBundleV2_5
+)
+from data_models.columnar_bundle_v2_5 import ColumnarProcessedDataBundleV2_5, ColumnarUnprocessedDataBundleV2_5
+
+
+@pytest.fixture
+def bundle():
+    strikes = pd.DataFrame({'strike': [495.0, 500.0, 505.0], 'total_dxoi_at_strike': [1.5, -2.0, 0.25]})
+    chain = pd.DataFrame({
+        'contract_symbol': ['SPY240607C00500000', 'SPY240607P00500000'],
+        'strike': [500.0, 500.0],
+        'opt_kind': ['call', 'put'],
+        'dte_calc': [4, 4],
+    })
+    return ColumnarProcessedDataBundleV2_5(
+        options_data=chain,
+        strike_data=strikes,
+        underlying_data_enriched=ProcessedUnderlyingAggregatesV2_5(symbol='SPY', price=501.2),
+        processing_timestamp=datetime(2024, 6, 3, 10, 0),
+        errors=['partial']
+    )
+
+
+def test_row_views_are_lazy_and_cached(bundle):
+    rows = bundle.strike_level_data_with_metrics
+    assert len(rows) == 3 and rows
+    assert rows._records is None  # nothing built until a row is touched
+
+    first = rows[0]
+    assert isinstance(first, ProcessedStrikeLevelMetricsV2_5)
+    assert first.strike == 495.0
+    assert rows[0] is first
+    assert rows[-1].strike == 505.0
+    assert [r.strike for r in rows[1:]] == [500.0, 505.0]
+    with pytest.raises(IndexError):
+        rows[3]
+
+
+def test_to_pydantic_round_trip(bundle):
+    model = bundle.to_pydantic()
+    assert isinstance(model, ProcessedDataBundleV2_5)
+    assert [s.strike for s in model.strike_level_data_with_metrics] == [495.0, 500.0, 505.0]
+    assert len(model.options_data_with_metrics) == 2
+    assert model.underlying_data_enriched.symbol == 'SPY'
+    assert model.errors == ['partial']
+
+
+def test_frames_are_memoized_and_indexed(bundle):
+    strikes = bundle.strike_frame()
+    assert strikes.index.tolist() == [495.0, 500.0, 505.0]
+    assert 'strike' in strikes.columns
+
+    # A stage adding columns does not leak into the cached frame
+    strikes['scratch'] = 1.0
+    again = bundle.strike_frame()
+    assert 'scratch' not in again.columns
+    assert again is not strikes
+
+    chain = bundle.chain_frame()
+    assert chain.loc['SPY240607P00500000', 'opt_kind'] == 'put'
+    cached = bundle._frames['chain']
+    bundle.chain_frame()
+    assert bundle._frames['chain'] is cached  # built once per bundle
+
+
+def test_unprocessed_bundle_builds_contract_models_only_on_request(bundle):
+    chain = bundle.options_data
+    raw = ColumnarUnprocessedDataBundleV2_5(
+        chain, RawUnderlyingDataCombinedV2_5(symbol='SPY', timestamp=datetime(2024, 6, 3, 10, 0), price=501.2),
+        datetime(2024, 6, 3, 10, 0), errors=['partial'])
+    assert raw.options_contracts._records is None
+    copy = raw.model_copy(update={'errors': ['partial', 'late']})
+    assert copy.options_frame is chain and raw.errors == ['partial']
+    assert isinstance(raw.options_contracts[1], RawOptionsContractV2_5)
+    assert raw.options_contracts[1].opt_kind == 'put'
+    plain = raw.to_pydantic()
+    assert isinstance(plain, UnprocessedDataBundleV2_5)
+    assert [c.contract_symbol for c in plain.options_contracts] == list(chain['contract_symbol'])
@@ -0,0 +1,57 @@
+# tests/test_convexvalue_chain_parser_v2_5.py
+import pytest
+from datetime import datetime
+
+import numpy as np
+
+from data_management.convexvalue_chain_parser_v2_5 import parse_chain_rows, slice_chain_frame
+
+PARAMS = ["price", "oi", "delta", "gamma", "value_bs"]
+NOW = datetime(2024, 6, 3, 10, 0)
+
+
+@pytest.fixture
+def chain_rows():
+    return [
+        ["SPY240607C00500000", "2024-06-07", 500, "call", 5.25, 1200, 0.52, 1.2e-05, -350.0],
+        ["SPY240607P00500000", "2024-06-07", 500, "put", 4.75, None, -0.48, 0.011, 125.5],
+        ["SPY240621C00510000", "2024-06-21", "510", "call", "2.10", 800, 0.31, 0.009, "n/a"],
+        ["SPY240816C00520000", "2024-08-16", 520.0, "call", 1.05, 50, 0.18, 0.004, 10.0],
+        ["BROKEN"],
+    ]
+
+
+def test_columns_are_renamed_and_typed(chain_rows):
+    df = parse_chain_rows(chain_rows, PARAMS, now=NOW)
+
+    assert list(df.columns) == ["contract_symbol", "strike", "opt_kind", "dte_calc",
+                                "raw_price", "open_interest", "delta_contract", "gamma_contract", "value_bs"]
+    assert len(df) == 4  # short row dropped
+    assert df["strike"].dtype == np.float64
+    assert df["open_interest"].tolist() == [1200.0, 0.0, 800.0, 50.0]
+    assert df["raw_price"].iloc[2] == pytest.approx(2.10)
+    assert df["gamma_contract"].iloc[0] == pytest.approx(1.2e-05)
+    assert df["value_bs"].iloc[2] == 0.0  # non-numeric coerced to zero
+
+
+def test_dte_computed_per_expiration(chain_rows):
+    df = parse_chain_rows(chain_rows, PARAMS, now=NOW)
+    assert df["dte_calc"].tolist() == [3, 3, 17, 73]
+
+
+def test_filters_applied_before_materialization(chain_rows):
+    df = parse_chain_rows(chain_rows, PARAMS, dte_min=0, dte_max=20, strike_min=505, now=NOW)
+    assert df["contract_symbol"].tolist() == ["SPY240621C00510000"]
+
+
+def test_empty_input_keeps_schema():
+    df = parse_chain_rows([], PARAMS, now=NOW)
+    assert df.empty
+    assert "open_interest" in df.columns
+
+
+def test_slice_matches_filtering_at_parse_time(chain_rows):
+    superset = parse_chain_rows(chain_rows, PARAMS, now=NOW)
+    sliced = slice_chain_frame(superset, dte_min=0, dte_max=20, strike_min=505)
+    direct = parse_chain_rows(chain_rows, PARAMS, dte_min=0, dte_max=20, strike_min=505, now=NOW)
+    assert sliced.equals(direct)
@@ -0,0 +1,34 @@
+# tests/test_expiration_calendar_v2_5.py
+from datetime import date, datetime
+
+from data_management.expiration_calendar_v2_5 import ExpirationCalendarV2_5
+
+NOW = datetime(2024, 6, 3, 10, 0)  # Monday
+TODAY = NOW.date()
+LISTING = ["2024-06-03", "2024-06-05", "2024-06-07", "2024-06-14", "2024-06-21", "2024-07-19"]
+
+
+def test_select_maps_window_to_dates_and_indices():
+    calendar = ExpirationCalendarV2_5()
+    calendar.update("SPY", LISTING, complete=True, today=TODAY)
+
+    selection = calendar.select("SPY", 3, 20, now=NOW)
+    assert selection.dates == [date(2024, 6, 7), date(2024, 6, 14), date(2024, 6, 21)]
+    assert selection.indices == [3, 4, 5]
+
+
+def test_partial_calendar_only_answers_windows_it_covers():
+    calendar = ExpirationCalendarV2_5()
+    calendar.update("SPY", LISTING[:3], complete=False, today=TODAY)
+
+    assert calendar.select("SPY", 0, 3, now=NOW).indices == [2, 3]
+    assert calendar.select("SPY", 0, 30, now=NOW) is None
+
+
+def test_calendar_expires_at_date_change():
+    calendar = ExpirationCalendarV2_5()
+    calendar.update("SPY", LISTING, complete=True, today=date(2024, 5, 31))
+
+    assert calendar.select("SPY", 0, 45, now=NOW) is None
+    assert not calendar.has_complete("SPY", today=TODAY)
+    assert calendar.listed("SPY", today=TODAY) == []
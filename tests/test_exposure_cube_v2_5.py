@@ -0,0 +1,44 @@
+# tests/test_exposure_cube_v2_5.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.exposure_cube_v2_5 import ExposureCubeV2_5
+from core_analytics_engine.strike_index_v2_5 import StrikeIndexV2_5
+
+
+def _chain():
+    return pd.DataFrame({
+        'strike': [500.0, 500.0, 505.0, 505.0, 510.0, np.nan],
+        'expiration': ['2024-06-07', '2024-06-03', '2024-06-03', '2024-06-07', '2024-06-07', '2024-06-03'],
+        'dte_calc': [4, 0, 0, 4, 4, 0],
+        'gxoi': [1.0, 2.0, -3.0, 4.0, 5.0, 100.0],
+        'vxoi': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    })
+
+
+@pytest.fixture
+def cube():
+    chain = _chain()
+    return ExposureCubeV2_5.from_chain(chain, StrikeIndexV2_5.from_chain(chain['strike']))
+
+
+def test_cube_layout_and_slices(cube):
+    assert cube.shape[:2] == (2, 3)
+    assert cube.expiry_dte.tolist() == [0.0, 4.0]  # sorted by DTE, not first appearance
+    assert cube.measure('gxoi').tolist() == [[2.0, -3.0, 0.0], [1.0, 4.0, 5.0]]
+    assert cube.strike_totals('gxoi').tolist() == [3.0, 1.0, 5.0]  # contract without a strike skipped
+    assert not cube.measure('dxoi').any()  # missing chain column
+
+
+def test_0dte_slice_and_concentration(cube):
+    zero_dte = cube.expiry_mask(max_dte=1.0)
+    strikes = cube.strikes_with_contracts(zero_dte)
+    assert strikes.tolist() == [True, True, False]
+    assert cube.concentration('gxoi', zero_dte, strikes) == pytest.approx((2 / 5) ** 2 + (3 / 5) ** 2)
+
+
+def test_term_weighting(cube):
+    weights = np.exp(-cube.expiry_dte / 365.0)
+    expected = weights[0] * np.array([1.0, 1.0, 0.0]) + weights[1] * np.array([1.0, 1.0, 1.0])
+    np.testing.assert_allclose(cube.term_weighted('vxoi', weights), expected)
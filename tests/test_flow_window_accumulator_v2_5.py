@@ -0,0 +1,82 @@
+# tests/test_flow_window_accumulator_v2_5.py
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_management.flow_window_accumulator_v2_5 import FlowWindowAccumulatorV2_5
+
+SESSION_OPEN = datetime(2024, 6, 3, 9, 30).timestamp()
+
+
+def test_window_sums_match_a_brute_force_sum_of_deltas():
+    accumulator = FlowWindowAccumulatorV2_5((5, 15, 30, 60))
+    rng = np.random.default_rng(11)
+    times = SESSION_OPEN + np.cumsum(rng.integers(10, 90, size=150))
+    flows = rng.normal(size=(150, 2)) * [1000.0, 50.0]
+    totals = np.cumsum(flows, axis=0)
+    accumulator.observe(SESSION_OPEN, 0.0, 0.0)  # baseline
+    for t, (value_total, volume_total) in zip(times, totals):
+        accumulator.observe(t, value_total, volume_total)
+    newest = int(times[-1] // 60)
+    windows = accumulator.windows_available()
+    assert sorted(windows) == [5, 15, 30, 60]
+    for minutes, (value_flow, volume_flow) in windows.items():
+        inside = (times // 60).astype(int) > newest - minutes
+        np.testing.assert_allclose([value_flow, volume_flow], flows[inside].sum(axis=0))
+
+
+def test_windows_are_reported_once_covered_and_feed_windows_take_precedence():
+    accumulator = FlowWindowAccumulatorV2_5((5, 15))
+    accumulator.observe(SESSION_OPEN, 100.0, 10.0)
+    accumulator.observe(SESSION_OPEN + 120, 160.0, 16.0)
+    assert accumulator.windows_available() == {}
+    accumulator.observe(SESSION_OPEN + 300, 200.0, 20.0, rolling={15: (-5.0, -1.0)})
+    assert accumulator.windows_available() == {5: (100.0, 10.0), 15: (-5.0, -1.0)}
+    # Rolling sums only hold for the cycle that supplied them
+    accumulator.observe(SESSION_OPEN + 420, 200.0, 20.0)  # the +2 min bucket left the 5m window
+    assert accumulator.windows_available() == {5: (40.0, 4.0)}
+
+
+def test_missing_totals_gaps_and_a_new_day():
+    accumulator = FlowWindowAccumulatorV2_5((5,))
+    accumulator.observe(SESSION_OPEN, 10.0, 1.0)
+    accumulator.observe(SESSION_OPEN + 60, np.nan, np.nan)  # keeps the baseline
+    accumulator.observe(SESSION_OPEN + 360, 30.0, 3.0)
+    assert accumulator.windows_available() == {5: (20.0, 2.0)}
+    accumulator.observe(SESSION_OPEN + 3600, 30.0, 3.0)  # everything older left the window
+    assert accumulator.windows_available() == {5: (0.0, 0.0)}
+    accumulator.observe(SESSION_OPEN + 86400, 5.0, 0.5)  # next session: cumulative totals restart
+    assert accumulator.covered_minutes() == 0.0 and accumulator.windows_available() == {}
+    with pytest.raises(ValueError):
+        FlowWindowAccumulatorV2_5((5,), bucket_seconds=120 + 7)
+
+
+def test_flow_metrics_read_the_windowed_underlying_flows_once_covered(make_metrics_calculator):
+    calculator = make_metrics_calculator()
+    rng = np.random.default_rng(3)
+    value_flows = rng.normal(size=35) * 1e5
+    volume_flows = rng.normal(size=35) * 1e3
+    value_totals, volume_totals = np.cumsum(value_flows), np.cumsum(volume_flows)
+    for minute in range(35):
+        # Contracts come and go, so the chain's own sums jump around; only the underlying's totals count
+        strikes = 20 + minute % 7
+        chain = pd.DataFrame({'strike': 100.0 + np.arange(strikes), 'dte_calc': 0,
+                              'value_bs': rng.normal(size=strikes) * 1e6, 'volm_bs': rng.normal(size=strikes) * 1e4})
+        _, _, und = calculator.calculate_all_metrics(chain, {
+            'symbol': 'SPY', 'price': 120.0, 'u_volatility': 0.2,
+            'value_bs': value_totals[minute], 'volm_bs': volume_totals[minute],
+            'timestamp': datetime(2024, 6, 3, 9, 30) + timedelta(minutes=minute)})
+
+    windows = {minutes: (value_flows[35 - minutes:].sum(), volume_flows[35 - minutes:].sum()) for minutes in (5, 15, 30)}
+    for minutes, (value_flow, volume_flow) in windows.items():
+        np.testing.assert_allclose([und[f'net_value_flow_{minutes}m_und'], und[f'net_vol_flow_{minutes}m_und']],
+                                   [value_flow, volume_flow])
+    assert 'net_value_flow_60m_und' not in und  # 34 minutes of deltas do not cover it yet
+    value_5m, vol_5m = windows[5]
+    vol_15m, vol_30m = windows[15][1], windows[30][1]
+    assert und['vapi_fa_pvr_5m_und'] == pytest.approx(value_5m / abs(vol_5m))
+    assert und['vapi_fa_flow_accel_5m_und'] == pytest.approx(vol_5m - (vol_15m - vol_5m) / 2.0)
+    assert und['dwfd_raw_und'] == pytest.approx(vol_5m - 0.5 * und['dwfd_fvd_und'])
+    assert und['tw_laf_raw_und'] == pytest.approx(vol_5m / 0.021 + 0.8 * vol_15m / 0.025 + 0.6 * vol_30m / 0.031)
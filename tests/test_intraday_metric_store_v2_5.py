@@ -0,0 +1,134 @@
+# tests/test_intraday_metric_store_v2_5.py
+import builtins
+import threading
+
+import numpy as np
+
+import data_management.intraday_metric_store_v2_5 as intraday_metric_store
+from data_management.intraday_metric_store_v2_5 import IntradayMetricStoreV2_5, MetricRingBufferV2_5
+
+
+def test_ring_buffer_keeps_the_most_recent_pairs_in_order():
+    buffer = MetricRingBufferV2_5(3)
+    for i in range(5):
+        buffer.append(1000.0 + i, float(i))
+    assert len(buffer) == 3
+    assert buffer.values().tolist() == [2.0, 3.0, 4.0]
+    assert buffer.timestamps().tolist() == [1002.0, 1003.0, 1004.0]
+
+
+def test_history_is_recovered_from_the_log(tmp_path):
+    store = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60)
+    for i in range(6):
+        store.append("SPY", "vapi_fa", float(i), timestamp=1000.0 + i)
+    store.append("QQQ", "dwfd", -1.5, timestamp=2000.0)
+    assert store.flush() == 7
+    store.close()
+    # A torn line from a crash mid-write is skipped on recovery
+    with open(store._log_path(), 'a') as f:
+        f.write('["SPY", "vapi_fa", 10')
+
+    recovered = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60)
+    timestamps, values = recovered.series("SPY", "vapi_fa")
+    assert values.tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert timestamps.tolist() == [1002.0, 1003.0, 1004.0, 1005.0]
+    assert recovered.values("QQQ", "dwfd").tolist() == [-1.5]
+    with open(recovered._log_path()) as f:
+        assert len(f.readlines()) == 5  # compacted to the retained points
+    assert recovered.peer_values("vapi_fa", exclude_symbol="QQQ", min_count=4) is not None
+    assert recovered.values("IWM", "dwfd").size == 0
+    recovered.close()
+
+
+def _reference_gauge(cache_values, current_value):
+    # The original full-sort implementation of the percentile gauge
+    if len(cache_values) < 2:
+        return 0.0
+    sorted_values = sorted(list(cache_values) + [current_value])
+    positions = [i for i, val in enumerate(sorted_values) if val == current_value]
+    position = positions[len(positions) // 2]
+    return max(-3.0, min(3.0, (position / (len(sorted_values) - 1) - 0.5) * 6.0))
+
+
+def test_incremental_gauge_matches_full_sort(tmp_path):
+    store = IntradayMetricStoreV2_5(str(tmp_path), capacity=25, flush_interval_seconds=60)
+    rng = np.random.default_rng(11)
+    for value in rng.integers(-5, 6, size=120).astype(float):  # many ties and evictions
+        store.append("SPY", "dwfd", value)
+        history = store.values("SPY", "dwfd").tolist()
+        for probe in (value, -7.0, 0.0, 2.5, 9.0):
+            assert store.gauge("SPY", "dwfd", probe) == _reference_gauge(history, probe)
+    assert store.gauges("dwfd", {"SPY": 9.0, "QQQ": 1.0}) == {"SPY": 3.0, "QQQ": 0.0}  # QQQ has no history
+    store.close()
+
+
+def test_buffer_stats_follow_the_window(tmp_path):
+    store = IntradayMetricStoreV2_5(str(tmp_path), capacity=10, flush_interval_seconds=60)
+    for value in np.arange(25.0):
+        store.append("SPY", "net_vol_flow", value)
+    count, mean, std = store.stats("SPY", "net_vol_flow")
+    window = store.values("SPY", "net_vol_flow")
+    assert count == 10 and mean == window.mean() and np.isclose(std, window.std())
+    assert store.stats("QQQ", "net_vol_flow").count == 0
+    assert np.isclose(store.zscore("SPY", "net_vol_flow", 30.0, min_count=10), (30.0 - window.mean()) / window.std())
+    assert store.zscore("SPY", "net_vol_flow", 30.0, min_count=11) == 0.0  # not enough history yet
+    assert store.zscore("QQQ", "net_vol_flow", 30.0) == 0.0
+    store.close()
+
+
+def test_each_writer_recovers_only_its_own_log(tmp_path):
+    (tmp_path / "intraday_metrics_collector_2000-01-03.log").write_text('["SPY", "dwfd", 1.0, 1.0]\n')
+    dashboard = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60, writer="dashboard")
+    collector = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60, writer="collector")
+    dashboard.append("SPY", "vapi_fa", 1.0, timestamp=1000.0)
+    collector.append("SPY", "vapi_fa", 2.0, timestamp=1001.0)
+    dashboard.close()
+    collector.close()
+    assert dashboard._log_path() != collector._log_path()
+
+    restarted = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60, writer="collector")
+    assert restarted.values("SPY", "vapi_fa").tolist() == [2.0]
+    assert dashboard._log_path().exists()  # another writer's log of today is kept
+    assert not (tmp_path / "intraday_metrics_collector_2000-01-03.log").exists()
+    restarted.close()
+
+
+def test_appends_do_not_wait_for_a_flush_on_the_disk(tmp_path, monkeypatch):
+    store = IntradayMetricStoreV2_5(str(tmp_path), capacity=4, flush_interval_seconds=60)
+    store.append("SPY", "dwfd", 1.0, timestamp=1000.0)
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_open(*args, **kwargs):
+        writing.set()
+        release.wait(5)
+        return builtins.open(*args, **kwargs)
+
+    monkeypatch.setattr(intraday_metric_store, "open", slow_open, raising=False)
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    assert writing.wait(5)
+    appender = threading.Thread(target=store.append, args=("SPY", "dwfd", 2.0, 1001.0))
+    appender.start()
+    appender.join(1)
+    try:
+        assert not appender.is_alive()  # done while the flush is still writing
+        assert store.values("SPY", "dwfd").tolist() == [1.0, 2.0]
+    finally:
+        release.set()
+        flusher.join()
+        appender.join()
+    monkeypatch.undo()
+    assert store.flush() == 1  # the point appended during the write
+
+    def failing_open(*args, **kwargs):
+        raise OSError("disk full")
+
+    store.append("SPY", "dwfd", 3.0, timestamp=1002.0)
+    monkeypatch.setattr(intraday_metric_store, "open", failing_open, raising=False)
+    assert store.flush() == 0
+    monkeypatch.undo()
+    store.append("SPY", "dwfd", 4.0, timestamp=1003.0)
+    assert store.flush() == 2  # re-queued ahead of the newer point
+    store.close()
+    lines = (tmp_path / store._log_path().name).read_text().splitlines()
+    assert [line.split(", ")[2] for line in lines] == ["1000.0", "1001.0", "1002.0", "1003.0"]
@@ -0,0 +1,208 @@
+# tests/test_its_orchestrator_v2_5.py
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from core_analytics_engine.its_orchestrator_v2_5 import DataFetchResult, ITSOrchestratorV2_5
+from data_models.columnar_bundle_v2_5 import ColumnarUnprocessedDataBundleV2_5
+from data_models.eots_schemas_v2_5 import RawOptionsContractV2_5, RawUnderlyingDataCombinedV2_5
+from utils.async_resilience_v2_5 import ProviderGuard
+
+
+def _orchestrator(**attributes):
+    """An orchestrator with only the state the fetch path uses (no services are started)."""
+    orchestrator = ITSOrchestratorV2_5.__new__(ITSOrchestratorV2_5)
+    orchestrator.logger = logging.getLogger(__name__)
+    orchestrator.hedged_underlying_quotes = True
+    orchestrator.hedged_quote_budget_seconds = 1.0
+    orchestrator._hedge_stats_lock = threading.Lock()
+    orchestrator._hedge_stats = {}
+    for name, value in attributes.items():
+        setattr(orchestrator, name, value)
+    return orchestrator
+
+
+def _quote(symbol, price):
+    return RawUnderlyingDataCombinedV2_5(symbol=symbol, timestamp=datetime.now(), price=price,
+                                         volatility=0.2, day_volume=1000)
+
+
+def _contract(symbol, strike):
+    return RawOptionsContractV2_5(
+        contract_symbol=f"{symbol}{int(strike)}C", strike=strike, opt_kind='call', dte_calc=3.0, raw_price=1.0,
+        iv=0.2, multiplier=100.0, open_interest=10.0, volm=5.0, delta_contract=0.5, gamma_contract=0.01,
+        theta_contract=-0.02, vega_contract=0.1)
+
+
+class _TradierQuotes:
+    """Tradier stand-in answering quotes after a delay; records whether a request was cancelled."""
+
+    def __init__(self, delay, price):
+        self.delay, self.price = delay, price
+        self.cancelled = False
+
+    async def fetch_underlying_quote(self, symbol):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return _quote(symbol, self.price)
+
+
+async def _later(delay, result):
+    await asyncio.sleep(delay)
+    return result
+
+
+def _race(orchestrator, convexvalue_delay, convexvalue_price):
+    """Runs one hedged quote race; returns (quote, messages, whether the ConvexValue future was cancelled)."""
+    async def race():
+        cv_task = asyncio.ensure_future(_later(convexvalue_delay, _quote('SPY', convexvalue_price)))
+        messages = []
+        quote = await orchestrator._hedged_underlying_quote('SPY', cv_task, messages)
+        await asyncio.sleep(0)  # let the loser's cancellation run
+        cv_cancelled = cv_task.cancelled()
+        cv_task.cancel()
+        return quote, messages, cv_cancelled
+    return asyncio.run(race())
+
+
+def test_first_good_quote_wins_within_the_budget():
+    tradier = _TradierQuotes(delay=0.01, price=501.0)
+    orchestrator = _orchestrator(tradier_fetcher=tradier)
+    quote, messages, cv_cancelled = _race(orchestrator, convexvalue_delay=5.0, convexvalue_price=500.0)
+    assert quote.price == 501.0
+    assert messages and 'served by tradier' in messages[0]
+    assert not cv_cancelled  # the chain leg still needs the ConvexValue underlying
+
+
+def test_losing_tradier_request_is_cancelled_and_bad_quotes_do_not_win():
+    slow = _TradierQuotes(delay=5.0, price=501.0)
+    orchestrator = _orchestrator(tradier_fetcher=slow)
+    quote, _, _ = _race(orchestrator, convexvalue_delay=0.01, convexvalue_price=500.0)
+    assert quote.price == 500.0 and slow.cancelled
+
+    zero_price = _TradierQuotes(delay=0.01, price=0.0)  # answers first, but is no good
+    orchestrator = _orchestrator(tradier_fetcher=zero_price)
+    quote, messages, _ = _race(orchestrator, convexvalue_delay=0.05, convexvalue_price=500.0)
+    assert quote.price == 500.0 and 'served by convexvalue' in messages[0]
+
+
+def test_win_counters_follow_the_races():
+    orchestrator = _orchestrator(tradier_fetcher=_TradierQuotes(delay=0.01, price=501.0))
+    _race(orchestrator, convexvalue_delay=5.0, convexvalue_price=500.0)
+    _race(orchestrator, convexvalue_delay=5.0, convexvalue_price=500.0)
+    orchestrator.tradier_fetcher = _TradierQuotes(delay=5.0, price=501.0)
+    _race(orchestrator, convexvalue_delay=0.01, convexvalue_price=500.0)
+    orchestrator.hedged_quote_budget_seconds = 0.05
+    quote, messages, _ = _race(orchestrator, convexvalue_delay=5.0, convexvalue_price=500.0)
+    assert quote is None and messages == []
+    assert orchestrator.get_quote_hedge_stats() == {'tradier': 2, 'convexvalue': 1, 'none': 1, 'last_winner': 'none'}
+
+
+def test_tradier_chain_fallback_is_used_while_the_convexvalue_breaker_rejects():
+    guard = ProviderGuard('convexvalue-test', failure_threshold=1, recovery_timeout=60.0)
+    guard.record_failure(asyncio.TimeoutError())
+    assert guard.is_rejecting()
+
+    async def no_convexvalue(*args, **kwargs):
+        raise AssertionError("ConvexValue must not be called while its circuit is open")
+
+    async def tradier_chain(symbol, dte_min, dte_max):
+        return [_contract(symbol, strike) for strike in (400.0, 495.0, 505.0, 600.0)], _quote(symbol, 500.0)
+
+    async def daily_bars(symbol, lookback_days, fetcher):
+        return pd.DataFrame({'close': [499.0, 500.0]})
+
+    orchestrator = _orchestrator(
+        convexvalue_fetcher=SimpleNamespace(provider_guard=guard, fetch_chain_and_underlying=no_convexvalue,
+                                            fetch_underlying=no_convexvalue),
+        tradier_fetcher=SimpleNamespace(fetch_chain_and_underlying=tradier_chain, fetch_underlying_quote=no_convexvalue),
+        historical_data_manager=SimpleNamespace(get_ohlcv_async=daily_bars),
+    )
+    result = asyncio.run(orchestrator.fetch_and_fuse_data_async('SPY', 0, 7, 5, underlying_snapshot={}))
+    assert result.status == 'success', result.errors
+    assert [contract.strike for contract in result.bundle.options_contracts] == [495.0, 505.0]  # within 5% of 500
+    assert result.bundle.underlying_data.price == 500.0
+    assert any('Tradier fallback' in message for message in result.messages)
+    assert guard.get_stats()['rejected'] == 0  # checking the circuit does not count as a call
+
+
+@pytest.fixture
+def coalescing_orchestrator():
+    """An orchestrator whose fetch is a scripted coroutine, run on its real background loop."""
+    orchestrator = _orchestrator(
+        _async_lock=threading.Lock(), _async_loop=None, _async_thread=None, async_call_timeout_seconds=5.0,
+        _inflight_lock=threading.Lock(), _inflight_fetches={}, _recent_fetches={}, fetch_coalesce_window_seconds=5.0,
+    )
+    orchestrator.fetches = []
+    orchestrator.fetch_delay, orchestrator.fetch_status = 0.0, 'success'
+
+    async def fetch_and_fuse_data_async(symbol, dte_min, dte_max, price_range_percent, underlying_snapshot=None):
+        orchestrator.fetches.append(symbol)
+        await asyncio.sleep(orchestrator.fetch_delay)
+        bundle = ColumnarUnprocessedDataBundleV2_5(pd.DataFrame({'strike': [500.0]}), _quote(symbol, 500.0),
+                                                   datetime.now(), [])
+        return DataFetchResult(bundle, pd.DataFrame({'close': [500.0]}), orchestrator.fetch_status, [], [])
+
+    orchestrator.fetch_and_fuse_data_async = fetch_and_fuse_data_async
+    yield orchestrator
+    if orchestrator._async_loop is not None:
+        orchestrator._async_loop.call_soon_threadsafe(orchestrator._async_loop.stop)
+        orchestrator._async_thread.join(5)
+
+
+def test_concurrent_identical_fetches_share_one_request(coalescing_orchestrator):
+    orchestrator = coalescing_orchestrator
+    orchestrator.fetch_coalesce_window_seconds = 0.0  # only the in-flight fetch is shared
+    orchestrator.fetch_delay = 0.3
+    start = threading.Barrier(4)
+    results = [None] * 4
+
+    def fetch(index):
+        start.wait()
+        results[index] = orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)
+
+    threads = [threading.Thread(target=fetch, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert orchestrator.fetches == ['SPY']
+    assert all(result[2] == 'success' for result in results)
+    # Every caller has its own history frame and bundle error list
+    results[0][1].loc[0, 'close'] = -1.0
+    results[0][0].errors.append('changed by one caller')
+    assert [result[1].loc[0, 'close'] for result in results[1:]] == [500.0, 500.0, 500.0]
+    assert all(result[0].errors == [] for result in results[1:])
+
+    orchestrator._fetch_and_fuse_data('QQQ', 0, 7, 20)  # a different request is fetched on its own
+    assert orchestrator.fetches == ['SPY', 'QQQ']
+
+
+def test_failed_and_timed_out_fetches_are_not_reused(coalescing_orchestrator):
+    orchestrator = coalescing_orchestrator
+    orchestrator.fetch_status = 'failed'
+    assert orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)[2] == 'failed'
+    orchestrator.fetch_status = 'success'
+    assert orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)[2] == 'success'
+    assert len(orchestrator.fetches) == 2  # the failure was not served again
+
+    orchestrator._recent_fetches.clear()
+    orchestrator.async_call_timeout_seconds, orchestrator.fetch_delay = 0.1, 1.0
+    started = time.monotonic()
+    bundle, historical, status, errors, _ = orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)
+    assert status == 'failed' and bundle is None and historical is None
+    assert time.monotonic() - started < 1.0 and errors
+    orchestrator.async_call_timeout_seconds, orchestrator.fetch_delay = 5.0, 0.0
+    assert orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)[2] == 'success'
+    assert len(orchestrator.fetches) == 4
+    orchestrator._fetch_and_fuse_data('SPY', 0, 7, 20)  # a fresh success is reused within the window
+    assert len(orchestrator.fetches) == 4
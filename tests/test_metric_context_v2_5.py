@@ -0,0 +1,63 @@
+# tests/test_metric_context_v2_5.py
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core_analytics_engine.metric_context_v2_5 import MetricCalculationContextV2_5, SymbolMetricCachesV2_5
+from core_analytics_engine.strike_index_v2_5 import StrikeIndexV2_5
+
+
+def _context_with_index():
+    df_strike = pd.DataFrame({'strike': [100.0, 105.0, 110.0], 'total_dxoi_at_strike': [1.0, 2.0, 3.0]})
+    context = MetricCalculationContextV2_5('SPY')
+    context.strike_index = StrikeIndexV2_5.from_strike_frame(df_strike)
+    return context, df_strike
+
+
+def test_strike_arrays_adopt_new_columns_without_touching_the_shared_index():
+    context, df_strike = _context_with_index()
+    enriched = df_strike.assign(a_dag_exposure=[7.0, 8.0, 9.0])
+    arrays = context.strike_arrays(enriched)
+    np.testing.assert_array_equal(arrays.get('a_dag_exposure'), [7.0, 8.0, 9.0])
+    assert 'a_dag_exposure' not in context.strike_index.arrays
+    # A frame the index does not describe gets an index of its own
+    other = pd.DataFrame({'strike': [1.0, 2.0]})
+    assert len(context.strike_arrays(other)) == 2 and context.aligned_exposure_cube(other) is None
+
+
+def test_dependencies_are_tracked_per_context_and_contexts_pickle():
+    context, _ = _context_with_index()
+    context.mark_completed('strike_table')
+    assert context.missing_dependencies(['strike_table', 'foundational']) == ['foundational']
+    assert MetricCalculationContextV2_5('QQQ').missing_dependencies(['strike_table']) == ['strike_table']
+    restored = pickle.loads(pickle.dumps(context))
+    assert restored.symbol == 'SPY' and restored.metrics_completed == {'strike_table'}
+    assert restored.strike_index.matches(pd.DataFrame({'strike': [100.0, 105.0, 110.0]}))
+
+
+def test_symbol_caches_are_isolated_and_cleared_per_symbol():
+    caches = SymbolMetricCachesV2_5()
+    caches.get('dwfd', 'SPY')['stats'] = 1
+    assert caches.get('dwfd', 'QQQ') == {} and caches.get('dwfd', 'SPY', 'normalization') == {}
+    caches.get('dwfd', 'QQQ')['stats'] = 2
+    caches.clear('SPY')
+    assert caches.get('dwfd', 'SPY') == {} and caches.get('dwfd', 'QQQ') == {'stats': 2}
+
+
+def test_locked_serializes_read_modify_write_for_one_symbol():
+    caches = SymbolMetricCachesV2_5()
+
+    def bump():
+        for _ in range(2000):
+            with caches.locked('SPY'):
+                cache = caches.get('counter', 'SPY')
+                cache['n'] = cache.get('n', 0) + 1
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert caches.get('counter', 'SPY')['n'] == 8000
@@ -0,0 +1,69 @@
+# tests/test_metric_dag_v2_5.py
+import threading
+
+import pytest
+
+from core_analytics_engine.metric_dag_v2_5 import MetricDagExecutorV2_5, MetricGroupV2_5
+
+GROUPS = (
+    MetricGroupV2_5('foundational', (), ('net_cust_delta_flow_und',)),
+    MetricGroupV2_5('strike_table', ()),
+    MetricGroupV2_5('adaptive', ('strike_table',), ('a_dag',)),
+    MetricGroupV2_5('heatmap', ('strike_table',), ('sgdhp',)),
+    MetricGroupV2_5('aggregates', ('strike_table',), ('total_vega_flow',)),
+    MetricGroupV2_5('enhanced_flow', ('aggregates', 'foundational'), ('vapi_fa', 'dwfd')),
+    MetricGroupV2_5('atr', (), ('atr_und',)),
+)
+
+
+def test_order_respects_dependencies_and_rejects_cycles():
+    order = MetricDagExecutorV2_5(GROUPS).order
+    for group in GROUPS:
+        assert all(order.index(dep) < order.index(group.name) for dep in group.depends_on)
+    with pytest.raises(ValueError, match="cycle"):
+        MetricDagExecutorV2_5([MetricGroupV2_5('a', ('b',)), MetricGroupV2_5('b', ('a',))])
+    with pytest.raises(ValueError, match="unknown"):
+        MetricDagExecutorV2_5([MetricGroupV2_5('a', ('missing',))])
+
+
+def test_requested_metrics_prune_to_their_dependency_closure():
+    dag = MetricDagExecutorV2_5(GROUPS)
+    targets = dag.resolve(['vapi_fa_z_score_und', 'not_a_metric'])
+    assert targets == {'enhanced_flow'}
+    assert set(dag.required(targets)) == {'enhanced_flow', 'aggregates', 'strike_table', 'foundational'}
+    assert dag.required(None) == dag.order
+
+
+def test_independent_groups_run_concurrently_and_see_their_dependencies():
+    dag = MetricDagExecutorV2_5(GROUPS, max_workers=4)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def side_by_side(results):
+        barrier.wait()  # only passes if adaptive and heatmap run at the same time
+        return results['strike_table'] + 1
+
+    tasks = {group.name: (lambda results: 1) for group in GROUPS}
+    tasks['adaptive'] = tasks['heatmap'] = side_by_side
+    tasks['enhanced_flow'] = lambda results: results['aggregates'] + results['foundational']
+    try:
+        results = dag.run(tasks)
+    finally:
+        dag.shutdown()
+    assert results['adaptive'] == results['heatmap'] == 2
+    assert results['enhanced_flow'] == 2 and set(results) == {group.name for group in GROUPS}
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_task_errors_propagate(workers):
+    dag = MetricDagExecutorV2_5(GROUPS, max_workers=workers)
+    tasks = {group.name: (lambda results: None) for group in GROUPS}
+
+    def fail(results):
+        raise RuntimeError("boom")
+
+    tasks['aggregates'] = fail
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            dag.run(tasks)
+    finally:
+        dag.shutdown()
@@ -0,0 +1,45 @@
+# tests/test_metric_process_pool_v2_5.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core_analytics_engine.metric_process_pool_v2_5 import MetricProcessPoolV2_5
+
+SHM_DIRECTORY = '/dev/shm'
+
+
+def _shared_blocks():
+    return {name for name in os.listdir(SHM_DIRECTORY) if name.startswith('psm_')}
+
+
+@pytest.mark.skipif(not os.path.isdir(SHM_DIRECTORY), reason="shared memory blocks are not listed on this platform")
+def test_spawn_pool_matches_in_process_groups_and_removes_its_blocks():
+    from core_analytics_engine.metrics_calculator_v2_5 import MetricsCalculatorV2_5
+    from utils.config_manager_v2_5 import ConfigManagerV2_5
+    rng = np.random.default_rng(4)
+    inputs = {}
+    for position, symbol in enumerate(('SPY', 'QQQ', 'IWM')):
+        chain = pd.DataFrame({column: rng.normal(size=80) * 1e5 for column in ('dxoi', 'gxoi', 'vxoi', 'txoi', 'charmxoi', 'vannaxoi', 'vommaxoi')})
+        chain['strike'] = rng.choice(np.arange(100.0, 150.0, 2.5) + 50 * position, size=80)
+        chain['dte_calc'] = rng.choice([0, 7], size=80)
+        inputs[symbol] = (chain, {'symbol': symbol, 'price': 125.0 + 50 * position})
+    before = _shared_blocks()
+    pool = MetricProcessPoolV2_5(2)
+    try:
+        precomputed = pool.calculate(inputs)
+    finally:
+        pool.shutdown()
+    assert _shared_blocks() <= before  # chains and strike tables alike
+    assert set(precomputed) == set(inputs)
+    assert sorted(len(stats.symbols) for stats in pool.utilization()) == [1, 2]
+
+    # The workers build their calculator from the same configuration
+    calculator = MetricsCalculatorV2_5(ConfigManagerV2_5(), None)
+    try:
+        for symbol, (chain, und_data) in inputs.items():
+            expected = calculator.calculate_worker_metric_groups(chain, dict(und_data))
+            pd.testing.assert_frame_equal(precomputed[symbol]['strike_table'], expected['strike_table'])
+    finally:
+        calculator.intraday_store.close()
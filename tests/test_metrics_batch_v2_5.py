@@ -0,0 +1,43 @@
+# tests/test_metrics_batch_v2_5.py
+import numpy as np
+import pandas as pd
+import pytest
+
+SYMBOLS = ('SPY', 'QQQ', 'IWM')
+EXPOSURE_COLUMNS = ('dxoi', 'gxoi', 'vxoi', 'txoi', 'charmxoi', 'vannaxoi', 'vommaxoi', 'value_bs', 'volm_bs')
+
+
+def _watchlist_cycle(rng):
+    """{symbol: (chain, und_data)} with ragged chains on different strike grids."""
+    cycle = {}
+    for position, symbol in enumerate(SYMBOLS):
+        size = int(rng.integers(50, 300))
+        chain = pd.DataFrame({column: rng.normal(size=size) * 1e5 for column in EXPOSURE_COLUMNS})
+        chain['strike'] = rng.choice(np.arange(100.0, 200.0, 2.5) + 50 * position, size=size)
+        chain['dte_calc'] = rng.choice([0, 3, 10], size=size)
+        cycle[symbol] = (chain, {'symbol': symbol, 'price': 150.0 + 50 * position,
+                                 'value_bs': float(rng.normal() * 1e6), 'volm_bs': float(rng.normal() * 1e4)})
+    return cycle
+
+
+def test_batch_matches_per_symbol_calculation(make_metrics_calculator):
+    rng = np.random.default_rng(2)
+    single, batch = make_metrics_calculator('single'), make_metrics_calculator('batch')
+    for _ in range(4):  # several cycles, so the rolling normalization state is compared too
+        cycle = _watchlist_cycle(rng)
+        expected = {symbol: single.calculate_all_metrics(chain, dict(und)) for symbol, (chain, und) in cycle.items()}
+        results = batch.calculate_metrics_batch(cycle)
+        assert set(results) == set(SYMBOLS)
+        for symbol in SYMBOLS:
+            strike_expected, _, und_expected = expected[symbol]
+            strike_batch, _, und_batch = results[symbol]
+            assert list(strike_batch.columns) == list(strike_expected.columns)
+            for column in strike_expected.columns:
+                np.testing.assert_allclose(strike_batch[column].to_numpy(float), strike_expected[column].to_numpy(float),
+                                           rtol=1e-9, atol=1e-9, err_msg=f"{symbol} {column}")
+            assert set(und_batch) == set(und_expected)
+            for _, _, gauge_key in batch.FLOW_GAUGE_METRICS:  # gauged in bulk across the batch
+                assert isinstance(und_batch[gauge_key], float) and und_batch[gauge_key] == und_expected[gauge_key]
+            for key, value in und_expected.items():
+                if isinstance(value, float) and key != 'td_gib_und':  # td_gib_und scales with the wall clock
+                    assert und_batch[key] == pytest.approx(value, rel=1e-9, nan_ok=True), f"{symbol} {key}"
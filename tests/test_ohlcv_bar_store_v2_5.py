@@ -0,0 +1,33 @@
+# tests/test_ohlcv_bar_store_v2_5.py
+from datetime import date
+
+from data_management.ohlcv_bar_store_v2_5 import OHLCVBarStoreV2_5
+
+BARS = [
+    {'date': '2024-06-03', 'open': 100.0, 'high': 102.0, 'low': 99.0, 'close': 101.0, 'volume': 1000},
+    {'date': '2024-06-04', 'open': 101.0, 'high': 103.0, 'low': 100.0, 'close': 102.5, 'volume': 1200},
+]
+
+
+def test_bars_persist_across_instances(tmp_path):
+    db_path = str(tmp_path / "bars.db")
+    store = OHLCVBarStoreV2_5(db_path)
+    assert store.upsert_bars("SPY", BARS, covered_from=date(2024, 6, 1)) == 2
+    store.close()
+
+    reopened = OHLCVBarStoreV2_5(db_path)
+    df = reopened.get_bars("SPY")
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert df['close'].tolist() == [101.0, 102.5]
+    assert reopened.get_coverage("SPY") == (date(2024, 6, 1), date(2024, 6, 4))
+    assert reopened.get_coverage("QQQ") is None
+
+
+def test_upsert_replaces_and_coverage_only_widens(tmp_path):
+    store = OHLCVBarStoreV2_5(str(tmp_path / "bars.db"))
+    store.upsert_bars("SPY", BARS, covered_from=date(2024, 6, 1))
+    store.upsert_bars("SPY", [dict(BARS[1], close=104.0)], covered_from=date(2024, 6, 4))
+
+    df = store.get_bars("SPY", start=date(2024, 6, 4))
+    assert df['close'].tolist() == [104.0]
+    assert store.get_coverage("SPY")[0] == date(2024, 6, 1)
@@ -0,0 +1,51 @@
+# tests/test_ragged_strike_table_v2_5.py
+import numpy as np
+
+from core_analytics_engine.ragged_strike_table_v2_5 import RaggedStrikeTableV2_5
+from core_analytics_engine.strike_index_v2_5 import StrikeIndexV2_5
+
+
+def _index(strikes, **arrays):
+    index = StrikeIndexV2_5(np.asarray(strikes, dtype=np.float64))
+    for name, values in arrays.items():
+        index.set(name, values)
+    return index
+
+
+def test_concatenates_segments_and_zero_fills_missing_measures():
+    table = RaggedStrikeTableV2_5.from_strike_indexes([
+        ('SPY', _index([1.0, 2.0, 3.0], gxoi=[1.0, 2.0, 3.0], dxoi=[4.0, 5.0, 6.0])),
+        ('EMPTY', _index([])),
+        ('QQQ', _index([10.0, 20.0], gxoi=[-1.0, 7.0])),
+    ])
+    assert len(table) == 5 and table.n_segments == 3
+    np.testing.assert_array_equal(table.offsets, [0, 3, 3, 5])
+    np.testing.assert_array_equal(table.arrays['dxoi'], [4.0, 5.0, 6.0, 0.0, 0.0])
+    assert table.bounds('QQQ') == (3, 5)
+    assert table.get('missing', None) is None
+
+
+def test_segment_reductions_match_per_symbol_numpy():
+    rng = np.random.default_rng(3)
+    parts = [rng.normal(size=n) for n in (4, 1, 0, 7)]
+    table = RaggedStrikeTableV2_5(list('ABCD'), np.concatenate(([0], np.cumsum([len(p) for p in parts]))),
+                                  np.zeros(sum(len(p) for p in parts)))
+    values = np.concatenate(parts)
+    for i, part in enumerate(parts):
+        if len(part):
+            assert np.isclose(table.segment_sum(values)[i], part.sum())
+            assert np.isclose(table.segment_mean(values)[i], part.mean())
+            assert np.isclose(table.segment_std(values)[i], part.std())
+            assert table.segment_max(values)[i] == part.max()
+        if len(part) > 1:
+            assert np.isclose(table.segment_std(values, ddof=1)[i], part.std(ddof=1))
+    assert np.isnan(table.segment_std(values, ddof=1)[1]) and np.isnan(table.segment_max(values)[2])
+    np.testing.assert_array_equal(table.broadcast([1, 2, 3, 4]), [1] * 4 + [2] + [4] * 7)
+
+
+def test_split_returns_views_of_the_concatenated_arrays():
+    table = RaggedStrikeTableV2_5.from_strike_indexes([('A', _index([1.0, 2.0])), ('B', _index([3.0]))])
+    column = np.array([0.5, 1.5, 2.5])
+    split = table.split({'score': column})
+    np.testing.assert_array_equal(split['B']['score'], [2.5])
+    assert np.shares_memory(split['A']['score'], column)
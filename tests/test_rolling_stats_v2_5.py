@@ -0,0 +1,27 @@
+# tests/test_rolling_stats_v2_5.py
+import numpy as np
+import pytest
+
+from utils.rolling_stats_v2_5 import RollingStatsV2_5
+
+
+def test_windowed_moments_match_numpy_across_evictions():
+    rng = np.random.default_rng(5)
+    stats = RollingStatsV2_5(50)
+    history = []
+    for value in rng.normal(1e6, 1e4, size=500):
+        stats.push(value)
+        history = (history + [value])[-50:]
+        assert len(stats) == len(history)
+        assert stats.mean == pytest.approx(np.mean(history), rel=1e-10)
+        assert stats.std == pytest.approx(np.std(history), rel=1e-6)
+
+
+def test_nan_is_ignored_and_zscore_is_elementwise():
+    stats = RollingStatsV2_5(4)
+    for value in (1.0, np.nan, 3.0):
+        stats.push(value)
+    assert len(stats) == 2 and stats.mean == 2.0 and stats.std == 1.0
+    np.testing.assert_allclose(stats.zscore(np.array([1.0, 3.0])), [-1.0, 1.0])
+    assert stats.zscore(4.0, min_std=4.0) == 0.5
+    assert np.isnan(RollingStatsV2_5(3).snapshot().mean)
@@ -0,0 +1,47 @@
+# tests/test_shared_frame_v2_5.py
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.shared_frame_v2_5 import read_shared_frame, release_shared_frame, share_frame
+
+
+def test_round_trip_keeps_dtypes_index_and_attrs():
+    frame = pd.DataFrame({
+        'strike': np.array([100.0, 105.0, 110.0]),
+        'gxoi': np.array([1.5, -2.0, 3.25], dtype=np.float32),
+        'dte_calc': np.array([0, 7, 30], dtype=np.int16),
+        'opt_kind': pd.Categorical(['call', 'put', None], categories=['call', 'put']),
+        'fetched': pd.date_range('2024-06-03 09:30', periods=3, freq='min'),
+        'contract': ['SPY1', 'SPY2', 'SPY3'],
+    }, index=[4, 9, 11])
+    frame.attrs['row_constants'] = {'symbol': 'SPY'}
+    shm, descriptor = share_frame(frame)
+    try:
+        # Only the descriptor crosses the process boundary
+        restored = read_shared_frame(pickle.loads(pickle.dumps(descriptor)))
+    finally:
+        release_shared_frame(shm)
+    pd.testing.assert_frame_equal(restored, frame)
+    assert restored.attrs == frame.attrs
+    assert 'contract' in descriptor.pickled and 'gxoi' not in descriptor.pickled
+
+
+def test_restored_columns_do_not_reference_the_block():
+    frame = pd.DataFrame({'value': np.arange(4.0)})
+    shm, descriptor = share_frame(frame)
+    restored = read_shared_frame(descriptor)
+    release_shared_frame(shm)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=descriptor.shm_name)
+    np.testing.assert_array_equal(restored['value'], [0.0, 1.0, 2.0, 3.0])
+
+
+def test_empty_frame_and_repeated_release():
+    shm, descriptor = share_frame(pd.DataFrame())
+    assert read_shared_frame(descriptor).empty
+    release_shared_frame(shm)
+    release_shared_frame(descriptor.shm_name)  # already removed: ignored
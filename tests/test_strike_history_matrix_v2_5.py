@@ -0,0 +1,45 @@
+# tests/test_strike_history_matrix_v2_5.py
+import numpy as np
+import pytest
+
+from data_management.strike_history_matrix_v2_5 import StrikeHistoryMatrixV2_5
+
+
+def test_column_stats_are_per_strike_over_time():
+    history = StrikeHistoryMatrixV2_5(capacity=10)
+    rng = np.random.default_rng(5)
+    rows = [rng.normal(loc=[0.0, 100.0, -50.0], scale=[1.0, 10.0, 0.1]) for _ in range(6)]
+    for t, row in enumerate(rows):
+        history.append([95.0, 100.0, 105.0], row, timestamp=t)
+    counts, means, stds = history.column_stats([105.0, 95.0, 110.0])
+    expected = np.array(rows)
+    np.testing.assert_array_equal(counts, [6, 6, 0])
+    np.testing.assert_allclose(means[:2], [expected[:, 2].mean(), expected[:, 0].mean()])
+    np.testing.assert_allclose(stds[:2], [expected[:, 2].std(), expected[:, 0].std()])
+    assert np.isnan(means[2]) and np.isnan(stds[2])
+
+
+def test_grid_follows_the_chain_and_drops_strikes_that_leave_the_window():
+    history = StrikeHistoryMatrixV2_5(capacity=3)
+    history.append([100.0, 105.0], [1.0, 2.0], timestamp=0)
+    history.append([105.0, 110.0], [3.0, 4.0], timestamp=1)  # 110 is new, 100 is missing
+    np.testing.assert_array_equal(history.strikes, [100.0, 105.0, 110.0])
+    counts, means, _ = history.column_stats([100.0, 105.0, 110.0])
+    np.testing.assert_array_equal(counts, [1, 2, 1])
+    np.testing.assert_array_equal(means, [1.0, 2.5, 4.0])
+    history.append([105.0, 110.0], [5.0, 6.0], timestamp=2)
+    history.append([105.0, 110.0], [7.0, 8.0], timestamp=3)  # the cycle with strike 100 is evicted
+    np.testing.assert_array_equal(history.strikes, [105.0, 110.0])
+    assert len(history) == 3
+
+
+def test_frame_is_oldest_first_by_strike():
+    history = StrikeHistoryMatrixV2_5(capacity=2)
+    for t in range(3):
+        history.append([100.0, 105.0], [t, 10.0 * t], timestamp=1_700_000_000 + t)
+    frame = history.frame()
+    assert list(frame.columns) == [100.0, 105.0]
+    np.testing.assert_array_equal(frame.to_numpy(), [[1.0, 10.0], [2.0, 20.0]])
+    assert frame.index.is_monotonic_increasing
+    with pytest.raises(ValueError):
+        StrikeHistoryMatrixV2_5(capacity=0)
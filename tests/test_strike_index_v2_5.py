@@ -0,0 +1,44 @@
+# tests/test_strike_index_v2_5.py
+import numpy as np
+import pandas as pd
+
+from core_analytics_engine.strike_index_v2_5 import STRIKE_SUM_COLUMNS, StrikeIndexV2_5
+
+
+def _chain():
+    rng = np.random.default_rng(3)
+    strikes = rng.choice([490.0, 495.0, 500.0, 505.0], size=60)
+    frame = pd.DataFrame({source: rng.normal(size=60).astype(np.float32) for source in STRIKE_SUM_COLUMNS.values()})
+    frame['strike'] = strikes
+    frame.loc[5, 'gxoi'] = np.nan
+    return frame
+
+
+def test_bincount_sums_match_groupby():
+    chain = _chain().drop(columns=['vommaxoi'])
+    index = StrikeIndexV2_5.from_chain(chain['strike'])
+    index.aggregate(chain)
+    expected = chain.groupby('strike').sum()
+    assert index.strikes.tolist() == expected.index.tolist()
+    for output, source in STRIKE_SUM_COLUMNS.items():
+        if source in expected.columns:
+            np.testing.assert_allclose(index.get(output), expected[source].to_numpy(np.float64), rtol=1e-6)
+    assert not index.get('total_vommaxoi_at_strike').any()  # missing chain column sums to 0
+    assert index.get('absent', 0) == 0
+
+
+def test_nearest_breaks_ties_like_idxmin():
+    index = StrikeIndexV2_5(np.array([490.0, 495.0, 500.0]))
+    for price in (480.0, 492.5, 493.0, 497.6, 510.0):
+        assert index.nearest(price) == int((pd.Series(index.strikes) - price).abs().idxmin())
+
+
+def test_frame_round_trip_and_column_adoption():
+    chain = _chain()
+    index = StrikeIndexV2_5.from_chain(chain['strike'])
+    index.aggregate(chain)
+    frame = index.to_frame()
+    assert index.matches(frame) and not index.matches(frame.iloc[::-1])
+    frame['net_cust_vanna_flow_at_strike_proxy'] = [1.0, np.nan, 2.0, 3.0]
+    index.adopt_columns(frame)
+    assert index.get('net_cust_vanna_flow_at_strike_proxy').tolist() == [1.0, 0.0, 2.0, 3.0]
@@ -0,0 +1,55 @@
+# tests/test_validation_policy_v2_5.py
+from typing import Optional
+
+import pandas as pd
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from utils.validation_policy_v2_5 import ValidationPolicyV2_5
+
+
+class _StrikeRow(BaseModel):
+    strike: float
+    opt_kind: str
+    total_dxoi_at_strike: Optional[float] = None
+
+
+def _frame(rows=40):
+    return pd.DataFrame({
+        'strike': [400.0 + i for i in range(rows)],
+        'opt_kind': ['call'] * rows,
+        'total_dxoi_at_strike': [float(i) for i in range(rows)],
+    })
+
+
+def test_construct_skips_validation():
+    policy = ValidationPolicyV2_5("construct")
+    validate, checked, _ = policy.prepare_table(_frame(), _StrikeRow)
+    assert (validate, checked) == (False, 0)
+    row = policy.build_row(_StrikeRow, {'strike': 'not-a-number', 'opt_kind': 'call'}, validate)
+    assert row.strike == 'not-a-number'  # trusted path: no coercion, no error
+
+
+def test_sampled_validates_a_fraction_and_checks_dtypes():
+    policy = ValidationPolicyV2_5("sampled", sample_percent=10, seed=7)
+    validate, checked, _ = policy.prepare_table(_frame(), _StrikeRow)
+    assert (validate, checked) == (False, 4)
+
+    bad_dtype = _frame().assign(strike=['x'] * 40)
+    issues = policy.check_frame(bad_dtype, _StrikeRow)
+    assert len(issues) == 1 and issues[0].startswith("column 'strike' has dtype")
+    validate, checked, _ = policy.prepare_table(bad_dtype, _StrikeRow)
+    assert validate is True and checked == 0  # falls back to full row validation
+
+
+def test_sampled_rows_that_fail_validation_raise():
+    policy = ValidationPolicyV2_5("sampled", sample_percent=100)
+    frame = _frame(3).assign(opt_kind=['call', None, 'put'])
+    with pytest.raises(ValidationError):
+        policy.prepare_table(frame, _StrikeRow)
+
+
+def test_cost_estimate_calibrates_when_no_rows_were_validated():
+    policy = ValidationPolicyV2_5("construct")
+    estimate = policy.estimated_full_seconds(_StrikeRow, _frame(), rows=1000)
+    assert estimate is not None and estimate > 0
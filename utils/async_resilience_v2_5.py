@@ -3,22 +3,282 @@
 
 import asyncio
 import logging
+import random
+import threading
+import time
 from functools import wraps
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Dict, Optional, Tuple, Type
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
-def async_retry(max_attempts: int = 3, backoff_factor: float = 0.5) -> Callable:
+# Exceptions that are worth another attempt
+RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (aiohttp.ClientError, asyncio.TimeoutError)
+
+# Failures that say something about the provider rather than about the request
+TRANSPORT_EXCEPTIONS: Tuple[Type[BaseException], ...] = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+try:
+    import requests
+    TRANSPORT_EXCEPTIONS += (requests.RequestException,)
+except ImportError:
+    pass
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """
+    True if a failed call counts against the provider's circuit breaker: transport
+    errors, timeouts and 5xx / 429 responses. 4xx responses (e.g. an unknown symbol)
+    and local errors say nothing about the provider's health.
+    """
+    if isinstance(exc, aiohttp.ClientResponseError):
+        status = exc.status
+    else:
+        status = getattr(getattr(exc, 'response', None), 'status_code', None)  # requests.HTTPError
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return isinstance(exc, TRANSPORT_EXCEPTIONS)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit breaker is open and the call is rejected without being attempted."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill at `rate` per second up to `burst`.
+
+    acquire() reserves a token immediately (the balance may go negative) and then
+    sleeps for the reservation, so concurrent callers queue fairly instead of all
+    waking and retrying at once.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Updates the refill rate and burst size, keeping the current balance."""
+        with self._lock:
+            self.rate = max(float(rate), 1e-6)
+            self.burst = max(int(burst), 1)
+            if hasattr(self, '_tokens'):
+                self._tokens = min(self._tokens, float(self.burst))
+
+    def reserve(self) -> float:
+        """Takes one token and returns how long the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Waits for a token. Returns the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with closed / open / half_open states.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected. Once `recovery_timeout` seconds have passed, a single probe call is let
+    through (half_open); its success closes the circuit, its failure re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self._lock = threading.Lock()
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.recovery_timeout = float(recovery_timeout)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Returns True if a call may be attempted now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Frees a half-open probe slot whose call ended without a verdict (e.g. cancellation)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def seconds_until_probe(self) -> float:
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+
+class ProviderGuard:
+    """
+    Rate limiter, circuit breaker and counters for one upstream provider (e.g. 'tradier').
+    Shared by every fetcher and coroutine that talks to that provider.
+    """
+
+    def __init__(self, name: str, rate: float = 5.0, burst: int = 10,
+                 failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, recovery_timeout)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {
+            'calls': 0, 'successes': 0, 'failures': 0, 'timeouts': 0, 'retries': 0, 'request_errors': 0,
+            'rejected': 0, 'throttled': 0, 'throttle_wait_seconds': 0.0,
+        }
+
+    def configure(self, rate: float, burst: int, failure_threshold: int, recovery_timeout: float) -> None:
+        self.bucket.configure(rate, burst)
+        with self.breaker._lock:
+            self.breaker.failure_threshold = max(int(failure_threshold), 1)
+            self.breaker.recovery_timeout = float(recovery_timeout)
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[key] += amount
+
+    async def acquire(self) -> None:
+        """Checks the breaker and waits for a rate-limit token. Raises CircuitOpenError if rejected."""
+        if not self.breaker.allow_request():
+            self._count('rejected')
+            raise CircuitOpenError(
+                f"Circuit for provider '{self.name}' is open; next probe in {self.breaker.seconds_until_probe():.1f}s"
+            )
+        try:
+            waited = await self.bucket.acquire()
+        except BaseException:
+            # Cancelled while queued for a token: the call never reached the provider
+            self.breaker.release_probe()
+            raise
+        self._count('calls')
+        if waited > 0:
+            self._count('throttled')
+            self._count('throttle_wait_seconds', waited)
+
+    def record_success(self) -> None:
+        self._count('successes')
+        self.breaker.record_success()
+
+    def record_failure(self, exc: Optional[BaseException] = None) -> None:
+        """Records a failed call; only provider failures (see is_provider_failure) count against the breaker."""
+        if exc is not None and not is_provider_failure(exc):
+            self._count('request_errors')
+            self.breaker.release_probe()
+            return
+        self._count('failures')
+        if isinstance(exc, asyncio.TimeoutError):
+            self._count('timeouts')
+        self.breaker.record_failure()
+
+    def record_retry(self) -> None:
+        self._count('retries')
+
+    def is_rejecting(self) -> bool:
+        """True while the circuit is open and not yet due for a probe. Does not consume the probe."""
+        return self.breaker.state == CircuitBreaker.OPEN and self.breaker.seconds_until_probe() > 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of the counters plus breaker state."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        stats.update({
+            'state': self.breaker.state,
+            'consecutive_failures': self.breaker.consecutive_failures,
+            'times_opened': self.breaker.times_opened,
+        })
+        return stats
+
+
+_providers: Dict[str, ProviderGuard] = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider_guard(name: str) -> ProviderGuard:
+    """Returns the process-wide guard for a provider, creating it with defaults if needed."""
+    with _providers_lock:
+        guard = _providers.get(name)
+        if guard is None:
+            guard = _providers[name] = ProviderGuard(name)
+        return guard
+
+
+def configure_provider(name: str, rate: float, burst: int, failure_threshold: int = 5,
+                       recovery_timeout: float = 30.0) -> ProviderGuard:
+    """
+    Creates or reconfigures the shared guard for a provider. Existing state (tokens,
+    breaker state, counters) is kept so several fetcher instances can call this safely.
+    """
+    guard = get_provider_guard(name)
+    guard.configure(rate, burst, failure_threshold, recovery_timeout)
+    return guard
+
+
+def get_provider_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters and breaker state for every registered provider."""
+    with _providers_lock:
+        guards = list(_providers.values())
+    return {guard.name: guard.get_stats() for guard in guards}
+
+
+def _backoff_delay(attempt: int, backoff_factor: float, max_backoff: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(max_backoff, factor * 2^(attempt-1)))."""
+    return random.uniform(0.0, min(max_backoff, backoff_factor * (2 ** (attempt - 1))))
+
+def async_retry(max_attempts: int = 3, backoff_factor: float = 0.5, provider: Optional[str] = None,
+                max_backoff: float = 10.0) -> Callable:
     """
     An asynchronous retry decorator for resilient aiohttp requests.
 
     This decorator wraps an asynchronous function and retries it upon encountering
-    aiohttp.ClientError exceptions, using an exponential backoff strategy.
+    aiohttp.ClientError or asyncio.TimeoutError exceptions, using exponential backoff
+    with full jitter so that concurrent callers do not retry in lockstep.
+
+    When a provider is named, every attempt first passes that provider's shared
+    circuit breaker and token bucket, and its outcome is recorded there (4xx
+    responses and local errors do not count against the breaker). Calls rejected
+    by an open circuit raise CircuitOpenError and are not retried.
 
     Args:
         max_attempts (int): The maximum number of attempts to make.
         backoff_factor (float): The factor to apply for exponential backoff delay.
+        provider (Optional[str]): Name of the shared ProviderGuard to use (e.g. 'tradier').
+        max_backoff (float): Upper bound for a single backoff delay in seconds.
 
     Returns:
         Callable: The wrapped asynchronous function.
@@ -32,24 +292,50 @@ def async_retry(max_attempts: int = 3, backoff_factor: float = 0.5) -> Callable:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             attempts = 0
-            last_exception: Optional[Exception] = None
+            last_exception: Optional[BaseException] = None
+            guard = get_provider_guard(provider) if provider else None
             while attempts < max_attempts:
                 attempts += 1
                 try:
-                    return await func(*args, **kwargs)
-                except aiohttp.ClientError as e:
+                    if guard is not None:
+                        await guard.acquire()
+                    result = await func(*args, **kwargs)
+                except CircuitOpenError:
+                    raise
+                except RETRYABLE_EXCEPTIONS as e:
                     last_exception = e
+                    if guard is not None:
+                        guard.record_failure(e)
                     if attempts >= max_attempts:
-                        logger.error(f"Function {func.__name__} failed after {max_attempts} attempts. Final error: {e}")
-                        break 
-                    
-                    delay = backoff_factor * (2 ** (attempts - 1))
+                        logger.error(f"Function {func.__name__} failed after {max_attempts} attempts. Final error: {type(e).__name__}: {e}")
+                        break
+                    if guard is not None and guard.breaker.state == CircuitBreaker.OPEN:
+                        logger.error(f"Circuit for provider '{provider}' opened; giving up on {func.__name__} after {attempts} attempts.")
+                        break
+
+                    delay = _backoff_delay(attempts, backoff_factor, max_backoff)
+                    if guard is not None:
+                        guard.record_retry()
                     logger.warning(
                         f"Attempt {attempts}/{max_attempts} for {func.__name__} failed with {type(e).__name__}. "
                         f"Retrying in {delay:.2f} seconds."
                     )
                     await asyncio.sleep(delay)
-            
+                except Exception as e:
+                    # Not retryable; record_failure only holds it against the provider if it is a provider failure
+                    if guard is not None:
+                        guard.record_failure(e)
+                    raise
+                except BaseException:
+                    # Cancelled mid-call: free a half-open probe slot without judging the provider
+                    if guard is not None:
+                        guard.breaker.release_probe()
+                    raise
+                else:
+                    if guard is not None:
+                        guard.record_success()
+                    return result
+
             # If we get here, all attempts failed
             if last_exception is not None:
                 raise last_exception
@@ -0,0 +1,91 @@
+# utils/rolling_stats_v2_5.py
+# EOTS v2.5 - WINDOWED STREAMING MEAN / VARIANCE
+#
+# Welford's online algorithm extended with eviction: the mean and the sum of
+# squared deviations (M2) of the last `window` values are updated in O(1) per
+# value as values enter and leave the window, so z-scores against a rolling
+# history no longer need np.mean / np.std over the whole history each cycle.
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class WindowStats(NamedTuple):
+    """Snapshot of a rolling window: number of values, mean and population std (ddof=0)."""
+    count: int
+    mean: float
+    std: float
+
+
+class RollingStatsV2_5:
+    """
+    Mean and population variance of the last `window` values.
+
+    NaN values are ignored. Floating-point drift from repeated add/evict updates is
+    bounded by recomputing the moments from the window once every `window` evictions
+    (amortized O(1)).
+    """
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._values = np.zeros(window, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, value: float) -> None:
+        value = float(value)
+        if value != value:
+            return
+        if self._count < self.window:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+        else:
+            # Replace the oldest value: combined remove + add update
+            old = float(self._values[self._next])
+            old_mean = self._mean
+            self._mean += (value - old) / self._count
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+            self._evictions += 1
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.window
+        if self._evictions >= self.window:
+            self._resync()
+
+    def _resync(self) -> None:
+        # The live values are the first _count slots until the ring is full, then all of it
+        window = self._values[:self._count]
+        self._mean = float(window.mean())
+        self._m2 = float(((window - self._mean) ** 2).sum())
+        self._evictions = 0
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._count else float('nan')
+
+    @property
+    def variance(self) -> float:
+        """Population variance (ddof=0), like np.var."""
+        return max(self._m2, 0.0) / self._count if self._count else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def snapshot(self) -> WindowStats:
+        return WindowStats(self._count, self.mean, self.std)
+
+    def zscore(self, value, min_std: float = 0.0):
+        """(value - mean) / max(std, min_std); works element-wise on arrays. Callers guard std == 0."""
+        return (value - self._mean) / max(self.std, min_std)
+
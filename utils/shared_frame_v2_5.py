@@ -0,0 +1,120 @@
+# utils/shared_frame_v2_5.py
+# EOTS v2.5 - DATAFRAME TRANSFER BETWEEN PROCESSES THROUGH SHARED MEMORY
+#
+# A DataFrame is written into one multiprocessing.shared_memory block as a run of
+# 64-byte aligned column blocks (numeric and datetime columns as their raw
+# values, categoricals as their integer codes). Only a small descriptor (block
+# name, dtypes, offsets, categories, index, attrs) crosses the process pipe; the
+# receiving process copies the columns straight out of the block instead of
+# unpickling the frame. Columns without a fixed-width NumPy layout (strings,
+# objects, other extension dtypes) travel pickled in the descriptor.
+
+from multiprocessing import shared_memory
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_ALIGNMENT = 64
+# NumPy kinds that are stored as raw bytes: bool, integers, floats, complex, timedelta, datetime
+_RAW_KINDS = frozenset("biufcmM")
+
+
+class SharedColumnV2_5(NamedTuple):
+    """Where one column lives in the block: its dtype and byte offset (codes dtype for a categorical)."""
+    name: Any
+    dtype: str
+    offset: int
+    categorical: Optional[pd.CategoricalDtype] = None
+
+
+class SharedFrameV2_5(NamedTuple):
+    """Picklable description of a frame written to a shared memory block."""
+    shm_name: str
+    n_rows: int
+    columns: Tuple[Any, ...]                 # all column names, in frame order
+    blocks: Tuple[SharedColumnV2_5, ...]     # the columns stored in the block
+    pickled: Dict[Any, Any]                  # the columns carried in the descriptor itself (their arrays)
+    index: pd.Index
+    attrs: Dict[str, Any]
+
+
+def _raw_values(series: pd.Series) -> Optional[np.ndarray]:
+    """The fixed-width array to store for a column, or None if it has to be pickled."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return np.ascontiguousarray(series.cat.codes.to_numpy())
+    if isinstance(dtype, np.dtype) and dtype.kind in _RAW_KINDS:
+        return np.ascontiguousarray(series.to_numpy())
+    return None
+
+
+def share_frame(frame: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, SharedFrameV2_5]:
+    """
+    Copies a frame into a new shared memory block.
+
+    Returns the block (the caller owns it: keep it open until the receiver has read
+    it, then release_shared_frame()) and the descriptor to send to the receiver.
+    """
+    layout = []
+    pickled: Dict[Any, Any] = {}
+    size = 0
+    for position, name in enumerate(frame.columns):
+        series = frame.iloc[:, position]
+        values = _raw_values(series)
+        if values is None:
+            pickled[name] = series.array
+            continue
+        size = -(-size // _ALIGNMENT) * _ALIGNMENT
+        layout.append((name, series, values, size))
+        size += values.nbytes
+
+    # A block cannot be empty
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    blocks = []
+    for name, series, values, offset in layout:
+        target = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=offset)
+        target[...] = values
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            blocks.append(SharedColumnV2_5(name, values.dtype.str, offset, series.dtype))
+        else:
+            blocks.append(SharedColumnV2_5(name, values.dtype.str, offset))
+        del target
+    descriptor = SharedFrameV2_5(shm.name, len(frame), tuple(frame.columns), tuple(blocks),
+                                 pickled, frame.index, dict(frame.attrs))
+    return shm, descriptor
+
+
+def read_shared_frame(descriptor: SharedFrameV2_5) -> pd.DataFrame:
+    """Rebuilds a frame from its shared memory block (the columns are copied out; the block is left as is)."""
+    shm = shared_memory.SharedMemory(name=descriptor.shm_name)
+    try:
+        data: Dict[Any, Any] = {}
+        for block in descriptor.blocks:
+            stored = np.ndarray((descriptor.n_rows,), dtype=np.dtype(block.dtype), buffer=shm.buf,
+                                offset=block.offset)
+            values = stored.copy()
+            del stored
+            if block.categorical is not None:
+                values = pd.Categorical.from_codes(values, dtype=block.categorical)
+            data[block.name] = values
+    finally:
+        shm.close()
+    data.update(descriptor.pickled)
+    frame = pd.DataFrame({name: data[name] for name in descriptor.columns}, index=descriptor.index, copy=False)
+    frame.attrs = dict(descriptor.attrs)
+    return frame
+
+
+def release_shared_frame(shm_or_name: Any) -> None:
+    """Closes and removes a block, given the SharedMemory object or its name. Missing blocks are ignored."""
+    try:
+        shm = shm_or_name if isinstance(shm_or_name, shared_memory.SharedMemory) else \
+            shared_memory.SharedMemory(name=shm_or_name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,192 @@
+# utils/validation_policy_v2_5.py
+# EOTS v2.5 - ROW VALIDATION POLICY FOR TRUSTED INTERNAL HAND-OFFS
+#
+# Provider responses are always validated field by field when the raw contract
+# models are built. Tables produced by our own MetricsCalculator one step later
+# do not need the same treatment for every row; this policy decides how much of
+# that validation is done and measures what it costs.
+
+import logging
+import random
+import threading
+import time
+import types
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union, get_args, get_origin
+
+import pandas as pd
+from pydantic import BaseModel
+
+from data_models.chain_frame_schema_v2_5 import row_constants
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_MODES = ("full", "construct", "sampled")
+
+# Rows validated once per model class to estimate the cost of full validation
+# when the active policy never validates rows itself
+_CALIBRATION_ROWS = 20
+
+
+class ValidationReport(NamedTuple):
+    mode: str
+    rows: int                                # rows materialized as models
+    validated_rows: int                      # rows that went through Pydantic validation
+    elapsed_seconds: float                   # checks + row construction actually spent
+    estimated_full_seconds: Optional[float]  # same rows with full validation (learned per-row cost)
+
+    @property
+    def saved_seconds(self) -> Optional[float]:
+        if self.estimated_full_seconds is None:
+            return None
+        return max(self.estimated_full_seconds - self.elapsed_seconds, 0.0)
+
+
+def _expected_kind(annotation: Any) -> Optional[str]:
+    """Maps a field annotation to 'numeric', 'text' or 'datetime'; None when there is nothing to check."""
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _expected_kind(args[0]) if len(args) == 1 else None
+    if annotation in (float, int, bool):
+        return 'numeric'
+    if annotation is str:
+        return 'text'
+    if annotation is datetime:
+        return 'datetime'
+    return None
+
+
+def _dtype_matches(dtype: Any, expected: str) -> bool:
+    if isinstance(dtype, pd.CategoricalDtype):
+        return expected == 'text'
+    kind = getattr(dtype, 'kind', 'O')
+    if expected == 'numeric':
+        return kind in 'fiub'
+    if expected == 'text':
+        return kind in 'OUS'
+    return kind in 'MO'
+
+
+def _row_kwargs(record: Dict[Any, Any]) -> Dict[str, Any]:
+    return {str(k): v for k, v in record.items()}
+
+
+class ValidationPolicyV2_5:
+    """
+    How rows of trusted, internally produced tables are turned into Pydantic models.
+
+    - full:      every row is validated (the historical behaviour)
+    - construct: rows are built with model_construct, no validation
+    - sampled:   per-column schema/dtype checks plus validation of a random
+                 sample_percent of rows up front; rows are then built with
+                 model_construct. A table that fails the dtype checks falls back
+                 to full validation.
+    """
+
+    def __init__(self, mode: str = "full", sample_percent: float = 5.0, min_sample_rows: int = 1, seed: Optional[int] = None):
+        self.logger = logger.getChild(self.__class__.__name__)
+        if mode not in VALIDATION_MODES:
+            self.logger.warning(f"⚠️ Unknown validation mode '{mode}', using 'full'")
+            mode = "full"
+        self.mode = mode
+        self.sample_percent = min(max(float(sample_percent), 0.0), 100.0)
+        self.min_sample_rows = max(int(min_sample_rows), 0)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._row_costs: Dict[Type[BaseModel], float] = {}
+
+    @classmethod
+    def from_config(cls, config_manager: Any) -> 'ValidationPolicyV2_5':
+        """Builds the policy from data_processor_settings."""
+        return cls(
+            mode=str(config_manager.get_setting("data_processor_settings.validation_policy", "sampled")),
+            sample_percent=float(config_manager.get_setting("data_processor_settings.validation_sample_percent", 5.0))
+        )
+
+    def check_frame(self, frame: pd.DataFrame, model_cls: Type[BaseModel]) -> List[str]:
+        """Column-level schema check: required fields present and dtypes compatible with the annotations."""
+        issues = []
+        constants = row_constants(frame)
+        for name, field in model_cls.model_fields.items():
+            if name not in frame.columns:
+                if field.is_required() and name not in constants:
+                    issues.append(f"missing required column '{name}'")
+                continue
+            expected = _expected_kind(field.annotation)
+            if expected and not _dtype_matches(frame[name].dtype, expected):
+                issues.append(f"column '{name}' has dtype {frame[name].dtype}, expected {expected}")
+        return issues
+
+    def sample_positions(self, rows: int) -> List[int]:
+        """Random row positions covering sample_percent of the table (at least min_sample_rows)."""
+        if rows == 0:
+            return []
+        size = min(rows, max(int(round(rows * self.sample_percent / 100.0)), self.min_sample_rows))
+        with self._lock:
+            return sorted(self._rng.sample(range(rows), size))
+
+    def prepare_table(self, frame: pd.DataFrame, model_cls: Type[BaseModel]) -> Tuple[bool, int, float]:
+        """
+        Runs the eager checks for one table.
+
+        Returns:
+            (validate_rows, rows_validated_now, seconds_spent). validate_rows tells the
+            caller whether each row still has to be validated when it is materialized.
+
+        Raises:
+            pydantic.ValidationError: if a sampled row does not validate.
+        """
+        if self.mode == "full":
+            return True, 0, 0.0
+        if self.mode == "construct" or frame.empty:
+            return False, 0, 0.0
+
+        start = time.perf_counter()
+        issues = self.check_frame(frame, model_cls)
+        if issues:
+            self.logger.warning(f"⚠️ {model_cls.__name__} table failed schema checks, validating every row: {'; '.join(issues)}")
+            return True, 0, time.perf_counter() - start
+
+        constants = row_constants(frame)
+        records = frame.iloc[self.sample_positions(len(frame))].to_dict('records')
+        validate_start = time.perf_counter()
+        for record in records:
+            model_cls.model_validate(_row_kwargs({**constants, **record}))
+        self.record_row_cost(model_cls, time.perf_counter() - validate_start, len(records))
+        return False, len(records), time.perf_counter() - start
+
+    def build_row(self, model_cls: Type[BaseModel], record: Dict[Any, Any], validate: bool) -> BaseModel:
+        """Builds one row model, validated or constructed."""
+        if validate:
+            return model_cls.model_validate(_row_kwargs(record))
+        return model_cls.model_construct(**_row_kwargs(record))
+
+    def record_row_cost(self, model_cls: Type[BaseModel], seconds: float, rows: int) -> None:
+        """Folds a measured validation time into the per-row cost estimate for a model class."""
+        if rows <= 0:
+            return
+        per_row = seconds / rows
+        with self._lock:
+            previous = self._row_costs.get(model_cls)
+            self._row_costs[model_cls] = per_row if previous is None else 0.8 * previous + 0.2 * per_row
+
+    def estimated_full_seconds(self, model_cls: Type[BaseModel], frame: pd.DataFrame, rows: int) -> Optional[float]:
+        """Estimated time to fully validate `rows` rows, calibrating on the frame if no cost is known yet."""
+        with self._lock:
+            per_row = self._row_costs.get(model_cls)
+        if per_row is None:
+            if frame.empty:
+                return None if rows else 0.0
+            constants = row_constants(frame)
+            records = frame.head(_CALIBRATION_ROWS).to_dict('records')
+            start = time.perf_counter()
+            try:
+                for record in records:
+                    model_cls.model_validate(_row_kwargs({**constants, **record}))
+            except Exception:
+                return None
+            self.record_row_cost(model_cls, time.perf_counter() - start, len(records))
+            with self._lock:
+                per_row = self._row_costs[model_cls]
+        return per_row * rows